@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Binary snapshot and restore of the portfolio collections
+
+    python backup_data.py snapshot backups/portfolio.pfsnap [--include-status]
+    python backup_data.py verify backups/portfolio.pfsnap
+    python backup_data.py restore backups/portfolio.pfsnap [--drop]
+"""
+import argparse
+import asyncio
+import sys
+import os
+import time
+from pathlib import Path
+from typing import Dict, Any
+import logging
+
+# Add backend directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from services.portfolio_service import PortfolioService, PORTFOLIO_KEY, SECTIONS
+from services.backup_archive import ArchiveError, DEFAULT_CHUNK_BYTES, restore_snapshot, verify_snapshot, write_snapshot
+from motor.motor_asyncio import AsyncIOMotorClient
+from dotenv import load_dotenv
+
+# Load environment variables
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+# Create logs directory
+LOG_DIR = Path(__file__).parent / 'data' / 'logs'
+LOG_DIR.mkdir(exist_ok = True)
+
+# Configure logging
+logging.basicConfig(
+    level = logging.INFO,
+    format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers = [logging.StreamHandler(), logging.FileHandler(LOG_DIR / 'server.log', encoding = 'utf-8')]
+)
+logger = logging.getLogger(__name__)
+
+# Collections holding portfolio data, in restore order
+PORTFOLIO_COLLECTIONS = ("portfolios", *SECTIONS)
+
+def log_stats(action: str, path: Path, stats: Dict[str, Dict[str, int]], elapsed: float):
+    total = sum(counts["documents"] for counts in stats.values())
+    logger.info(f"✅ {action} {total} documents ({path}) in {elapsed:.2f}s ({total / elapsed if elapsed else 0:.0f} docs/s):")
+    for name, counts in stats.items():
+        details = ", ".join(f"{value} {key}" for key, value in counts.items())
+        logger.info(f"   - {name}: {details}")
+
+async def main(args: argparse.Namespace) -> int:
+    """Run snapshot, verify or restore; returns the process exit status"""
+    try:
+        started = time.perf_counter()
+        if args.command == "verify":
+            log_stats("Verified", args.file, verify_snapshot(args.file), time.perf_counter() - started)
+            return 0
+
+        # Connect to database
+        client = AsyncIOMotorClient(os.environ['MONGO_URI'])
+        db = client[os.environ['DB_NAME']]
+        collections: Dict[str, Any] = {name: db[name] for name in PORTFOLIO_COLLECTIONS}
+        if args.include_status:
+            collections["status_checks"] = client[os.environ['STATUS_DB_NAME']].status_checks
+
+        if args.command == "snapshot":
+            args.file.parent.mkdir(parents = True, exist_ok = True)
+            stats = await write_snapshot(args.file, collections, level = args.level, chunk_bytes = args.chunk_mb * 1024 * 1024)
+            log_stats("Snapshot of", args.file, stats, time.perf_counter() - started)
+            logger.info(f"   Snapshot size: {args.file.stat().st_size} bytes")
+        else:
+            stats = await restore_snapshot(args.file, collections, drop = args.drop, batch_size = args.batch_size)
+            log_stats("Restored", args.file, stats, time.perf_counter() - started)
+
+            # Recreate indexes, and bump versions so running servers drop their cached copies
+            service = PortfolioService(db)
+            await service.ensure_indexes()
+            portfolio_ids = await db.portfolios.distinct("userId")
+            await asyncio.gather(*(service.ledger.bump(portfolio_id, (PORTFOLIO_KEY, *SECTIONS)) for portfolio_id in portfolio_ids))
+            logger.info(f"✅ Indexes ensured; {len(portfolio_ids)} portfolios marked as changed")
+
+        client.close()
+        return 0
+
+    except ArchiveError as e:
+        logger.error(f"❌ {e}")
+    except Exception as e:
+        logger.exception(f"❌ {args.command.capitalize()} error: {e}")
+    return 1
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description = "Snapshot and restore portfolio data")
+    commands = parser.add_subparsers(dest = "command", required = True)
+
+    snapshot = commands.add_parser("snapshot", help = "Dump the portfolio collections to a compressed BSON file")
+    snapshot.add_argument('file', type = Path)
+    snapshot.add_argument('--include-status', action = 'store_true', help = "Also dump status_checks")
+    snapshot.add_argument('--level', type = int, default = 6, choices = range(1, 10), metavar = "1-9", help = "zlib compression level")
+    snapshot.add_argument('--chunk-mb', type = int, default = DEFAULT_CHUNK_BYTES // (1024 * 1024), help = "Uncompressed size of each chunk")
+
+    verify = commands.add_parser("verify", help = "Check every chunk's checksum without touching the database")
+    verify.add_argument('file', type = Path)
+
+    restore = commands.add_parser("restore", help = "Load a snapshot with bulk inserts")
+    restore.add_argument('file', type = Path)
+    restore.add_argument('--include-status', action = 'store_true', help = "Also restore status_checks")
+    restore.add_argument('--drop', action = 'store_true', help = "Replace existing collections (otherwise they must be empty)")
+    restore.add_argument('--batch-size', type = int, default = 10_000, help = "Documents per insert_many")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the tenant-partitioned portfolio cache
+Populates 100k portfolios and checks latency, eviction and tenant isolation
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add backend directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.portfolio_cache import PortfolioCache
+from services.portfolio_service import SECTIONS, PORTFOLIO_KEY
+
+KEYS = (PORTFOLIO_KEY, *SECTIONS)
+
+def timed(label: str, operations: int, fn):
+    """Run fn and print the per-operation latency"""
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40}{operations:>10} ops {elapsed * 1e9 / operations:>10.0f} ns/op")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description = "Benchmark the partitioned portfolio cache")
+    parser.add_argument('--tenants', type = int, default = 100_000)
+    parser.add_argument('--items-per-section', type = int, default = 5)
+    parser.add_argument('--tenant-quota', type = int, default = 5_000)
+    parser.add_argument('--lookups', type = int, default = 1_000_000)
+    args = parser.parse_args()
+
+    weight = args.items_per_section
+    # Budget that fits every tenant plus one full quota, so any eviction of
+    # other tenants by the noisy tenant below would be an isolation failure
+    max_weight = args.tenants * len(KEYS) * weight + args.tenant_quota
+    cache = PortfolioCache(max_weight = max_weight, tenant_quota = args.tenant_quota)
+    tenants = [f"tenant-{i}" for i in range(args.tenants)]
+    value = ["item"] * weight
+
+    print(f"🚀 Cache benchmark: {args.tenants} tenants x {len(KEYS)} keys, budget {max_weight} documents")
+    print("=" * 70)
+
+    def populate():
+        for tenant in tenants:
+            for key in KEYS:
+                cache.set(tenant, key, value, weight)
+    timed("populate (set)", args.tenants * len(KEYS), populate)
+
+    samples = [(random.choice(tenants), random.choice(KEYS)) for _ in range(args.lookups)]
+    def lookup():
+        hits = 0
+        for tenant, key in samples:
+            if cache.get(tenant, key) is not None:
+                hits += 1
+        return hits
+    hits = timed("uniform lookups (get)", args.lookups, lookup)
+    print(f"   hit rate: {hits / args.lookups:.2%}")
+
+    def invalidate():
+        for tenant in tenants[:10_000]:
+            cache.invalidate(tenant, PORTFOLIO_KEY, "projects")
+    timed("section invalidation", 10_000, invalidate)
+    for tenant in tenants[:10_000]:
+        cache.set(tenant, PORTFOLIO_KEY, value, weight)
+        cache.set(tenant, "projects", value, weight)
+
+    # A single very large tenant churns through many big entries
+    before = cache.stats()
+    def noisy_tenant():
+        for i in range(10_000):
+            cache.set("noisy-tenant", f"page-{i}", value, args.tenant_quota // 10)
+    timed("noisy tenant writes", 10_000, noisy_tenant)
+    after = cache.stats()
+    survivors = sum(1 for tenant in tenants if cache.get(tenant, PORTFOLIO_KEY) is not None)
+
+    print("=" * 70)
+    print(f"Entries evicted by the noisy tenant: {after['evictions'] - before['evictions']}")
+    print(f"Other tenants still cached: {survivors}/{args.tenants}")
+    print(f"Final stats: {cache.stats()}")
+
+if __name__ == "__main__":
+    main()
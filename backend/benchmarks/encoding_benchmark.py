@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark for response encodings
+Compares encode time and payload size of a large PortfolioResponse per media type
+"""
+import argparse
+import gzip
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add backend directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from starlette.responses import JSONResponse
+
+from models.portfolio import *
+from services.response_encoding import CBOR, ENCODERS, JSON, MSGPACK, _encode_json, orjson
+
+def build_portfolio(rng: random.Random, projects: int, skills: int, experiences: int) -> PortfolioResponse:
+    vocabulary = [f"tech-{i}" for i in range(200)]
+    portfolio = Portfolio(
+        personal = PersonalInfo(name = "Jane Doe", tagline = "Engineer", email = "jane@example.com",
+                                github = "https://github.com/jane", linkedin = "https://linkedin.com/in/jane", kaggle = "#"),
+        about = AboutSection(description = "About " * 50, education = Education(institution = "Uni", degree = "BSc", duration = "4y")),
+    )
+    return PortfolioResponse(
+        portfolio = portfolio,
+        skills = [SkillCategory(title = f"Skills {i}", items = rng.sample(vocabulary, 10), order = i) for i in range(skills)],
+        experiences = [
+            Experience(title = f"Role {i}", company = "Company", location = "Remote", duration = "2y",
+                       description = "Worked on things. " * 20, order = i)
+            for i in range(experiences)
+        ],
+        projects = [
+            Project(title = f"Project {i}", description = "A project description. " * 10,
+                    technologies = rng.sample(vocabulary, 6), featured = i % 5 == 0, order = i)
+            for i in range(projects)
+        ],
+        achievements = [],
+        publications = [],
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description = "Benchmark response encodings")
+    parser.add_argument('--projects', type = int, default = 2_000)
+    parser.add_argument('--skills', type = int, default = 50)
+    parser.add_argument('--experiences', type = int, default = 200)
+    parser.add_argument('--rounds', type = int, default = 20)
+    args = parser.parse_args()
+
+    # Routes hand the encoder what FastAPI serializes from the response model
+    content = build_portfolio(random.Random(42), args.projects, args.skills, args.experiences).model_dump(mode = "json")
+    encoders = {"json (stdlib)": lambda value: JSONResponse(value).body}
+    if orjson is not None:
+        encoders[f"{JSON} (orjson)"] = _encode_json
+    encoders.update((name, ENCODERS[name]) for name in (MSGPACK, CBOR) if name in ENCODERS)
+
+    print(f"🚀 Encoding benchmark: {args.projects} projects, {args.skills} skill categories, {args.experiences} experiences")
+    print("=" * 78)
+    print(f"{'encoding':<32}{'ms/encode':>12}{'bytes':>12}{'gzip bytes':>14}")
+    for name, encode in encoders.items():
+        payload = encode(content)
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            encode(content)
+        elapsed = (time.perf_counter() - start) * 1000 / args.rounds
+        print(f"{name:<32}{elapsed:>12.2f}{len(payload):>12}{len(gzip.compress(payload)):>14}")
+    missing = [name for name in (MSGPACK, CBOR) if name not in ENCODERS]
+    if missing:
+        print(f"Not installed: {', '.join(missing)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the in-process full-text search index
+Indexes 100k synthetic projects, experiences and publications in one
+portfolio and measures build time, query latency and incremental updates
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add backend directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from models.portfolio import Project, Experience, Publication, ChangeEvent
+from services.search_index import SearchIndex
+
+PORTFOLIO_ID = "bench"
+TECHNOLOGIES = ["Python", "C++", "Rust", "TensorFlow", "PyTorch", "React", "MongoDB", "FastAPI", "Docker", "Kubernetes"]
+
+def make_vocabulary(size: int, rng: random.Random):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(4, 9))) for _ in range(size)]
+
+def make_documents(count: int, vocabulary, rng: random.Random):
+    """Roughly equal numbers of projects, experiences and publications"""
+    # Skewed word choice, like natural text
+    words = lambda n: " ".join(vocabulary[min(int(rng.paretovariate(1.1)) - 1, len(vocabulary) - 1)] for _ in range(n))
+    sections = {"projects": [], "experiences": [], "publications": []}
+    for i in range(count):
+        kind = i % 3
+        if kind == 0:
+            sections["projects"].append(Project(title = words(4), description = words(40),
+                                                technologies = rng.sample(TECHNOLOGIES, 3), portfolioId = PORTFOLIO_ID))
+        elif kind == 1:
+            sections["experiences"].append(Experience(title = words(3), company = words(2), location = "Remote",
+                                                      duration = "2020 - 2022", description = words(30),
+                                                      portfolioId = PORTFOLIO_ID))
+        else:
+            sections["publications"].append(Publication(title = words(8), authors = words(4), publication = words(3),
+                                                        year = "2023", portfolioId = PORTFOLIO_ID))
+    return sections
+
+class _StaticService:
+    """Stands in for PortfolioService on the index's first (lazy) load"""
+    def __init__(self, sections):
+        self.sections = sections
+    def __getattr__(self, name):
+        section = name[len("get_"):]
+        async def get(portfolio_id):
+            return self.sections[section]
+        return get
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return {
+        "p50": samples[len(samples) // 2],
+        "p95": samples[int(len(samples) * 0.95)],
+        "p99": samples[int(len(samples) * 0.99)],
+        "mean": statistics.mean(samples),
+    }
+
+def report(label: str, samples):
+    stats = percentiles(samples)
+    print(f"{label:<32}" + "".join(f"{name} {value * 1000:>8.3f}ms  " for name, value in stats.items()))
+
+async def run(args):
+    rng = random.Random(args.seed)
+    vocabulary = make_vocabulary(args.vocabulary, rng)
+    print(f"🚀 Search benchmark: {args.documents} documents, vocabulary {args.vocabulary}")
+    print("=" * 100)
+
+    start = time.perf_counter()
+    sections = make_documents(args.documents, vocabulary, rng)
+    print(f"generated documents in {time.perf_counter() - start:.2f}s")
+
+    index = SearchIndex()
+    service = _StaticService(sections)
+    start = time.perf_counter()
+    await index.search(service, PORTFOLIO_ID, "warmup")
+    print(f"built index in {time.perf_counter() - start:.2f}s "
+          f"({len(index._tenants[PORTFOLIO_ID].postings)} distinct terms)")
+    print("=" * 100)
+
+    queries = {
+        "1 common term": lambda: vocabulary[rng.randint(0, 10)],
+        "1 rare term": lambda: vocabulary[rng.randint(1000, args.vocabulary - 1)],
+        "3 mixed terms": lambda: " ".join(rng.choice(vocabulary[:2000]) for _ in range(3)),
+        "technology": lambda: rng.choice(TECHNOLOGIES),
+    }
+    for label, make_query in queries.items():
+        samples = []
+        for _ in range(args.queries):
+            query = make_query()
+            start = time.perf_counter()
+            await index.search(service, PORTFOLIO_ID, query, limit = 10)
+            samples.append(time.perf_counter() - start)
+        report(label, samples)
+
+    # Writes applied through the PortfolioService listener
+    projects = sections["projects"]
+    samples = []
+    for _ in range(args.queries):
+        project = rng.choice(projects)
+        document = project.model_dump(mode = "json")
+        document["description"] = " ".join(rng.choice(vocabulary) for _ in range(40))
+        event = ChangeEvent(portfolioId = PORTFOLIO_ID, section = "projects", op = "update", id = project.id, document = document)
+        start = time.perf_counter()
+        index.on_change(event)
+        samples.append(time.perf_counter() - start)
+    report("incremental update", samples)
+
+def main():
+    parser = argparse.ArgumentParser(description = "Benchmark the full-text search index")
+    parser.add_argument('--documents', type = int, default = 100_000)
+    parser.add_argument('--vocabulary', type = int, default = 50_000)
+    parser.add_argument('--queries', type = int, default = 500)
+    parser.add_argument('--seed', type = int, default = 42)
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
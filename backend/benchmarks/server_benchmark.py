@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark for launcher configurations
+Starts the API with each worker/loop/HTTP parser combination and drives it
+with the load tester from tests/load_tests.py
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).parent.parent
+sys.path.append(str(BACKEND_DIR.parent))
+
+sys.path.append(str(BACKEND_DIR))
+
+from launcher import load_config
+from tests.load_tests import PortfolioLoadTester, REQUEST_MIXES
+
+def launcher_env(port: int, workers: int, loop: str, http: str) -> dict:
+    return {
+        **os.environ,
+        "PORT": str(port),
+        "HOST": "127.0.0.1",
+        "WEB_CONCURRENCY": str(workers),
+        "UVICORN_LOOP": loop,
+        "UVICORN_HTTP": http,
+    }
+
+def start_launcher(port: int, workers: int, loop: str, http: str) -> subprocess.Popen:
+    """Start launcher.py with one configuration and wait until it answers"""
+    process = subprocess.Popen([sys.executable, "launcher.py"], cwd = BACKEND_DIR, env = launcher_env(port, workers, loop, http),
+                               stdout = subprocess.DEVNULL, stderr = subprocess.DEVNULL)
+    for _ in range(150):
+        if process.poll() is not None:
+            raise RuntimeError(f"Launcher exited with code {process.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/api/", timeout = 1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("Server did not become ready in time")
+
+def main():
+    parser = argparse.ArgumentParser(description = "Compare launcher configurations")
+    parser.add_argument('--workers', default = f"1,{os.cpu_count() or 1}", help = "Comma-separated worker counts")
+    parser.add_argument('--loops', default = "asyncio,uvloop", help = "Comma-separated event loops")
+    parser.add_argument('--http', default = "h11,httptools", help = "Comma-separated HTTP parsers")
+    parser.add_argument('--concurrency', type = int, default = 64)
+    parser.add_argument('--duration', type = float, default = 20)
+    parser.add_argument('--mix', choices = sorted(REQUEST_MIXES), default = 'read-only')
+    parser.add_argument('--port', type = int, default = 8766)
+    args = parser.parse_args()
+
+    configs = itertools.product(
+        sorted({int(w) for w in args.workers.split(',')}),
+        args.loops.split(','),
+        args.http.split(','),
+    )
+    results = []
+    measured = set()
+    for workers, loop, http in configs:
+        # Label with what the launcher actually runs after falling back from
+        # uvloop/httptools when they are not installed
+        config = load_config(launcher_env(args.port, workers, loop, http))
+        label = f"workers={config.workers} loop={config.loop} http={config.http}"
+        if (config.loop, config.http) != (loop, http):
+            print(f"▶ {label} (requested loop={loop} http={http})")
+        else:
+            print(f"▶ {label}")
+        if label in measured:
+            print("   skipped: same configuration as an earlier run")
+            continue
+        measured.add(label)
+        try:
+            server = start_launcher(args.port, workers, loop, http)
+        except RuntimeError as e:
+            print(f"   skipped: {e}")
+            continue
+        try:
+            tester = PortfolioLoadTester(f"http://127.0.0.1:{args.port}", args.mix)
+            summary = asyncio.run(tester.run(args.concurrency, args.duration, ramp_up = 2)).summary()
+        finally:
+            server.terminate()
+            server.wait()
+        p99 = max((row['p99_ms'] for row in summary['endpoints'].values()), default = 0)
+        results.append((label, summary['throughput_rps'], p99, summary['error_rate']))
+
+    print("\n" + "=" * 78)
+    print(f"{'configuration':<45}{'req/s':>10}{'worst p99 ms':>14}{'errors':>9}")
+    print("=" * 78)
+    for label, rps, p99, error_rate in sorted(results, key = lambda row: -row[1]):
+        print(f"{label:<45}{rps:>10}{p99:>14}{error_rate:>9.2%}")
+
+if __name__ == "__main__":
+    main()
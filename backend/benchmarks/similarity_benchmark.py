@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark for related-project recommendations
+Compares the NumPy technology matrix against pairwise Jaccard in Python
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add backend directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from models.portfolio import Project
+from services.project_similarity import _TechnologyMatrix
+
+def pairwise_top_k(projects, row: int, k: int):
+    """Reference implementation: Jaccard against every other project in Python"""
+    target = {t.casefold() for t in projects[row].technologies}
+    scores = []
+    for other, project in enumerate(projects):
+        if other == row:
+            continue
+        technologies = {t.casefold() for t in project.technologies}
+        union = len(target | technologies)
+        score = len(target & technologies) / union if union else 0.0
+        if score > 0:
+            scores.append((other, score))
+    return sorted(scores, key = lambda item: -item[1])[:k]
+
+def main():
+    parser = argparse.ArgumentParser(description = "Benchmark related-project recommendations")
+    parser.add_argument('--projects', type = int, default = 5_000)
+    parser.add_argument('--technologies', type = int, default = 500)
+    parser.add_argument('--per-project', type = int, default = 6)
+    parser.add_argument('--lookups', type = int, default = 200)
+    parser.add_argument('--k', type = int, default = 5)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    vocabulary = [f"tech-{i}" for i in range(args.technologies)]
+    projects = [
+        Project(title = f"Project {i}", description = "", technologies = rng.sample(vocabulary, args.per_project))
+        for i in range(args.projects)
+    ]
+    rows = [rng.randrange(args.projects) for _ in range(args.lookups)]
+
+    print(f"🚀 Similarity benchmark: {args.projects} projects, {args.technologies} technologies, k={args.k}")
+    print("=" * 70)
+
+    start = time.perf_counter()
+    matrix = _TechnologyMatrix(projects)
+    print(f"{'build matrix':<36}{(time.perf_counter() - start) * 1000:>10.1f} ms")
+
+    start = time.perf_counter()
+    single = [matrix.top_k([row], args.k)[0] for row in rows]
+    print(f"{'numpy, one lookup at a time':<36}{(time.perf_counter() - start) * 1000 / args.lookups:>10.3f} ms/lookup")
+
+    start = time.perf_counter()
+    batched = matrix.top_k(rows, args.k)
+    print(f"{'numpy, batched':<36}{(time.perf_counter() - start) * 1000 / args.lookups:>10.3f} ms/lookup")
+
+    start = time.perf_counter()
+    reference = [pairwise_top_k(projects, row, args.k) for row in rows]
+    print(f"{'pairwise python':<36}{(time.perf_counter() - start) * 1000 / args.lookups:>10.3f} ms/lookup")
+
+    # Same scores as the reference (ties may be ordered differently)
+    mismatches = sum(
+        1 for got, expected in zip(batched, reference)
+        if [round(score, 6) for _, score in got] != [round(score, 6) for _, score in expected]
+    )
+    assert single == batched
+    print("=" * 70)
+    print(f"Score mismatches against pairwise reference: {mismatches}/{args.lookups}")
+
+if __name__ == "__main__":
+    main()
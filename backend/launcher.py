@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Production launcher for the Portfolio API
+Runs uvicorn with worker count, event loop, HTTP parser and connection
+settings taken from the environment
+"""
+import importlib.util
+import logging
+import os
+from pathlib import Path
+from typing import Mapping
+from dotenv import load_dotenv
+from pydantic import BaseModel, field_validator
+
+import uvicorn
+
+# Load environment variables
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+logger = logging.getLogger(__name__)
+
+class LaunchConfig(BaseModel):
+    host: str = "0.0.0.0"
+    port: int = 8000
+    workers: int = 1
+    loop: str = "auto"          # auto | asyncio | uvloop
+    http: str = "auto"          # auto | h11 | httptools
+    keep_alive: int = 5         # seconds an idle keep-alive connection is held open
+    backlog: int = 2048         # pending connections queued by the listening socket
+    mongo_pool_budget: int = 0  # total MongoDB connections across workers (0 = driver default)
+
+    @field_validator("workers")
+    @classmethod
+    def _at_least_one_worker(cls, workers: int) -> int:
+        if workers < 1:
+            raise ValueError(f"WEB_CONCURRENCY must be at least 1 (or 'auto'), got {workers}")
+        return workers
+
+    @property
+    def mongo_pool_size(self) -> int:
+        """Per-worker MongoDB pool size derived from the total budget"""
+        if self.mongo_pool_budget <= 0:
+            return 0
+        return max(1, self.mongo_pool_budget // self.workers)
+
+def _available(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+def load_config(environ: Mapping[str, str] = os.environ) -> LaunchConfig:
+    """
+    Build the launch configuration from environment variables
+    One worker unless WEB_CONCURRENCY asks for more (`auto` = one per CPU)
+    """
+    workers = environ.get("WEB_CONCURRENCY", "1")
+    config = LaunchConfig(
+        host = environ.get("HOST", "0.0.0.0"),
+        port = int(environ.get("PORT", "8000")),
+        workers = (os.cpu_count() or 1) if workers == "auto" else int(workers),
+        loop = environ.get("UVICORN_LOOP", "auto"),
+        http = environ.get("UVICORN_HTTP", "auto"),
+        keep_alive = int(environ.get("UVICORN_KEEP_ALIVE", "5")),
+        backlog = int(environ.get("UVICORN_BACKLOG", "2048")),
+        mongo_pool_budget = int(environ.get("MONGO_POOL_BUDGET", "0")),
+    )
+    # Fall back to the pure-Python implementations when the fast ones are missing
+    if config.loop == "uvloop" and not _available("uvloop"):
+        logger.warning("uvloop requested but not installed, using asyncio")
+        config.loop = "asyncio"
+    if config.http == "httptools" and not _available("httptools"):
+        logger.warning("httptools requested but not installed, using h11")
+        config.http = "h11"
+    return config
+
+def run(config: LaunchConfig):
+    """Start uvicorn with the given configuration"""
+    # Workers are separate processes that import server.py themselves, so
+    # per-worker settings are handed over through the environment
+    if config.mongo_pool_size:
+        os.environ["MONGO_MAX_POOL_SIZE"] = str(config.mongo_pool_size)
+
+    logger.info(f"Launching Portfolio API: {config.model_dump()}, mongo pool per worker: {config.mongo_pool_size or 'default'}")
+    uvicorn.run(
+        "server:app",
+        host = config.host,
+        port = config.port,
+        workers = config.workers,
+        loop = config.loop,
+        http = config.http,
+        timeout_keep_alive = config.keep_alive,
+        backlog = config.backlog,
+        app_dir = str(ROOT_DIR),
+    )
+
+if __name__ == "__main__":
+    logging.basicConfig(level = logging.INFO, format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    run(load_config())
@@ -1,19 +1,31 @@
 #!/usr/bin/env python3
 """
 Data migration script to populate database with mock.js data
+
+    python migrate_data.py                      # MOCK_DATA_PATH into the default portfolio
+    python migrate_data.py --dir seeds/         # every seed file in seeds/, one portfolio per file
+
+Only .ndjson/.jsonl seeds are streamed; .js and .json files are read into memory whole.
 """
+import argparse
 import asyncio
 import sys
 import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-import json5    # to read mock.js file
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 import logging
 
 # Add backend directory to path
 sys.path.append(str(Path(__file__).parent))
 
-from services.portfolio_service import PortfolioService
+from services.portfolio_service import PortfolioService, DEFAULT_PORTFOLIO_ID, PORTFOLIO_ID_PATTERN
+from services.snapshot_publisher import SnapshotPublisher
+from services.storage import create_storage
+from services.seed_loader import SEED_BATCH_SIZE, batched, iter_seed_items, seed_format
+from models.portfolio import MigrationSummary
 from motor.motor_asyncio import AsyncIOMotorClient
 from dotenv import load_dotenv
 
@@ -33,80 +45,171 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Path to mock.js file
-MOCK_DATA_PATH = os.environ.get('MOCK_DATA_PATH', Path(__file__).parent / 'data' / 'mock.js')
+# Path to the seed file: mock.js, .json, or .ndjson/.jsonl (one {"section": ..., ...} item per line, streamed)
+MOCK_DATA_PATH = Path(os.environ.get('MOCK_DATA_PATH', Path(__file__).parent / 'data' / 'mock.js'))
 
-# function to load mock data from mock.js file
-def load_mock_data() -> Dict[str, Any]:
-    """
-    Loads and parses portfolio data from the mock.js file.
-    """
-    # Check if file exists
+# Seed file extensions picked up by --dir
+SEED_EXTENSIONS = (".js", ".json", ".ndjson", ".jsonl")
+
+def parse_seed_file(path: Path, batch_size: int) -> List[Tuple[str, List[Dict[str, Any]]]]:
+    """Parse a seed file into migration batches (runs in a worker process)"""
+    return list(batched(iter_seed_items(path), batch_size))
+
+def log_summary(summary: MigrationSummary):
+    logger.info(f"✅ Data migration completed in {summary.ms}ms with {summary.writes} writes:")
+    for name, diff in summary.sections.items():
+        logger.info(f"   - {name}: {diff.created} created, {diff.updated} updated, "
+                    f"{diff.deleted} deleted, {diff.unchanged} unchanged ({diff.ms}ms)")
+
+async def migrate_default(service: PortfolioService, batch_size: int) -> Optional[MigrationSummary]:
+    """Migrate MOCK_DATA_PATH into the default portfolio and verify the result"""
     if not MOCK_DATA_PATH.exists():
-        logger.error(f"Mock data file not found at: {MOCK_DATA_PATH}")
-        raise FileNotFoundError(f"Mock data file not found at: {MOCK_DATA_PATH}")
+        logger.error(f"❌ Migration failed: mock data file not found at: {MOCK_DATA_PATH}")
+        return None
+
+    logger.info(f"Starting data migration from {MOCK_DATA_PATH} ({seed_format(MOCK_DATA_PATH)})...")
+    
+    # Migrate data; NDJSON files are streamed in batches, others are parsed whole first
+    summary = await service.migrate_seed(batched(iter_seed_items(MOCK_DATA_PATH), batch_size))
+    
+    if summary is None:
+        logger.error("❌ Data migration failed!")
+        return None
+    log_summary(summary)
     
-    # Read the file content
-    with open(MOCK_DATA_PATH, 'r', encoding = 'utf-8') as f:
-        js_content = f.read()
-
-    # Clean the content by removing the JS export statement and trailing semicolon
-    js_object_string = js_content.replace('export const mockData = ', '').strip()
-    if js_object_string.endswith(';'):
-        js_object_string = js_object_string[:-1]
+    # Verify migration
+    portfolio_data = await service.get_portfolio()
     
-    # Parse the cleaned string using json5
-    return json5.loads(js_object_string)
+    if portfolio_data:
+        # Convert to dict for easy access
+        portfolio_dict = portfolio_data.model_dump()
+        logger.info(f"✅ Verification passed:")
+        logger.info(f"   - Portfolio: {portfolio_dict['portfolio']['personal']['name']}")
+        logger.info(f"   - Skills: {len(portfolio_dict['skills'])} categories")
+        logger.info(f"   - Experience: {len(portfolio_dict['experiences'])} entries")
+        logger.info(f"   - Projects: {len(portfolio_dict['projects'])} projects")
+        logger.info(f"   - Achievements: {len(portfolio_dict['achievements'])} achievements")
+        logger.info(f"   - Publications: {len(portfolio_dict['publications'])} publications")
+    else:
+        logger.error("❌ Verification failed - no data found")
+    return summary
+
+async def import_directory(service: PortfolioService, directory: Path, workers: int, concurrency: int,
+                           batch_size: int) -> Dict[str, MigrationSummary]:
+    """
+    Import every seed file in a directory into the portfolio named after the file.
+    Files are parsed in a process pool while earlier ones are written: at most
+    `concurrency` portfolios are written at any time, and at most `concurrency`
+    parsed files wait for a writer, which bounds memory and database load.
+    A file is parsed completely before any of it is written, so a malformed
+    file leaves its portfolio untouched.
+    """
+    files = sorted(path for path in directory.iterdir() if path.suffix.lower() in SEED_EXTENSIONS)
+    invalid = [path.name for path in files if not re.match(PORTFOLIO_ID_PATTERN, path.stem)]
+    if invalid:
+        logger.warning(f"Skipping files whose names are not valid portfolio ids: {invalid}")
+    files = [path for path in files if path.name not in invalid]
+    logger.info(f"Importing {len(files)} portfolios from {directory} ({workers} parser processes, {concurrency} concurrent imports)...")
 
-async def main():
+    loop = asyncio.get_running_loop()
+    parsing = asyncio.Semaphore(workers)
+    # Parsed files waiting for a writer; None tells a writer to stop
+    parsed: asyncio.Queue = asyncio.Queue(maxsize = concurrency)
+    results: Dict[str, MigrationSummary] = {}
+    failed: List[str] = []
+    started = time.perf_counter()
+    items = writes = 0
+
+    async def parse_one(path: Path, executor: ProcessPoolExecutor):
+        # The slot is held until the queue takes the file, so parsing stalls while the writers are behind
+        async with parsing:
+            try:
+                batches = await loop.run_in_executor(executor, parse_seed_file, path, batch_size)
+            except Exception as e:
+                logger.error(f"❌ {path.name}: could not parse ({e})")
+                failed.append(path.stem)
+                return
+            await parsed.put((path.stem, batches))
+
+    async def write_parsed():
+        nonlocal items, writes
+        while (entry := await parsed.get()) is not None:
+            portfolio_id, batches = entry
+            summary = await service.migrate_seed(batches, portfolio_id)
+            if summary is None:
+                logger.error(f"❌ {portfolio_id}: migration failed")
+                failed.append(portfolio_id)
+                continue
+            results[portfolio_id] = summary
+            items += sum(len(batch) for section, batch in batches)
+            writes += summary.writes
+            done = len(results) + len(failed)
+            elapsed = time.perf_counter() - started
+            logger.info(f"[{done}/{len(files)}] {portfolio_id}: {summary.writes} writes in {summary.ms}ms "
+                        f"({done / elapsed:.1f} portfolios/s, {items / elapsed:.0f} items/s)")
+
+    writers = [asyncio.create_task(write_parsed()) for _ in range(concurrency)]
+    with ProcessPoolExecutor(max_workers = workers) as executor:
+        await asyncio.gather(*(parse_one(path, executor) for path in files))
+    for _ in writers:
+        await parsed.put(None)
+    await asyncio.gather(*writers)
+
+    elapsed = time.perf_counter() - started
+    logger.info(f"{'✅' if not failed else '⚠️'} Imported {len(results)}/{len(files)} portfolios in {elapsed:.1f}s: "
+                f"{items} items, {writes} writes ({items / elapsed if elapsed else 0:.0f} items/s)")
+    if failed:
+        logger.error(f"❌ Failed portfolios: {failed}")
+    return results
+
+async def main(args: argparse.Namespace):
     """Run data migration"""
     try:
-        # load mock data from mock.js file
-        MOCK_DATA = load_mock_data()
-        if not MOCK_DATA:   
-            logger.error("❌ Migration failed: Mock data is empty. Please check your mock.js file.")
-            return
-        
-        # Connect to database
-        mongo_uri = os.environ['MONGO_URI']
-        client = AsyncIOMotorClient(mongo_uri)
-        db = client[os.environ['DB_NAME']]
+        # Connect to database; MongoDB is only needed for the mongo backend
+        backend = os.environ.get('STORAGE_BACKEND', 'mongo')
+        client = AsyncIOMotorClient(os.environ['MONGO_URI']) if backend == 'mongo' else None
+        storage = create_storage(
+            backend,
+            db = client[os.environ['DB_NAME']] if client is not None else None,
+            sqlite_path = Path(os.environ.get('SQLITE_PATH', str(ROOT_DIR / 'data' / 'portfolio.db'))),
+        )
         
         # Create service
-        service = PortfolioService(db)
-        
-        logger.info("Starting data migration...")
+        service = PortfolioService(storage)
         
-        # Migrate data
-        success = await service.migrate_mock_data(MOCK_DATA)
-        
-        if success:
-            logger.info("✅ Data migration completed successfully!")
-            
-            # Verify migration
-            portfolio_data = await service.get_portfolio()
-            
-            # Convert to dict for easy access
-            portfolio_dict = portfolio_data.model_dump()
-            
-            if portfolio_data:
-                logger.info(f"✅ Verification passed:")
-                logger.info(f"   - Portfolio: {portfolio_dict['portfolio']['personal']['name']}")
-                logger.info(f"   - Skills: {len(portfolio_dict['skills'])} categories")
-                logger.info(f"   - Experience: {len(portfolio_dict['experiences'])} entries")
-                logger.info(f"   - Projects: {len(portfolio_dict['projects'])} projects")
-                logger.info(f"   - Achievements: {len(portfolio_dict['achievements'])} achievements")
-                logger.info(f"   - Publications: {len(portfolio_dict['publications'])} publications")
-            else:
-                logger.error("❌ Verification failed - no data found")
+        if args.dir:
+            results = await import_directory(service, args.dir, args.workers, args.concurrency, args.batch_size)
         else:
-            logger.error("❌ Data migration failed!")
+            summary = await migrate_default(service, args.batch_size)
+            results = {DEFAULT_PORTFOLIO_ID: summary} if summary is not None else {}
+
+        # Refresh static snapshots of changed portfolios, if the server publishes them
+        changed = [portfolio_id for portfolio_id, summary in results.items() if summary.writes]
+        if changed and os.environ.get('SNAPSHOT_DIR'):
+            publisher = SnapshotPublisher(Path(os.environ['SNAPSHOT_DIR']))
+            for portfolio_id in changed:
+                await publisher.publish_all(service, portfolio_id)
+            logger.info(f"✅ Static snapshots of {len(changed)} portfolios published to {os.environ['SNAPSHOT_DIR']}")
             
-        # Close connection
-        client.close()
+        # Close connections
+        storage.close()
+        if client is not None:
+            client.close()
         
     except Exception as e:
         logger.exception(f"❌ Migration error: {e}")
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description = "Seed portfolio data into MongoDB",
+        epilog = "Seed files may be .js, .json, .ndjson or .jsonl; only NDJSON (.ndjson/.jsonl) is streamed, "
+                 "the others are read into memory whole.",
+    )
+    parser.add_argument('--dir', type = Path, help = "Import every seed file in this directory; each file name (without extension) is the portfolio id")
+    parser.add_argument('--workers', type = int, default = os.cpu_count() or 1, help = "Processes parsing seed files (with --dir)")
+    parser.add_argument('--concurrency', type = int, default = 8, help = "Portfolios written at the same time, and parsed files waiting to be written (with --dir)")
+    parser.add_argument('--batch-size', type = int, default = SEED_BATCH_SIZE, help = "Items written per batch (NDJSON seeds are read one batch at a time)")
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main(parse_args()))
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import List, Optional, Dict, Any
 from datetime import datetime, timezone
 import uuid
 
@@ -181,4 +181,82 @@ class PortfolioResponse(BaseModel):
     experiences: List[Experience]
     projects: List[Project]
     achievements: List[Achievement]
-    publications: List[Publication]
\ No newline at end of file
+    publications: List[Publication]
+
+# Project counts for filter chips
+class TechnologyFacet(BaseModel):
+    technology: str
+    count: int
+
+class ProjectFacets(BaseModel):
+    total: int
+    featured: int
+    technologies: List[TechnologyFacet]         # most used first
+
+# Outcome of migrating seed data into one collection
+class SectionDiff(BaseModel):
+    created: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+    ms: float = 0.0
+
+class MigrationSummary(BaseModel):
+    portfolioId: str
+    sections: Dict[str, SectionDiff]        # "portfolio" and each section collection
+    ms: float = 0.0
+
+    @property
+    def writes(self) -> int:
+        return sum(diff.created + diff.updated + diff.deleted for diff in self.sections.values())
+
+# Record of a deleted section item, kept so delta sync can report deletions
+class Tombstone(BaseModel):
+    portfolioId: str
+    section: str
+    id: str
+    updatedAt: datetime
+
+# Documents changed since a point in time
+class PortfolioChanges(BaseModel):
+    since: datetime
+    until: datetime                         # pass as `since` on the next call
+    portfolio: Optional[Portfolio] = None
+    skills: List[SkillCategory] = []
+    experiences: List[Experience] = []
+    projects: List[Project] = []
+    achievements: List[Achievement] = []
+    publications: List[Publication] = []
+    deleted: List[Tombstone] = []
+
+# Change notification pushed to stream subscribers
+class ChangeEvent(BaseModel):
+    portfolioId: str
+    section: str                            # "portfolio" or a section collection name
+    op: str                                 # create | update | delete | reset | changed
+    id: Optional[str] = None
+    document: Optional[Dict[str, Any]] = None
+    version: Optional[int] = None
+    timestamp: datetime = Field(default_factory = lambda: datetime.now(timezone.utc))
+
+# Ranked full-text search result
+class SearchHit(BaseModel):
+    section: str                            # projects | experiences | publications
+    id: str
+    score: float
+    document: Dict[str, Any]
+
+class SearchResults(BaseModel):
+    query: str
+    hits: List[SearchHit]
+
+# Autocomplete suggestion for skill items and project technologies
+class Suggestion(BaseModel):
+    value: str
+    count: int                              # items using this value
+    sources: List[str]                      # sections it appears in: skills, projects
+
+# Project recommended for another, with its technology overlap
+class RelatedProject(BaseModel):
+    project: Project
+    score: float                            # Jaccard similarity of technologies, 0-1
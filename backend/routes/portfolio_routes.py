@@ -1,54 +1,169 @@
-from fastapi import APIRouter, HTTPException, Depends, Request
-from typing import Dict, Any
+from fastapi import APIRouter, HTTPException, Depends, Request, Response, Path, Query
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import Dict, Any, List, Optional
+from datetime import datetime
 from models.portfolio import *
-from services.portfolio_service import PortfolioService
-from motor.core import AgnosticDatabase
+from services.circuit_breaker import DatabaseUnavailable
+from services.portfolio_service import PortfolioService, DEFAULT_PORTFOLIO_ID, PORTFOLIO_ID_PATTERN, NOT_FOUND, UNCHANGED
+from services.pagination import MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, InvalidCursor
+from services.search_index import SEARCH_FIELDS
+from services.typeahead import TERM_FIELDS
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Create router
-router = APIRouter(prefix = "/api", tags = ["portfolio"])
+# Create router; it is mounted at /api for the default portfolio and at
+# /api/portfolios/{portfolio_id} for every tenant (see server.py)
+router = APIRouter(tags = ["portfolio"])
 
-# Dependency to get database
-def get_database(request: Request) -> AgnosticDatabase:
-    return request.app.database
+# Prefix under which tenant-scoped copies of the routes are mounted
+TENANT_PREFIX = "/api/portfolios/{portfolio_id}"
+
+# Dependency that declares and validates the tenant path parameter
+def validate_portfolio_id(portfolio_id: str = Path(..., pattern = PORTFOLIO_ID_PATTERN)) -> str:
+    return portfolio_id
+
+# Dependency to get the portfolio id of the request (default outside tenant routes)
+def get_portfolio_id(request: Request) -> str:
+    return request.path_params.get("portfolio_id", DEFAULT_PORTFOLIO_ID)
 
 # Dependency to get portfolio service
-def get_portfolio_service(db: AgnosticDatabase = Depends(get_database)):
-    return PortfolioService(db)
+def get_portfolio_service(request: Request) -> PortfolioService:
+    return request.app.portfolio_service
+
+# Dependency for the optional keyset pagination of section lists (None = the whole list)
+def get_page_params(
+    limit: Optional[int] = Query(None, ge = 1, le = MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, max_length = 512),
+) -> Optional[Dict[str, Any]]:
+    if limit is None and cursor is None:
+        return None
+    return {"limit": limit, "cursor": cursor}
+
+# Exception handler (registered in server.py) answering reads the database cannot serve
+async def database_unavailable_handler(request: Request, error: DatabaseUnavailable) -> JSONResponse:
+    headers = {"Retry-After": str(max(1, round(error.retry_after)))} if error.retry_after else None
+    return JSONResponse({"detail": error.detail}, status_code = 503, headers = headers)
+
+def parse_ids(ids: str) -> List[str]:
+    """Item ids from a comma-separated `ids` parameter"""
+    item_ids = [item_id.strip() for item_id in ids.split(",") if item_id.strip()]
+    if len(item_ids) > MAX_PAGE_SIZE:
+        raise HTTPException(status_code = 400, detail = f"At most {MAX_PAGE_SIZE} ids per request")
+    return item_ids
+
+async def paged(service: PortfolioService, section: str, portfolio_id: str, page: Dict[str, Any],
+                response: Response, **filters) -> List[Any]:
+    """One page of a section; the next page's cursor goes in the X-Next-Cursor header"""
+    try:
+        items, next_cursor = await service.get_page(section, portfolio_id, **page, **filters)
+    except InvalidCursor as e:
+        raise HTTPException(status_code = 400, detail = str(e))
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return items
 
 # Portfolio endpoints
 @router.get("/portfolio", response_model = Optional[PortfolioResponse])
-async def get_portfolio(service: PortfolioService = Depends(get_portfolio_service)):
+async def get_portfolio(
+    service: PortfolioService = Depends(get_portfolio_service),
+    portfolio_id: str = Depends(get_portfolio_id)
+):
     """Get complete portfolio data"""
     try:
-        portfolio_data = await service.get_portfolio()
+        portfolio_data = await service.get_portfolio(portfolio_id)
         if not portfolio_data:
             logger.error("Portfolio not found")
             raise HTTPException(status_code = 404, detail = "Portfolio not found")
         return portfolio_data
-    except HTTPException as e:
+    except (HTTPException, DatabaseUnavailable) as e:
         logger.exception(f"HTTP error retrieving portfolio: {e.detail}")
         raise e
     except Exception as e:
         logger.exception(f"Error retrieving portfolio: {e}")
         raise HTTPException(status_code = 500, detail = str(e))
 
+@router.get("/portfolio/changes", response_model = PortfolioChanges)
+async def get_portfolio_changes(
+    since: datetime,
+    service: PortfolioService = Depends(get_portfolio_service),
+    portfolio_id: str = Depends(get_portfolio_id)
+):
+    """Get documents changed and items deleted since a timestamp"""
+    try:
+        return await service.get_changes(since, portfolio_id)
+    except (HTTPException, DatabaseUnavailable):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code = 500, detail = str(e))
+
+@router.get("/portfolio/stream")
+async def stream_portfolio_changes(request: Request, portfolio_id: str = Depends(get_portfolio_id)):
+    """Stream section-level change events (Server-Sent Events)"""
+    return StreamingResponse(
+        request.app.change_broker.stream(portfolio_id),
+        media_type = "text/event-stream",
+        headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/search", response_model = SearchResults)
+async def search_portfolio(
+    request: Request,
+    q: str = Query(..., min_length = 1, max_length = 200),
+    limit: int = Query(10, ge = 1, le = 100),
+    section: Optional[List[str]] = Query(None),
+    service: PortfolioService = Depends(get_portfolio_service),
+    portfolio_id: str = Depends(get_portfolio_id)
+):
+    """Ranked search over projects, experiences and publications"""
+    try:
+        unknown = set(section or ()) - set(SEARCH_FIELDS)
+        if unknown:
+            raise HTTPException(status_code = 400, detail = f"Unknown section(s): {', '.join(sorted(unknown))}")
+        hits = await request.app.search_index.search(service, portfolio_id, q, limit, section)
+        return SearchResults(query = q, hits = hits)
+    except (HTTPException, DatabaseUnavailable):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code = 500, detail = str(e))
+
+@router.get("/autocomplete", response_model = List[Suggestion])
+async def autocomplete(
+    request: Request,
+    prefix: str = Query(..., min_length = 1, max_length = 100),
+    limit: int = Query(10, ge = 1, le = 50),
+    source: Optional[List[str]] = Query(None),
+    service: PortfolioService = Depends(get_portfolio_service),
+    portfolio_id: str = Depends(get_portfolio_id)
+):
+    """Suggest skill items and project technologies starting with prefix"""
+    try:
+        unknown = set(source or ()) - set(TERM_FIELDS)
+        if unknown:
+            raise HTTPException(status_code = 400, detail = f"Unknown source(s): {', '.join(sorted(unknown))}")
+        return await request.app.typeahead_index.suggest(service, portfolio_id, prefix, limit, source)
+    except (HTTPException, DatabaseUnavailable):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code = 500, detail = str(e))
+
 @router.put("/portfolio/personal", response_model = Dict[str, str])
 async def update_personal_info(
     updates: PersonalInfoUpdate,
-    service: PortfolioService = Depends(get_portfolio_service)
+    service: PortfolioService = Depends(get_portfolio_service),
+    portfolio_id: str = Depends(get_portfolio_id)
 ):
     """Update personal information"""
     try:
-        success = await service.update_personal_info(updates)
-        if not success:
+        outcome = await service.update_personal_info(updates, portfolio_id)
+        if outcome == NOT_FOUND:
             logger.error("No updates provided or portfolio not found")
             raise HTTPException(status_code = 400, detail = "No updates provided or portfolio not found")
+        if outcome == UNCHANGED:
+            return {"message": "Personal information unchanged", "status": outcome}
         logger.info("Personal information updated successfully")
-        return {"message": "Personal information updated successfully"}
-    except HTTPException:
+        return {"message": "Personal information updated successfully", "status": outcome}
+    except (HTTPException, DatabaseUnavailable):
         raise
     except Exception as e:
         raise HTTPException(status_code = 500, detail = str(e))
@@ -56,27 +171,41 @@ async def update_personal_info(
 @router.put("/portfolio/about", response_model = Dict[str, str])
 async def update_about_section(
     updates: AboutSectionUpdate,
-    service: PortfolioService = Depends(get_portfolio_service)
+    service: PortfolioService = Depends(get_portfolio_service),
+    portfolio_id: str = Depends(get_portfolio_id)
 ):
     """Update about section"""
     try:
-        success = await service.update_about_section(updates)
-        if not success:
+        outcome = await service.update_about_section(updates, portfolio_id)
+        if outcome == NOT_FOUND:
             raise HTTPException(status_code = 400, detail = "No updates provided or portfolio not found")
-        return {"message": "About section updated successfully"}
-    except HTTPException:
+        if outcome == UNCHANGED:
+            return {"message": "About section unchanged", "status": outcome}
+        return {"message": "About section updated successfully", "status": outcome}
+    except (HTTPException, DatabaseUnavailable):
         raise
     except Exception as e:
         raise HTTPException(status_code = 500, detail = str(e))
 
 # Skills endpoints
 @router.get("/skills", response_model = List[SkillCategory])
-async def get_skills(service: PortfolioService = Depends(get_portfolio_service)):
-    """Get all skill categories"""
+async def get_skills(
+    response: Response,
+    item: Optional[List[str]] = Query(None),
+    ids: Optional[str] = Query(None, max_length = 20_000),
+    page: Optional[Dict[str, Any]] = Depends(get_page_params),
+    service: PortfolioService = Depends(get_portfolio_service),
+    portfolio_id: str = Depends(get_portfolio_id)
+):
+    """Get all skill categories (or one page of them), optionally only those containing every `item`; `ids` fetches specific categories instead"""
     try:
-        skills = await service.get_skills()
+        if ids is not None:
+            return await service.get_items("skills", parse_ids(ids), portfolio_id)
+        if page is not None:
+            return await paged(service, "skills", portfolio_id, page, response, all_of = {"items": item} if item else None)
+        skills = await service.find_skills(portfolio_id, item)
         return skills
-    except HTTPException:
+    except (HTTPException, DatabaseUnavailable):
         raise
     except Exception as e:
         raise HTTPException(status_code = 500, detail = str(e))
@@ -84,13 +213,31 @@ async def get_skills(service: PortfolioService = Depends(get_portfolio_service))
 @router.post("/skills", response_model = SkillCategory)
 async def create_skill(
     skill_data: SkillCategoryCreate,
-    service: PortfolioService = Depends(get_portfolio_service)
+    service: PortfolioService = Depends(get_portfolio_service),
+    portfolio_id: str = Depends(get_portfolio_id)
 ):
     """Create new skill category"""
     try:
-        skill = await service.create_skill(skill_data)
+        skill = await service.create_skill(skill_data, portfolio_id)
         return skill
-    except HTTPException:
+    except (HTTPException, DatabaseUnavailable):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code = 500, detail = str(e))
+
+@router.get("/skills/{skill_id}", response_model = SkillCategory)
+async def get_skill(
+    skill_id: str,
+    service: PortfolioService = Depends(get_portfolio_service),
+    portfolio_id: str = Depends(get_portfolio_id)
+):
+    """Get one skill category"""
+    try:
+        item = await service.get_item("skills", skill_id, portfolio_id)
+        if item is None:
+            raise HTTPException(status_code = 404, detail = "Skill category not found")
+        return item
+    except (HTTPException, DatabaseUnavailable):
         raise
     except Exception as e:
         raise HTTPException(status_code = 500, detail = str(e))
@@ -99,15 +246,18 @@ async def create_skill(
 async def update_skill(
     skill_id: str,
     updates: SkillCategoryUpdate,
-    service: PortfolioService = Depends(get_portfolio_service)
+    service: PortfolioService = Depends(get_portfolio_service),
+    portfolio_id: str = Depends(get_portfolio_id)
 ):
     """Update skill category"""
     try:
-        success = await service.update_skill(skill_id, updates)
-        if not success:
+        outcome = await service.update_skill(skill_id, updates, portfolio_id)
+        if outcome == NOT_FOUND:
             raise HTTPException(status_code = 404, detail = "Skill category not found or no updates provided")
-        return {"message": "Skill category updated successfully"}
-    except HTTPException:
+        if outcome == UNCHANGED:
+            return {"message": "Skill category unchanged", "status": outcome}
+        return {"message": "Skill category updated successfully", "status": outcome}
+    except (HTTPException, DatabaseUnavailable):
         raise
     except Exception as e:
         raise HTTPException(status_code = 500, detail = str(e))
@@ -115,27 +265,38 @@ async def update_skill(
 @router.delete("/skills/{skill_id}", response_model = Dict[str, str])
 async def delete_skill(
     skill_id: str,
-    service: PortfolioService = Depends(get_portfolio_service)
+    service: PortfolioService = Depends(get_portfolio_service),
+    portfolio_id: str = Depends(get_portfolio_id)
 ):
     """Delete skill category"""
     try:
-        success = await service.delete_skill(skill_id)
+        success = await service.delete_skill(skill_id, portfolio_id)
         if not success:
             raise HTTPException(status_code = 404, detail = "Skill category not found")
         return {"message": "Skill category deleted successfully"}
-    except HTTPException:
+    except (HTTPException, DatabaseUnavailable):
         raise
     except Exception as e:
         raise HTTPException(status_code = 500, detail = str(e))
 
 # Experience endpoints
 @router.get("/experience", response_model = List[Experience])
-async def get_experiences(service: PortfolioService = Depends(get_portfolio_service)):
-    """Get all experiences"""
+async def get_experiences(
+    response: Response,
+    ids: Optional[str] = Query(None, max_length = 20_000),
+    page: Optional[Dict[str, Any]] = Depends(get_page_params),
+    service: PortfolioService = Depends(get_portfolio_service),
+    portfolio_id: str = Depends(get_portfolio_id)
+):
+    """Get all experiences, one page of them, or those listed in `ids`"""
     try:
-        experiences = await service.get_experiences()
+        if ids is not None:
+            return await service.get_items("experiences", parse_ids(ids), portfolio_id)
+        if page is not None:
+            return await paged(service, "experiences", portfolio_id, page, response)
+        experiences = await service.get_experiences(portfolio_id)
         return experiences
-    except HTTPException:
+    except (HTTPException, DatabaseUnavailable):
         raise
     except Exception as e:
         raise HTTPException(status_code = 500, detail = str(e))
@@ -143,13 +304,31 @@ async def get_experiences(service: PortfolioService = Depends(get_portfolio_serv
 @router.post("/experience", response_model = Experience)
 async def create_experience(
     exp_data: ExperienceCreate,
-    service: PortfolioService = Depends(get_portfolio_service)
+    service: PortfolioService = Depends(get_portfolio_service),
+    portfolio_id: str = Depends(get_portfolio_id)
 ):
     """Create new experience"""
     try:
-        experience = await service.create_experience(exp_data)
+        experience = await service.create_experience(exp_data, portfolio_id)
         return experience
-    except HTTPException:
+    except (HTTPException, DatabaseUnavailable):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code = 500, detail = str(e))
+
+@router.get("/experience/{exp_id}", response_model = Experience)
+async def get_experience(
+    exp_id: str,
+    service: PortfolioService = Depends(get_portfolio_service),
+    portfolio_id: str = Depends(get_portfolio_id)
+):
+    """Get one experience"""
+    try:
+        item = await service.get_item("experiences", exp_id, portfolio_id)
+        if item is None:
+            raise HTTPException(status_code = 404, detail = "Experience not found")
+        return item
+    except (HTTPException, DatabaseUnavailable):
         raise
     except Exception as e:
         raise HTTPException(status_code = 500, detail = str(e))
@@ -158,15 +337,18 @@ async def create_experience(
 async def update_experience(
     exp_id: str,
     updates: ExperienceUpdate,
-    service: PortfolioService = Depends(get_portfolio_service)
+    service: PortfolioService = Depends(get_portfolio_service),
+    portfolio_id: str = Depends(get_portfolio_id)
 ):
     """Update experience"""
     try:
-        success = await service.update_experience(exp_id, updates)
-        if not success:
+        outcome = await service.update_experience(exp_id, updates, portfolio_id)
+        if outcome == NOT_FOUND:
             raise HTTPException(status_code = 404, detail = "Experience not found or no updates provided")
-        return {"message": "Experience updated successfully"}
-    except HTTPException:
+        if outcome == UNCHANGED:
+            return {"message": "Experience unchanged", "status": outcome}
+        return {"message": "Experience updated successfully", "status": outcome}
+    except (HTTPException, DatabaseUnavailable):
         raise
     except Exception as e:
         raise HTTPException(status_code = 500, detail = str(e))
@@ -174,27 +356,77 @@ async def update_experience(
 @router.delete("/experience/{exp_id}", response_model = Dict[str, str])
 async def delete_experience(
     exp_id: str,
-    service: PortfolioService = Depends(get_portfolio_service)
+    service: PortfolioService = Depends(get_portfolio_service),
+    portfolio_id: str = Depends(get_portfolio_id)
 ):
     """Delete experience"""
     try:
-        success = await service.delete_experience(exp_id)
+        success = await service.delete_experience(exp_id, portfolio_id)
         if not success:
             raise HTTPException(status_code = 404, detail = "Experience not found")
         return {"message": "Experience deleted successfully"}
-    except HTTPException:
+    except (HTTPException, DatabaseUnavailable):
         raise
     except Exception as e:
         raise HTTPException(status_code = 500, detail = str(e))
 
 # Projects endpoints
 @router.get("/projects", response_model = List[Project])
-async def get_projects(service: PortfolioService = Depends(get_portfolio_service)):
-    """Get all projects"""
+async def get_projects(
+    response: Response,
+    technology: Optional[List[str]] = Query(None),
+    featured: Optional[bool] = None,
+    ids: Optional[str] = Query(None, max_length = 20_000),
+    page: Optional[Dict[str, Any]] = Depends(get_page_params),
+    service: PortfolioService = Depends(get_portfolio_service),
+    portfolio_id: str = Depends(get_portfolio_id)
+):
+    """Get all projects (or one page of them), optionally only those using every `technology` and matching `featured`; `ids` fetches specific projects instead"""
     try:
-        projects = await service.get_projects()
+        if ids is not None:
+            return await service.get_items("projects", parse_ids(ids), portfolio_id)
+        if page is not None:
+            return await paged(
+                service, "projects", portfolio_id, page, response,
+                all_of = {"technologies": technology} if technology else None,
+                equals = {"featured": featured} if featured is not None else None,
+            )
+        projects = await service.find_projects(portfolio_id, technology, featured)
         return projects
-    except HTTPException:
+    except (HTTPException, DatabaseUnavailable):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code = 500, detail = str(e))
+
+# Declared before any /projects/{project_id} route so "facets" is not taken as an id
+@router.get("/projects/facets", response_model = ProjectFacets)
+async def get_project_facets(
+    service: PortfolioService = Depends(get_portfolio_service),
+    portfolio_id: str = Depends(get_portfolio_id)
+):
+    """Get project counts per technology"""
+    try:
+        return await service.get_project_facets(portfolio_id)
+    except (HTTPException, DatabaseUnavailable):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code = 500, detail = str(e))
+
+@router.get("/projects/{project_id}/related", response_model = List[RelatedProject])
+async def get_related_projects(
+    project_id: str,
+    request: Request,
+    k: int = Query(5, ge = 1, le = 50),
+    service: PortfolioService = Depends(get_portfolio_service),
+    portfolio_id: str = Depends(get_portfolio_id)
+):
+    """Get the projects sharing the most technologies with a project"""
+    try:
+        related = await request.app.project_similarity.related(service, portfolio_id, project_id, k)
+        if related is None:
+            raise HTTPException(status_code = 404, detail = "Project not found")
+        return related
+    except (HTTPException, DatabaseUnavailable):
         raise
     except Exception as e:
         raise HTTPException(status_code = 500, detail = str(e))
@@ -202,13 +434,31 @@ async def get_projects(service: PortfolioService = Depends(get_portfolio_service
 @router.post("/projects", response_model = Project)
 async def create_project(
     project_data: ProjectCreate,
-    service: PortfolioService = Depends(get_portfolio_service)
+    service: PortfolioService = Depends(get_portfolio_service),
+    portfolio_id: str = Depends(get_portfolio_id)
 ):
     """Create new project"""
     try:
-        project = await service.create_project(project_data)
+        project = await service.create_project(project_data, portfolio_id)
         return project
-    except HTTPException:
+    except (HTTPException, DatabaseUnavailable):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code = 500, detail = str(e))
+
+@router.get("/projects/{project_id}", response_model = Project)
+async def get_project(
+    project_id: str,
+    service: PortfolioService = Depends(get_portfolio_service),
+    portfolio_id: str = Depends(get_portfolio_id)
+):
+    """Get one project"""
+    try:
+        item = await service.get_item("projects", project_id, portfolio_id)
+        if item is None:
+            raise HTTPException(status_code = 404, detail = "Project not found")
+        return item
+    except (HTTPException, DatabaseUnavailable):
         raise
     except Exception as e:
         raise HTTPException(status_code = 500, detail = str(e))
@@ -217,15 +467,18 @@ async def create_project(
 async def update_project(
     project_id: str,
     updates: ProjectUpdate,
-    service: PortfolioService = Depends(get_portfolio_service)
+    service: PortfolioService = Depends(get_portfolio_service),
+    portfolio_id: str = Depends(get_portfolio_id)
 ):
     """Update project"""
     try:
-        success = await service.update_project(project_id, updates)
-        if not success:
+        outcome = await service.update_project(project_id, updates, portfolio_id)
+        if outcome == NOT_FOUND:
             raise HTTPException(status_code = 404, detail = "Project not found or no updates provided")
-        return {"message": "Project updated successfully"}
-    except HTTPException:
+        if outcome == UNCHANGED:
+            return {"message": "Project unchanged", "status": outcome}
+        return {"message": "Project updated successfully", "status": outcome}
+    except (HTTPException, DatabaseUnavailable):
         raise
     except Exception as e:
         raise HTTPException(status_code = 500, detail = str(e))
@@ -233,27 +486,38 @@ async def update_project(
 @router.delete("/projects/{project_id}", response_model = Dict[str, str])
 async def delete_project(
     project_id: str,
-    service: PortfolioService = Depends(get_portfolio_service)
+    service: PortfolioService = Depends(get_portfolio_service),
+    portfolio_id: str = Depends(get_portfolio_id)
 ):
     """Delete project"""
     try:
-        success = await service.delete_project(project_id)
+        success = await service.delete_project(project_id, portfolio_id)
         if not success:
             raise HTTPException(status_code = 404, detail = "Project not found")
         return {"message": "Project deleted successfully"}
-    except HTTPException:
+    except (HTTPException, DatabaseUnavailable):
         raise
     except Exception as e:
         raise HTTPException(status_code = 500, detail = str(e))
 
 # Achievements endpoints
 @router.get("/achievements", response_model = List[Achievement])
-async def get_achievements(service: PortfolioService = Depends(get_portfolio_service)):
-    """Get all achievements"""
+async def get_achievements(
+    response: Response,
+    ids: Optional[str] = Query(None, max_length = 20_000),
+    page: Optional[Dict[str, Any]] = Depends(get_page_params),
+    service: PortfolioService = Depends(get_portfolio_service),
+    portfolio_id: str = Depends(get_portfolio_id)
+):
+    """Get all achievements, one page of them, or those listed in `ids`"""
     try:
-        achievements = await service.get_achievements()
+        if ids is not None:
+            return await service.get_items("achievements", parse_ids(ids), portfolio_id)
+        if page is not None:
+            return await paged(service, "achievements", portfolio_id, page, response)
+        achievements = await service.get_achievements(portfolio_id)
         return achievements
-    except HTTPException:
+    except (HTTPException, DatabaseUnavailable):
         raise
     except Exception as e:
         raise HTTPException(status_code = 500, detail = str(e))
@@ -261,13 +525,31 @@ async def get_achievements(service: PortfolioService = Depends(get_portfolio_ser
 @router.post("/achievements", response_model = Achievement)
 async def create_achievement(
     achievement_data: AchievementCreate,
-    service: PortfolioService = Depends(get_portfolio_service)
+    service: PortfolioService = Depends(get_portfolio_service),
+    portfolio_id: str = Depends(get_portfolio_id)
 ):
     """Create new achievement"""
     try:
-        achievement = await service.create_achievement(achievement_data)
+        achievement = await service.create_achievement(achievement_data, portfolio_id)
         return achievement
-    except HTTPException:
+    except (HTTPException, DatabaseUnavailable):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code = 500, detail = str(e))
+
+@router.get("/achievements/{achievement_id}", response_model = Achievement)
+async def get_achievement(
+    achievement_id: str,
+    service: PortfolioService = Depends(get_portfolio_service),
+    portfolio_id: str = Depends(get_portfolio_id)
+):
+    """Get one achievement"""
+    try:
+        item = await service.get_item("achievements", achievement_id, portfolio_id)
+        if item is None:
+            raise HTTPException(status_code = 404, detail = "Achievement not found")
+        return item
+    except (HTTPException, DatabaseUnavailable):
         raise
     except Exception as e:
         raise HTTPException(status_code = 500, detail = str(e))
@@ -276,15 +558,18 @@ async def create_achievement(
 async def update_achievement(
     achievement_id: str,
     updates: AchievementUpdate,
-    service: PortfolioService = Depends(get_portfolio_service)
+    service: PortfolioService = Depends(get_portfolio_service),
+    portfolio_id: str = Depends(get_portfolio_id)
 ):
     """Update achievement"""
     try:
-        success = await service.update_achievement(achievement_id, updates)
-        if not success:
+        outcome = await service.update_achievement(achievement_id, updates, portfolio_id)
+        if outcome == NOT_FOUND:
             raise HTTPException(status_code = 404, detail = "Achievement not found or no updates provided")
-        return {"message": "Achievement updated successfully"}
-    except HTTPException:
+        if outcome == UNCHANGED:
+            return {"message": "Achievement unchanged", "status": outcome}
+        return {"message": "Achievement updated successfully", "status": outcome}
+    except (HTTPException, DatabaseUnavailable):
         raise
     except Exception as e:
         raise HTTPException(status_code = 500, detail = str(e))
@@ -292,27 +577,38 @@ async def update_achievement(
 @router.delete("/achievements/{achievement_id}", response_model = Dict[str, str])
 async def delete_achievement(
     achievement_id: str,
-    service: PortfolioService = Depends(get_portfolio_service)
+    service: PortfolioService = Depends(get_portfolio_service),
+    portfolio_id: str = Depends(get_portfolio_id)
 ):
     """Delete achievement"""
     try:
-        success = await service.delete_achievement(achievement_id)
+        success = await service.delete_achievement(achievement_id, portfolio_id)
         if not success:
             raise HTTPException(status_code = 404, detail = "Achievement not found")
         return {"message": "Achievement deleted successfully"}
-    except HTTPException:
+    except (HTTPException, DatabaseUnavailable):
         raise
     except Exception as e:
         raise HTTPException(status_code = 500, detail = str(e))
 
 # Publications endpoints
 @router.get("/publications", response_model = List[Publication])
-async def get_publications(service: PortfolioService = Depends(get_portfolio_service)):
-    """Get all publications"""
+async def get_publications(
+    response: Response,
+    ids: Optional[str] = Query(None, max_length = 20_000),
+    page: Optional[Dict[str, Any]] = Depends(get_page_params),
+    service: PortfolioService = Depends(get_portfolio_service),
+    portfolio_id: str = Depends(get_portfolio_id)
+):
+    """Get all publications, one page of them, or those listed in `ids`"""
     try:
-        publications = await service.get_publications()
+        if ids is not None:
+            return await service.get_items("publications", parse_ids(ids), portfolio_id)
+        if page is not None:
+            return await paged(service, "publications", portfolio_id, page, response)
+        publications = await service.get_publications(portfolio_id)
         return publications
-    except HTTPException:
+    except (HTTPException, DatabaseUnavailable):
         raise
     except Exception as e:
         raise HTTPException(status_code = 500, detail = str(e))
@@ -320,13 +616,31 @@ async def get_publications(service: PortfolioService = Depends(get_portfolio_ser
 @router.post("/publications", response_model = Publication)
 async def create_publication(
     pub_data: PublicationCreate,
-    service: PortfolioService = Depends(get_portfolio_service)
+    service: PortfolioService = Depends(get_portfolio_service),
+    portfolio_id: str = Depends(get_portfolio_id)
 ):
     """Create new publication"""
     try:
-        publication = await service.create_publication(pub_data)
+        publication = await service.create_publication(pub_data, portfolio_id)
         return publication
-    except HTTPException:
+    except (HTTPException, DatabaseUnavailable):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code = 500, detail = str(e))
+
+@router.get("/publications/{pub_id}", response_model = Publication)
+async def get_publication(
+    pub_id: str,
+    service: PortfolioService = Depends(get_portfolio_service),
+    portfolio_id: str = Depends(get_portfolio_id)
+):
+    """Get one publication"""
+    try:
+        item = await service.get_item("publications", pub_id, portfolio_id)
+        if item is None:
+            raise HTTPException(status_code = 404, detail = "Publication not found")
+        return item
+    except (HTTPException, DatabaseUnavailable):
         raise
     except Exception as e:
         raise HTTPException(status_code = 500, detail = str(e))
@@ -335,15 +649,18 @@ async def create_publication(
 async def update_publication(
     pub_id: str,
     updates: PublicationUpdate,
-    service: PortfolioService = Depends(get_portfolio_service)
+    service: PortfolioService = Depends(get_portfolio_service),
+    portfolio_id: str = Depends(get_portfolio_id)
 ):
     """Update publication"""
     try:
-        success = await service.update_publication(pub_id, updates)
-        if not success:
+        outcome = await service.update_publication(pub_id, updates, portfolio_id)
+        if outcome == NOT_FOUND:
             raise HTTPException(status_code = 404, detail = "Publication not found or no updates provided")
-        return {"message": "Publication updated successfully"}
-    except HTTPException:
+        if outcome == UNCHANGED:
+            return {"message": "Publication unchanged", "status": outcome}
+        return {"message": "Publication updated successfully", "status": outcome}
+    except (HTTPException, DatabaseUnavailable):
         raise
     except Exception as e:
         raise HTTPException(status_code = 500, detail = str(e))
@@ -351,45 +668,50 @@ async def update_publication(
 @router.delete("/publications/{pub_id}", response_model = Dict[str, str])
 async def delete_publication(
     pub_id: str,
-    service: PortfolioService = Depends(get_portfolio_service)
+    service: PortfolioService = Depends(get_portfolio_service),
+    portfolio_id: str = Depends(get_portfolio_id)
 ):
     """Delete publication"""
     try:
-        success = await service.delete_publication(pub_id)
+        success = await service.delete_publication(pub_id, portfolio_id)
         if not success:
             raise HTTPException(status_code = 404, detail = "Publication not found")
         return {"message": "Publication deleted successfully"}
-    except HTTPException:
+    except (HTTPException, DatabaseUnavailable):
         raise
     except Exception as e:
         raise HTTPException(status_code = 500, detail = str(e))
 
 # Migration and export endpoints
-@router.post("/migrate", response_model = Dict[str, str])
+@router.post("/migrate", response_model = Dict[str, Any])
 async def migrate_mock_data( 
     mock_data: Dict[str, Any],
-    service: PortfolioService = Depends(get_portfolio_service)
+    service: PortfolioService = Depends(get_portfolio_service),
+    portfolio_id: str = Depends(get_portfolio_id)
 ):
     """Migrate mock.js data to database"""
     try:
-        success = await service.migrate_mock_data(mock_data)
-        if not success:
+        summary = await service.migrate_mock_data(mock_data, portfolio_id)
+        if summary is None:
             raise HTTPException(status_code = 422, detail = "Migration failed")
-        return {"message": "Data migrated successfully"}
-    except HTTPException:
+        return {"message": "Data migrated successfully", "writes": summary.writes, "summary": summary.model_dump()}
+    except (HTTPException, DatabaseUnavailable):
         raise
     except Exception as e:
         raise HTTPException(status_code = 500, detail = str(e))
 
 @router.get("/export")
-async def export_data(service: PortfolioService = Depends(get_portfolio_service)):
+async def export_data(
+    service: PortfolioService = Depends(get_portfolio_service),
+    portfolio_id: str = Depends(get_portfolio_id)
+):
     """Export all portfolio data"""
     try:
-        data = await service.export_data()
+        data = await service.export_data(portfolio_id)
         if not data:
             raise HTTPException(status_code = 404, detail = "No data found")
         return data
-    except HTTPException:
+    except (HTTPException, DatabaseUnavailable):
         raise
     except Exception as e:
         raise HTTPException(status_code = 500, detail = str(e))
\ No newline at end of file
@@ -1,19 +1,37 @@
+import time
+_IMPORT_STARTED = time.perf_counter()   # module import time is reported at startup
+
 from fastapi import FastAPI, APIRouter, Depends, Request
+from fastapi.responses import JSONResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
-from motor.core import AgnosticDatabase
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo.errors import CollectionInvalid
+import asyncio
 import os
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field
-from typing import List, AsyncGenerator, Dict
+from typing import List, AsyncGenerator, Dict, Any, Awaitable
 import uuid
 from datetime import datetime, timezone
 from contextlib import asynccontextmanager
 
 # Import routes
-from routes.portfolio_routes import router as portfolio_router
+from routes.portfolio_routes import router as portfolio_router, TENANT_PREFIX, validate_portfolio_id, database_unavailable_handler
+from services.portfolio_service import PortfolioService, SECTIONS, DEFAULT_PORTFOLIO_ID, CACHED_TYPES
+from services.portfolio_cache import PortfolioCache
+from services.snapshot_publisher import SnapshotPublisher
+from services.version_ledger import CoherenceWatcher
+from services.health import HealthMonitor
+from services.change_broker import ChangeBroker
+from services.search_index import SearchIndex
+from services.typeahead import TypeaheadIndex
+from services.project_similarity import ProjectSimilarity
+from services.circuit_breaker import CircuitBreaker, DatabaseUnavailable
+from services.fallback_store import FallbackStore, StalenessMiddleware
+from services.storage import create_storage
+from services.response_encoding import NegotiatedResponse, ContentNegotiationMiddleware
 
 # load environment variables
 ROOT_DIR = Path(__file__).parent
@@ -31,47 +49,158 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+async def _run_phase(name: str, phase: Awaitable[Any], report: Dict[str, Dict[str, Any]]) -> bool:
+    """Run one startup phase, recording its duration and outcome"""
+    start = time.perf_counter()
+    try:
+        await phase
+        report[name] = {"ok": True}
+    except Exception as e:
+        logging.error(f"Startup phase '{name}' failed: {e}")
+        report[name] = {"ok": False, "error": str(e)}
+    report[name]["ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return report[name]["ok"]
+
+async def ensure_status_collection(status_db: AsyncIOMotorDatabase):
+    """Create the status_checks collection unless it already exists"""
+    try:
+        await status_db.create_collection("status_checks")
+        logging.info("Created 'status_checks' collection.")
+    except CollectionInvalid:
+        pass
+
 # New Lifespan Manager for app startup and shutdown
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
+    startup_started = time.perf_counter()
+    report: Dict[str, Dict[str, Any]] = {}
+
     # Startup: Connect to the database
     mongo_uri = os.environ['MONGO_URI']
-    app.mongodb_client = AsyncIOMotorClient(mongo_uri)
+    # The pool size is set per worker by launcher.py from MONGO_POOL_BUDGET
+    pool_options = {}
+    if os.environ.get("MONGO_MAX_POOL_SIZE"):
+        pool_options["maxPoolSize"] = int(os.environ["MONGO_MAX_POOL_SIZE"])
+    app.mongodb_client = AsyncIOMotorClient(mongo_uri, **pool_options)
     app.database = app.mongodb_client[os.environ['DB_NAME']]
     app.status_db = app.mongodb_client[os.environ['STATUS_DB_NAME']]
+    # Portfolio data lives in MongoDB or in an embedded SQLite file; status checks always use MongoDB
+    app.portfolio_storage = create_storage(
+        os.environ.get("STORAGE_BACKEND", "mongo"),
+        db = app.database,
+        sqlite_path = Path(os.environ.get("SQLITE_PATH", str(ROOT_DIR / "data" / "portfolio.db"))),
+    )
+
+    # Shared portfolio service; an optional in-memory cache partitioned per portfolio
+    cache_max_items = int(os.environ.get("PORTFOLIO_CACHE_MAX_ITEMS", "0"))
+    app.portfolio_cache = PortfolioCache(
+        max_weight = cache_max_items,
+        tenant_quota = int(os.environ.get("PORTFOLIO_CACHE_TENANT_QUOTA", "5000")),
+        # Stale-while-revalidate: past the soft TTL serve the cached copy and refresh it in the background
+        soft_ttl = float(os.environ.get("PORTFOLIO_CACHE_SOFT_TTL", "0")),
+        hard_ttl = float(os.environ.get("PORTFOLIO_CACHE_HARD_TTL", "0")),
+    ) if cache_max_items > 0 else None
+    # Optional static snapshot publisher for CDN serving
+    snapshot_dir = os.environ.get("SNAPSHOT_DIR")
+    app.snapshot_publisher = SnapshotPublisher(Path(snapshot_dir)) if snapshot_dir else None
+    # Per-worker source of change events for stream subscribers
+    app.change_broker = ChangeBroker()
+    # Full-text and typeahead indexes, built per portfolio on first use and kept current from change events
+    index_max_portfolios = int(os.environ.get("SEARCH_INDEX_MAX_PORTFOLIOS", "1000"))
+    app.search_index = SearchIndex(max_tenants = index_max_portfolios)
+    app.typeahead_index = TypeaheadIndex(max_tenants = index_max_portfolios)
+    app.project_similarity = ProjectSimilarity()
+    # Reads fail fast once MongoDB is down or over its latency budget, and are then served from the
+    # optional last-known-good copies on disk
+    app.database_breaker = CircuitBreaker(
+        failure_threshold = int(os.environ.get("DB_CIRCUIT_FAILURE_THRESHOLD", "5")),
+        reset_timeout = float(os.environ.get("DB_CIRCUIT_RESET_TIMEOUT", "30")),
+        latency_budget = float(os.environ.get("DB_LATENCY_BUDGET", "2.0")),
+    )
+    fallback_dir = os.environ.get("FALLBACK_DIR")
+    app.fallback_store = FallbackStore(Path(fallback_dir), CACHED_TYPES) if fallback_dir else None
+    app.portfolio_service = PortfolioService(
+        app.portfolio_storage,
+        cache = app.portfolio_cache,
+        publisher = app.snapshot_publisher,
+        listeners = [
+            app.change_broker.publish,
+            app.search_index.on_change,
+            app.typeahead_index.on_change,
+            app.project_similarity.on_change,
+        ],
+        breaker = app.database_breaker,
+        fallback = app.fallback_store,
+    )
 
+    # Independent bootstrap phases run concurrently; all of them are idempotent
     logging.info("Attempting to establish MongoDB connection...")
-    try:
-        await app.database.command("ping")
-        await app.status_db.command("ping")
-        logging.info("MongoDB connection established.") 
-    except Exception as e:
-        logging.info(f"Failed to connect to MongoDB: {e}")
-    
-    # collection to store status checks
-    if "status_checks" not in await app.status_db.list_collection_names():    
-        await app.status_db.create_collection("status_checks")
-        logging.info("Created 'status_checks' collection.")
+    await asyncio.gather(
+        _run_phase("ping database", app.portfolio_storage.command("ping"), report),
+        _run_phase("ping status database", app.status_db.command("ping"), report),
+        _run_phase("status collection", ensure_status_collection(app.status_db), report),
+        _run_phase("portfolio indexes", app.portfolio_service.ensure_indexes(), report),
+    )
+    if report["ping database"]["ok"] and report["ping status database"]["ok"]:
+        logging.info("MongoDB connection established.")
+    if not report["ping database"]["ok"]:
+        app.database_breaker.trip("startup ping failed")
+
+    if app.snapshot_publisher is not None:
+        app.snapshot_publisher.schedule(app.portfolio_service, DEFAULT_PORTFOLIO_ID, SECTIONS)
+
+    # Keep the cache and stream subscribers coherent with writes handled by other workers/replicas
+    app.coherence_watcher = CoherenceWatcher(
+        app.portfolio_service.ledger,
+        app.portfolio_service.on_remote_change,
+        interval = float(os.environ.get("CACHE_COHERENCE_INTERVAL", "1.0")),
+    )
+    app.coherence_watcher.start()
+
+    # Background database probing for the readiness endpoint
+    # With SQLite storage, MongoDB only serves status checks: it is reported but does not gate readiness
+    app.health_monitor = HealthMonitor(
+        {"database": app.portfolio_storage, "status_db": app.status_db},
+        interval = float(os.environ.get("HEALTH_PROBE_INTERVAL", "5.0")),
+        timeout = float(os.environ.get("HEALTH_PROBE_TIMEOUT", "2.0")),
+        optional = ["status_db"] if os.environ.get("STORAGE_BACKEND", "mongo") == "sqlite" else [],
+    )
+    app.health_monitor.start()
+
+    app.startup_report = {
+        "import_ms": round(IMPORT_SECONDS * 1000, 1),
+        "startup_ms": round((time.perf_counter() - startup_started) * 1000, 1),
+        "phases": report,
+    }
+    phases = ", ".join(f"{name} {phase['ms']}ms{'' if phase['ok'] else ' FAILED'}" for name, phase in report.items())
+    logging.info(f"Startup finished in {app.startup_report['startup_ms']}ms (module import {app.startup_report['import_ms']}ms): {phases}")
     
     yield
     
-    # Shutdown: Close the database connection
+    # Shutdown: Finish pending snapshot renders, then close the database connection
     logging.info("Application shutdown...")
+    await app.health_monitor.stop()
+    await app.coherence_watcher.stop()
+    await app.portfolio_service.drain()
+    if app.snapshot_publisher is not None:
+        await app.snapshot_publisher.drain()
+    app.portfolio_storage.close()
     app.mongodb_client.close()
     logging.info("MongoDB connection closed.")
 
 # Create the main app without a prefix
-app = FastAPI(title = "Portfolio API", version = "1.0.0", lifespan = lifespan)
+# Responses are JSON by default, or MessagePack/CBOR when the Accept header asks for them
+app = FastAPI(title = "Portfolio API", version = "1.0.0", lifespan = lifespan, default_response_class = NegotiatedResponse)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix = "/api")
 
 # Dependency to get the database connection
-def get_database(request: Request) -> AgnosticDatabase:
+def get_database(request: Request) -> AsyncIOMotorDatabase:
     return request.app.database
 
 # Dependency to get the status check database connection
-def get_status_check_database(request: Request) -> AgnosticDatabase:
+def get_status_check_database(request: Request) -> AsyncIOMotorDatabase:
     return request.app.status_db
 
 # check for Pydantic BaseModel
@@ -88,21 +217,49 @@ class StatusCheckCreate(BaseModel):
 async def root():
     return {"message": "Portfolio API is running"}
 
+@api_router.get("/health/live", response_model = Dict[str, str])
+async def liveness():
+    """Liveness probe: the process is up and serving requests"""
+    return {"status": "alive"}
+
+@api_router.get("/health/ready")
+async def readiness(request: Request):
+    """Readiness probe: latest background database ping results (never queries the database)"""
+    result = request.app.health_monitor.readiness()
+    result["startup"] = request.app.startup_report
+    return JSONResponse(result, status_code = 200 if result["status"] == "ready" else 503)
+
+@api_router.get("/metrics", response_model = Dict[str, Any])
+async def metrics(request: Request):
+    """In-process read counters: cache, coalesced loads, database circuit and fallback copies"""
+    cache = request.app.portfolio_cache
+    fallback = request.app.fallback_store
+    return {
+        "cache": cache.stats() if cache is not None else None,
+        "singleFlight": request.app.portfolio_service.flights.stats(),
+        "circuit": request.app.database_breaker.stats(),
+        "fallback": fallback.stats() if fallback is not None else None,
+    }
+
 @api_router.post("/status", response_model = StatusCheck)
-async def create_status_check(input: StatusCheckCreate, db: AgnosticDatabase = Depends(get_status_check_database)):
+async def create_status_check(input: StatusCheckCreate, db: AsyncIOMotorDatabase = Depends(get_status_check_database)):
     status_dict = input.model_dump()
     status_obj = StatusCheck(**status_dict)
     _ = await db.status_checks.insert_one(status_obj.model_dump())
     return status_obj
 
 @api_router.get("/status", response_model = List[StatusCheck])
-async def get_status_checks(db: AgnosticDatabase = Depends(get_status_check_database)):
+async def get_status_checks(db: AsyncIOMotorDatabase = Depends(get_status_check_database)):
     status_checks = await db.status_checks.find().to_list(1000)
     return [StatusCheck(**status_check) for status_check in status_checks]
 
 # Include all routers
 app.include_router(api_router)
-app.include_router(portfolio_router)
+app.include_router(portfolio_router, prefix = "/api")
+app.include_router(portfolio_router, prefix = TENANT_PREFIX, dependencies = [Depends(validate_portfolio_id)])
+
+# Reads the database cannot serve (and no fallback copy covers) answer 503 with a retry hint
+app.add_exception_handler(DatabaseUnavailable, database_unavailable_handler)
 
 origins = [origin.strip().strip("'").strip('"') for origin in os.getenv("CORS_ORIGINS", "").split(",") if origin]
 
@@ -112,8 +269,13 @@ app.add_middleware(
     allow_origins = origins,
     allow_methods = ["*"],
     allow_headers = ["*"],
+    expose_headers = ["Age", "X-Data-Source", "X-Data-Saved-At", "X-Next-Cursor"],
 )
+app.add_middleware(StalenessMiddleware)
+app.add_middleware(ContentNegotiationMiddleware)
+
+IMPORT_SECONDS = time.perf_counter() - _IMPORT_STARTED
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host = "0.0.0.0", port = 8000)
\ No newline at end of file
+    from launcher import load_config, run
+    run(load_config())
\ No newline at end of file
@@ -0,0 +1,128 @@
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+import hashlib
+import os
+import struct
+import zlib
+
+from bson import decode_all
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+
+# File layout:
+#   MAGIC
+#   chunk*:  header (CHUNK_HEADER) | collection name (utf-8) | zlib-compressed concatenated BSON documents
+#   end:     header with an empty collection name
+MAGIC = b"PFSNAP\x01\n"
+CHUNK_HEADER = struct.Struct(">HIII32s")     # name length, documents, raw bytes, compressed bytes, sha256 of compressed bytes
+
+# Chunks are closed once their raw BSON reaches this size
+DEFAULT_CHUNK_BYTES = 8 * 1024 * 1024
+
+# Documents stay encoded end to end: read as raw BSON, inserted as raw BSON
+RAW_BSON = CodecOptions(document_class = RawBSONDocument)
+
+class ArchiveError(ValueError):
+    """The snapshot file is truncated, corrupted or not a snapshot"""
+
+def _write_chunk(f: BinaryIO, name: str, documents: List[bytes], level: int) -> int:
+    raw = b"".join(documents)
+    compressed = zlib.compress(raw, level)
+    encoded_name = name.encode()
+    f.write(CHUNK_HEADER.pack(len(encoded_name), len(documents), len(raw), len(compressed), hashlib.sha256(compressed).digest()))
+    f.write(encoded_name)
+    f.write(compressed)
+    return len(compressed)
+
+async def write_snapshot(path: Path, collections: Dict[str, Any], level: int = 6,
+                         chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> Dict[str, Dict[str, int]]:
+    """Dump collections to a chunked, compressed BSON file; returns per-collection counts"""
+    stats: Dict[str, Dict[str, int]] = {}
+    partial = path.with_name(path.name + ".partial")
+    with open(partial, "wb") as f:
+        f.write(MAGIC)
+        for name, collection in collections.items():
+            counts = stats[name] = {"documents": 0, "chunks": 0, "bytes": 0}
+            documents: List[bytes] = []
+            size = 0
+            async for document in collection.with_options(codec_options = RAW_BSON).find():
+                documents.append(document.raw)
+                size += len(document.raw)
+                if size >= chunk_bytes:
+                    counts["bytes"] += _write_chunk(f, name, documents, level)
+                    counts["documents"] += len(documents)
+                    counts["chunks"] += 1
+                    documents, size = [], 0
+            if documents:
+                counts["bytes"] += _write_chunk(f, name, documents, level)
+                counts["documents"] += len(documents)
+                counts["chunks"] += 1
+        f.write(CHUNK_HEADER.pack(0, 0, 0, 0, b"\0" * 32))
+        f.flush()
+        os.fsync(f.fileno())
+    # Only a complete snapshot replaces an older one
+    os.replace(partial, path)
+    return stats
+
+def read_chunks(path: Path) -> Iterator[Tuple[str, List[RawBSONDocument]]]:
+    """Yield (collection, documents) per chunk, verifying each chunk's checksum and size"""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ArchiveError(f"{path} is not a portfolio snapshot")
+        index = 0
+        while True:
+            header = f.read(CHUNK_HEADER.size)
+            if len(header) != CHUNK_HEADER.size:
+                raise ArchiveError(f"Snapshot is truncated before chunk {index}")
+            name_length, count, raw_length, compressed_length, digest = CHUNK_HEADER.unpack(header)
+            if name_length == 0:
+                return
+            name = f.read(name_length).decode()
+            compressed = f.read(compressed_length)
+            if len(compressed) != compressed_length:
+                raise ArchiveError(f"Snapshot is truncated in chunk {index} ({name})")
+            if hashlib.sha256(compressed).digest() != digest:
+                raise ArchiveError(f"Checksum mismatch in chunk {index} ({name})")
+            raw = zlib.decompress(compressed)
+            documents = decode_all(raw, RAW_BSON)
+            if len(raw) != raw_length or len(documents) != count:
+                raise ArchiveError(f"Chunk {index} ({name}) does not match its header")
+            yield name, documents
+            index += 1
+
+def verify_snapshot(path: Path) -> Dict[str, Dict[str, int]]:
+    """Check every chunk without touching the database; returns per-collection counts"""
+    stats: Dict[str, Dict[str, int]] = {}
+    for name, documents in read_chunks(path):
+        counts = stats.setdefault(name, {"documents": 0, "chunks": 0})
+        counts["documents"] += len(documents)
+        counts["chunks"] += 1
+    return stats
+
+async def restore_snapshot(path: Path, collections: Dict[str, Any], drop: bool = False,
+                           batch_size: int = 10_000) -> Dict[str, Dict[str, int]]:
+    """
+    Load a snapshot into collections with unordered insert_many batches.
+    Collections in the snapshot but not in `collections` are skipped. Unless
+    `drop` is set, target collections must be empty.
+    """
+    # A corrupt file must not leave the database half restored
+    verified = verify_snapshot(path)
+    targets = {name: collections[name] for name in verified if name in collections}
+    for name, collection in targets.items():
+        if drop:
+            await collection.drop()
+        elif await collection.estimated_document_count():
+            raise ArchiveError(f"Collection '{name}' is not empty; restore with drop to replace it")
+
+    stats: Dict[str, Dict[str, int]] = {name: {"documents": 0} for name in targets}
+    for name, documents in read_chunks(path):
+        collection: Optional[Any] = targets.get(name)
+        if collection is None:
+            continue
+        raw_collection = collection.with_options(codec_options = RAW_BSON)
+        for start in range(0, len(documents), batch_size):
+            batch = documents[start:start + batch_size]
+            await raw_collection.insert_many(batch, ordered = False)
+            stats[name]["documents"] += len(batch)
+    return stats
@@ -0,0 +1,84 @@
+from typing import AsyncIterator, Dict, Optional, Set
+import asyncio
+import logging
+
+from models.portfolio import ChangeEvent
+
+logger = logging.getLogger(__name__)
+
+class Subscription:
+    """A subscriber's bounded queue of encoded SSE frames"""
+    __slots__ = ("portfolio_id", "queue", "overflowed")
+
+    def __init__(self, portfolio_id: str, max_queue: int):
+        self.portfolio_id = portfolio_id
+        self.queue: "asyncio.Queue[bytes]" = asyncio.Queue(maxsize = max_queue)
+        self.overflowed = False
+
+class ChangeBroker:
+    """
+    Single in-process source of portfolio change events per worker.
+
+    Each event is encoded to an SSE frame once and the same bytes are put on
+    every subscriber queue for that portfolio, so idle subscribers cost only a
+    queue each. A subscriber that falls too far behind is disconnected (and
+    told to resync) instead of buffering without bound.
+    """
+    def __init__(self, max_queue: int = 256, heartbeat: float = 15.0):
+        self.max_queue = max_queue
+        self.heartbeat = heartbeat
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+
+    @staticmethod
+    def encode(event: ChangeEvent) -> bytes:
+        frame = f"event: {event.op}\ndata: {event.model_dump_json()}\n"
+        if event.version is not None:
+            frame = f"id: {event.version}\n" + frame
+        return (frame + "\n").encode()
+
+    def publish(self, event: ChangeEvent):
+        """Fan an event out to the subscribers of its portfolio"""
+        subscribers = self._subscribers.get(event.portfolioId)
+        if not subscribers:
+            return
+        frame = self.encode(event)
+        for subscription in subscribers:
+            try:
+                subscription.queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                subscription.overflowed = True
+
+    def subscribe(self, portfolio_id: str) -> Subscription:
+        subscription = Subscription(portfolio_id, self.max_queue)
+        self._subscribers.setdefault(portfolio_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscribers = self._subscribers.get(subscription.portfolio_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.portfolio_id]
+
+    def subscriber_count(self, portfolio_id: Optional[str] = None) -> int:
+        if portfolio_id is not None:
+            return len(self._subscribers.get(portfolio_id, ()))
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    async def stream(self, portfolio_id: str) -> AsyncIterator[bytes]:
+        """SSE byte stream for one client; ends when the client lags too far behind"""
+        subscription = self.subscribe(portfolio_id)
+        try:
+            yield b"retry: 3000\n\n"
+            while not subscription.overflowed:
+                try:
+                    frame = await asyncio.wait_for(subscription.queue.get(), timeout = self.heartbeat)
+                except asyncio.TimeoutError:
+                    # Comment frame keeps proxies from closing an idle connection
+                    yield b": keepalive\n\n"
+                    continue
+                yield frame
+            # Events were dropped for this client; it has to refetch before reconnecting
+            yield b"event: resync\ndata: {}\n\n"
+        finally:
+            self.unsubscribe(subscription)
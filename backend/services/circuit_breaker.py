@@ -0,0 +1,99 @@
+from typing import Any, Awaitable, Callable, Dict, Optional
+import asyncio
+import logging
+import time
+
+from pymongo.errors import ConnectionFailure
+
+logger = logging.getLogger(__name__)
+
+class DatabaseUnavailable(Exception):
+    """MongoDB is down, too slow, or the circuit is open; the API answers 503 (see server.py)"""
+    def __init__(self, detail: str, retry_after: Optional[float] = None):
+        super().__init__(detail)
+        self.detail = detail
+        # Seconds until a retry may succeed, if known
+        self.retry_after = retry_after
+
+class CircuitBreaker:
+    """
+    Fails database reads fast once MongoDB looks unavailable.
+
+    Each guarded call gets `latency_budget` seconds. Connection errors and
+    calls over budget count as failures; after `failure_threshold` consecutive
+    failures the circuit opens and calls are rejected immediately, without
+    queuing on the driver. After `reset_timeout` seconds one trial call is let
+    through: success closes the circuit, failure keeps it open for another
+    `reset_timeout`.
+    """
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, latency_budget: float = 2.0):
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.latency_budget = latency_budget
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial = False
+        self.rejected = 0
+        self.timeouts = 0
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self._trial or time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def trip(self, reason: str):
+        """Open the circuit (e.g. when the startup ping fails)"""
+        if self.opened_at is None:
+            self.trips += 1
+            logger.warning(f"Database circuit opened: {reason}")
+        self.opened_at = time.monotonic()
+        self.failures = max(self.failures, self.failure_threshold)
+
+    async def call(self, operation: Callable[[], Awaitable[Any]]) -> Any:
+        """Run a database operation within the latency budget, or raise DatabaseUnavailable"""
+        trial = False
+        if self.opened_at is not None:
+            remaining = self.reset_timeout - (time.monotonic() - self.opened_at)
+            if remaining > 0 or self._trial:
+                self.rejected += 1
+                raise DatabaseUnavailable("Database unavailable (circuit open)", retry_after = max(remaining, 1))
+            trial = self._trial = True
+        try:
+            result = await asyncio.wait_for(operation(), self.latency_budget)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self._failure(f"no response within {self.latency_budget}s")
+            raise DatabaseUnavailable(f"Database did not respond within {self.latency_budget}s", retry_after = self.reset_timeout)
+        except ConnectionFailure as e:
+            self._failure(str(e))
+            raise DatabaseUnavailable(f"Database unavailable: {e}", retry_after = self.reset_timeout) from e
+        finally:
+            if trial:
+                self._trial = False
+        if self.opened_at is not None:
+            logger.info("Database circuit closed")
+        self.failures = 0
+        self.opened_at = None
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Breaker state and counters"""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "trips": self.trips,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "latency_budget": self.latency_budget,
+        }
+
+    def _failure(self, reason: str):
+        self.failures += 1
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.trip(reason)
@@ -0,0 +1,132 @@
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+
+logger = logging.getLogger(__name__)
+
+# Per-request record of the oldest fallback copy served, read by the staleness middleware
+_served: ContextVar[Optional[Dict[str, datetime]]] = ContextVar("fallback_served", default = None)
+
+def track_fallback() -> Dict[str, datetime]:
+    """Start recording fallback reads for the current request; returns the record"""
+    record: Dict[str, datetime] = {}
+    _served.set(record)
+    return record
+
+def _mark_served(saved_at: datetime):
+    record = _served.get()
+    if record is not None and ("savedAt" not in record or saved_at < record["savedAt"]):
+        record["savedAt"] = saved_at
+
+class FallbackStore:
+    """
+    Last-known-good copies of cached portfolio keys on local disk.
+
+    Every successful database load is written to <directory>/<portfolio_id>/<key>.json
+    (skipped when the content has not changed since the last save), so a worker
+    can keep answering reads while MongoDB is unavailable. Files are replaced
+    atomically; a crash mid-write leaves the previous copy in place.
+    """
+    def __init__(self, directory: Path, types: Dict[str, Any]):
+        self.directory = Path(directory)
+        self._adapters = {key: TypeAdapter(value_type) for key, value_type in types.items()}
+        self._digests: Dict[Tuple[str, str], str] = {}
+        self._tasks: set = set()
+        self.saves = 0
+        self.served = 0
+
+    def _path(self, portfolio_id: str, key: str) -> Path:
+        return self.directory / portfolio_id / f"{key}.json"
+
+    def save(self, portfolio_id: str, key: str, value: Any):
+        """Persist a freshly loaded value in a background thread"""
+        if key not in self._adapters:
+            return
+        data = self._adapters[key].dump_json(value)
+        digest = hashlib.sha256(data).hexdigest()
+        if self._digests.get((portfolio_id, key)) == digest:
+            return
+        self._digests[(portfolio_id, key)] = digest
+        task = asyncio.ensure_future(asyncio.to_thread(self._write, self._path(portfolio_id, key), data))
+        self._tasks.add(task)
+        task.add_done_callback(lambda done: self._saved(portfolio_id, key, digest, done))
+
+    def load(self, portfolio_id: str, key: str) -> Optional[Tuple[Any, datetime]]:
+        """Return (value, saved at) from disk, or None if there is no usable copy"""
+        path = self._path(portfolio_id, key)
+        try:
+            document = json.loads(path.read_bytes())
+            value = self._adapters[key].validate_python(document["data"])
+            saved_at = datetime.fromisoformat(document["savedAt"])
+        except FileNotFoundError:
+            return None
+        except (KeyError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable fallback copy {path}: {e}")
+            return None
+        self.served += 1
+        _mark_served(saved_at)
+        return value, saved_at
+
+    async def drain(self):
+        """Wait for pending saves"""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions = True)
+
+    def stats(self) -> Dict[str, int]:
+        """Fallback counters"""
+        return {"saves": self.saves, "served": self.served, "pending": len(self._tasks)}
+
+    @staticmethod
+    def _write(path: Path, data: bytes):
+        path.parent.mkdir(parents = True, exist_ok = True)
+        saved_at = datetime.now(timezone.utc).isoformat()
+        # Unique per writer: several workers may share the directory
+        partial = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.partial")
+        partial.write_bytes(b'{"savedAt": ' + to_json(saved_at) + b', "data": ' + data + b'}')
+        os.replace(partial, path)
+
+    def _saved(self, portfolio_id: str, key: str, digest: str, task: "asyncio.Task[Any]"):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is None:
+            self.saves += 1
+            return
+        # Let the next load try again
+        if self._digests.get((portfolio_id, key)) == digest:
+            del self._digests[(portfolio_id, key)]
+        if not task.cancelled():
+            logger.warning(f"Failed to save fallback copy of {portfolio_id}/{key}: {task.exception()}")
+
+class StalenessMiddleware:
+    """ASGI middleware marking responses built from last-known-good copies with Age and X-Data-* headers"""
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        record = track_fallback()
+
+        async def send_with_staleness(message):
+            if message["type"] == "http.response.start" and "savedAt" in record:
+                saved_at = record["savedAt"]
+                age = max(0, int((datetime.now(timezone.utc) - saved_at).total_seconds()))
+                message = {**message, "headers": [
+                    *message.get("headers", []),
+                    (b"age", str(age).encode()),
+                    (b"x-data-source", b"last-known-good"),
+                    (b"x-data-saved-at", saved_at.isoformat().encode()),
+                ]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_staleness)
@@ -0,0 +1,101 @@
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Optional
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+class _ProbeState:
+    """Latest result and recent latencies for one database"""
+    def __init__(self, window: int):
+        self.ok = False
+        self.error: Optional[str] = "not probed yet"
+        self.latency_ms: Optional[float] = None
+        self.latencies = deque(maxlen = window)
+        self.checked_at: Optional[datetime] = None
+        self.checked_monotonic: Optional[float] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        recent = sorted(self.latencies)
+        return {
+            "ok": self.ok,
+            "error": self.error,
+            "latency_ms": self.latency_ms,
+            "p50_latency_ms": recent[len(recent) // 2] if recent else None,
+            "max_latency_ms": recent[-1] if recent else None,
+            "checked_at": self.checked_at.isoformat() if self.checked_at else None,
+        }
+
+class HealthMonitor:
+    """
+    Pings each database in a background task and keeps the latest result.
+
+    Readiness probes read the stored result, so they are O(1) and never reach
+    MongoDB themselves; the database sees one ping per interval per worker no
+    matter how often the orchestrator probes. Databases named in `optional`
+    are probed and reported, but do not decide readiness.
+    """
+    def __init__(self, databases: Dict[str, Any], interval: float = 5.0, timeout: float = 2.0, window: int = 20,
+                 optional: Iterable[str] = ()):
+        self.databases = databases
+        self.optional = set(optional)
+        self.interval = interval
+        self.timeout = timeout
+        self._states = {name: _ProbeState(window) for name in databases}
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def probe(self):
+        """Ping every database once, concurrently"""
+        await asyncio.gather(*(self._probe_one(name, db) for name, db in self.databases.items()))
+
+    def readiness(self) -> Dict[str, Any]:
+        """Latest probe results; stale results count as not ready"""
+        now = time.monotonic()
+        checks = {}
+        ready = True
+        for name, state in self._states.items():
+            check = state.as_dict()
+            stale = state.checked_monotonic is None or now - state.checked_monotonic > 3 * self.interval + self.timeout
+            if stale and state.checked_monotonic is not None:
+                check["ok"] = False
+                check["error"] = "probe result is stale"
+            check["required"] = name not in self.optional
+            if check["required"]:
+                ready = ready and check["ok"]
+            checks[name] = check
+        return {"status": "ready" if ready else "not ready", "checks": checks}
+
+    async def _probe_one(self, name: str, db):
+        state = self._states[name]
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(db.command("ping"), timeout = self.timeout)
+            latency_ms = round((time.perf_counter() - start) * 1000, 2)
+            state.ok, state.error, state.latency_ms = True, None, latency_ms
+            state.latencies.append(latency_ms)
+        except Exception as e:
+            if state.ok:
+                logger.warning(f"Readiness probe for '{name}' failed: {e!r}")
+            state.ok, state.error, state.latency_ms = False, repr(e), None
+        state.checked_at = datetime.now(timezone.utc)
+        state.checked_monotonic = time.monotonic()
+
+    async def _run(self):
+        while True:
+            await self.probe()
+            await asyncio.sleep(self.interval)
@@ -0,0 +1,32 @@
+from typing import Tuple
+import base64
+import json
+
+# Page size when a cursor is given without a limit, and the largest allowed limit
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Response header carrying the cursor of the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# A position in a section list: the (order, id) of the last item of the previous page
+Position = Tuple[int, str]
+
+class InvalidCursor(ValueError):
+    """A cursor that was not issued by this API; routes answer it with a 400"""
+    def __init__(self):
+        super().__init__("Invalid pagination cursor")
+
+def encode_cursor(position: Position) -> str:
+    """Opaque cursor for a list position"""
+    return base64.urlsafe_b64encode(json.dumps(list(position), separators = (",", ":")).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Position:
+    """List position of a cursor, or InvalidCursor"""
+    try:
+        order, item_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        raise InvalidCursor()
+    if type(order) is not int or not isinstance(item_id, str):
+        raise InvalidCursor()
+    return order, item_id
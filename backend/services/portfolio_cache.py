@@ -0,0 +1,155 @@
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import threading
+import time
+
+class _Partition:
+    """Entries cached for a single portfolio, in LRU order"""
+    __slots__ = ("entries", "weight")
+
+    def __init__(self):
+        self.entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.weight = 0
+
+class PortfolioCache:
+    """
+    In-memory cache partitioned by portfolio id.
+
+    Every entry carries a weight (the number of documents it holds). Each
+    partition is capped at `tenant_quota` and evicts its own least recently
+    used entries when it grows past it, so a large portfolio can only ever
+    displace itself. When the total weight exceeds `max_weight`, whole
+    partitions are dropped in least recently used order.
+
+    Entries older than `soft_ttl` seconds are still returned but flagged as
+    stale, so the caller can serve them while refreshing in the background;
+    entries older than `hard_ttl` are treated as misses. A TTL of 0 disables
+    that limit (entries then live until invalidated or evicted).
+    """
+    def __init__(self, max_weight: int = 200_000, tenant_quota: int = 5_000, soft_ttl: float = 0.0, hard_ttl: float = 0.0):
+        if max_weight <= 0:
+            raise ValueError("max_weight must be positive")
+        if soft_ttl < 0 or hard_ttl < 0:
+            raise ValueError("TTLs must not be negative")
+        if soft_ttl and hard_ttl and hard_ttl < soft_ttl:
+            raise ValueError("hard_ttl must not be shorter than soft_ttl")
+        self.max_weight = max_weight
+        self.tenant_quota = min(tenant_quota, max_weight)
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = hard_ttl
+        self._partitions: "OrderedDict[str, _Partition]" = OrderedDict()
+        self._weight = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def get(self, portfolio_id: str, key: str) -> Optional[Any]:
+        """Return the cached value (fresh or stale) or None"""
+        return self.lookup(portfolio_id, key)[0]
+
+    def lookup(self, portfolio_id: str, key: str) -> Tuple[Optional[Any], bool]:
+        """Return (value, stale); value is None on a miss or once the entry is past the hard TTL"""
+        with self._lock:
+            partition = self._partitions.get(portfolio_id)
+            entry = partition.entries.get(key) if partition is not None else None
+            if entry is None:
+                self.misses += 1
+                return None, False
+            age = time.monotonic() - entry[2]
+            if self.hard_ttl and age >= self.hard_ttl:
+                self._remove(partition, key)
+                if not partition.entries:
+                    del self._partitions[portfolio_id]
+                self.expired += 1
+                self.misses += 1
+                return None, False
+            self._partitions.move_to_end(portfolio_id)
+            partition.entries.move_to_end(key)
+            self.hits += 1
+            stale = bool(self.soft_ttl) and age >= self.soft_ttl
+            if stale:
+                self.stale_hits += 1
+            return entry[0], stale
+
+    def set(self, portfolio_id: str, key: str, value: Any, weight: int = 1) -> bool:
+        """Cache a value; returns False if it exceeds the tenant quota"""
+        weight = max(1, weight)
+        with self._lock:
+            partition = self._partitions.get(portfolio_id)
+            if partition is not None:
+                self._remove(partition, key)
+            if weight > self.tenant_quota:
+                return False
+            if partition is None:
+                partition = self._partitions[portfolio_id] = _Partition()
+            self._partitions.move_to_end(portfolio_id)
+
+            partition.entries[key] = (value, weight, time.monotonic())
+            partition.weight += weight
+            self._weight += weight
+
+            # Keep the tenant within its own quota
+            while partition.weight > self.tenant_quota:
+                oldest = next(iter(partition.entries))
+                self._remove(partition, oldest)
+                self.evictions += 1
+
+            # Keep the cache within its global budget, oldest tenants first
+            while self._weight > self.max_weight:
+                victim_id, victim = next(iter(self._partitions.items()))
+                if victim is partition:
+                    break
+                self._drop_partition(victim_id)
+            return True
+
+    def invalidate(self, portfolio_id: str, *keys: str):
+        """Drop the given keys for a portfolio, or its whole partition if no keys are given"""
+        with self._lock:
+            partition = self._partitions.get(portfolio_id)
+            if partition is None:
+                return
+            if not keys:
+                self._drop_partition(portfolio_id, count = False)
+                return
+            for key in keys:
+                self._remove(partition, key)
+            if not partition.entries:
+                del self._partitions[portfolio_id]
+
+    def clear(self):
+        """Drop everything"""
+        with self._lock:
+            self._partitions.clear()
+            self._weight = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Cache counters"""
+        with self._lock:
+            return {
+                "tenants": len(self._partitions),
+                "weight": self._weight,
+                "max_weight": self.max_weight,
+                "tenant_quota": self.tenant_quota,
+                "soft_ttl": self.soft_ttl,
+                "hard_ttl": self.hard_ttl,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "evictions": self.evictions,
+            }
+
+    def _remove(self, partition: _Partition, key: str):
+        entry = partition.entries.pop(key, None)
+        if entry is not None:
+            partition.weight -= entry[1]
+            self._weight -= entry[1]
+
+    def _drop_partition(self, portfolio_id: str, count: bool = True):
+        partition = self._partitions.pop(portfolio_id)
+        self._weight -= partition.weight
+        if count:
+            self.evictions += len(partition.entries)
@@ -1,34 +1,304 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Callable, Awaitable, Iterable, Set, Tuple
 from models.portfolio import *
-from datetime import datetime, timezone
+from services.portfolio_cache import PortfolioCache
+from services.single_flight import SingleFlight
+from services.circuit_breaker import CircuitBreaker, DatabaseUnavailable
+from services.fallback_store import FallbackStore
+from services.snapshot_publisher import SnapshotPublisher
+from services.storage import MongoStorage, StorageBackend, as_utc, millisecond_now
+from services.pagination import DEFAULT_PAGE_SIZE, decode_cursor, encode_cursor
+from services.seed_loader import SEED_BATCH_SIZE, batched, iter_mock_items
+from pydantic import BaseModel
+from datetime import datetime, timezone, timedelta
+import asyncio
+import hashlib
+import json
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_PORTFOLIO_ID = "default"
+
+# Valid portfolio ids (URL path segment and seed file name)
+PORTFOLIO_ID_PATTERN = r"^[A-Za-z0-9_-]{1,64}$"
+
+# Section collections that hold per-portfolio items
+SECTIONS = ("skills", "experiences", "projects", "achievements", "publications")
+
+# Cache key for the complete portfolio response
+PORTFOLIO_KEY = "portfolio"
+
+# Models of the documents stored in each section collection
+SECTION_MODELS = {
+    "skills": SkillCategory,
+    "experiences": Experience,
+    "projects": Project,
+    "achievements": Achievement,
+    "publications": Publication,
+}
+
+# Types of the values cached under each key, for last-known-good copies on disk
+CACHED_TYPES: Dict[str, Any] = {
+    PORTFOLIO_KEY: PortfolioResponse,
+    **{section: List[model] for section, model in SECTION_MODELS.items()},
+}
+
+# Writes stamp updatedAt before they commit, so delta sync hands out a
+# `since` slightly in the past; clients may see a document twice, never miss one
+CHANGES_SAFETY_MARGIN = timedelta(seconds = 5)
+
+# Models of seed items (mock.js item shape) for each section
+SEED_BUILDERS: Dict[str, Callable[[Dict[str, Any], str, int], BaseModel]] = {
+    "skills": lambda item, portfolio_id, order: SkillCategory(
+        portfolioId = portfolio_id, title = item["title"], items = item["items"], order = order,
+    ),
+    "experiences": lambda item, portfolio_id, order: Experience(
+        portfolioId = portfolio_id,
+        title = item["title"],
+        company = item["company"],
+        location = item["location"],
+        duration = item["duration"],
+        description = item["description"],
+        current = item.get("current", False),
+        order = order,
+    ),
+    "projects": lambda item, portfolio_id, order: Project(
+        portfolioId = portfolio_id,
+        title = item["title"],
+        description = item["description"],
+        technologies = item["technologies"],
+        github = item.get("github", "#"),
+        demo = item.get("demo", "#"),
+        featured = item.get("featured", False),
+        placeholder = item.get("placeholder", False),
+        order = order,
+    ),
+    "achievements": lambda item, portfolio_id, order: Achievement(
+        portfolioId = portfolio_id, title = item["title"], description = item["description"], order = order,
+    ),
+    "publications": lambda item, portfolio_id, order: Publication(
+        portfolioId = portfolio_id,
+        title = item["title"],
+        authors = item["authors"],
+        publication = item["publication"],
+        year = item["year"],
+        doi = item.get("doi"),
+        order = order,
+    ),
+}
+
+# Outcomes of an update
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+NOT_FOUND = "not_found"
+
+# Fields identifying a seeded item across migrations
+SEED_KEYS = {
+    "skills": ("title",),
+    "experiences": ("title", "company"),
+    "projects": ("title",),
+    "achievements": ("title",),
+    "publications": ("title",),
+}
+
+# Stored on items written by a migration; only these are deleted when they leave the seed data
+SEED_MARKER = "seeded"
+
 class PortfolioService:
-    def __init__(self, db):
-        self.db = db
-        self.portfolios = db.portfolios
-        self.skills = db.skills
-        self.experiences = db.experiences
-        self.projects = db.projects
-        self.achievements = db.achievements
-        self.publications = db.publications
+    # How long delete tombstones are kept for delta sync
+    tombstone_retention_seconds = 30 * 24 * 3600
+
+    def __init__(self, storage, cache: Optional[PortfolioCache] = None, publisher: Optional[SnapshotPublisher] = None,
+                 listeners: Optional[List[Callable[[ChangeEvent], None]]] = None,
+                 breaker: Optional[CircuitBreaker] = None, fallback: Optional[FallbackStore] = None):
+        # A Motor database is served by the MongoDB backend
+        self.storage: StorageBackend = storage if isinstance(storage, StorageBackend) else MongoStorage(storage)
+        self.cache = cache
+        self.publisher = publisher
+        self.breaker = breaker
+        self.fallback = fallback
+        self.listeners = listeners if listeners is not None else []
+        self.ledger = self.storage.ledger
+        self.flights = SingleFlight()
+        self._refreshes: Set["asyncio.Task[Any]"] = set()
+
+    async def ensure_indexes(self):
+        """Create the tenant-aware indexes used by every query"""
+        await self.storage.ensure_indexes(SEED_KEYS, self.tombstone_retention_seconds)
+
+    # Cache and snapshot helpers
+    async def _cached(self, portfolio_id: str, key: str, loader: Callable[[], Awaitable[Any]], weight: Callable[[Any], int] = len) -> Any:
+        """
+        Return the cached value for a portfolio key, loading it on a miss;
+        concurrent misses share one load. A stale entry (past the cache's soft
+        TTL) is returned immediately and refreshed in the background. When the
+        database is unavailable the last-known-good copy on disk is served.
+        """
+        async def load():
+            value = await (self.breaker.call(loader) if self.breaker is not None else loader())
+            # A write during the load forgets it, so its possibly stale result is not kept
+            if value is not None and self.flights.owns((portfolio_id, key)):
+                if self.cache is not None:
+                    self.cache.set(portfolio_id, key, value, weight(value))
+                if self.fallback is not None:
+                    self.fallback.save(portfolio_id, key, value)
+            return value
+
+        if self.cache is not None:
+            value, stale = self.cache.lookup(portfolio_id, key)
+            if value is not None:
+                if stale:
+                    self._revalidate(portfolio_id, key, load)
+                return value
+
+        try:
+            return await self.flights.do((portfolio_id, key), load)
+        except DatabaseUnavailable:
+            copy = self.fallback.load(portfolio_id, key) if self.fallback is not None else None
+            if copy is None:
+                raise
+            return copy[0]
+
+    def _revalidate(self, portfolio_id: str, key: str, load: Callable[[], Awaitable[Any]]):
+        """Refresh a stale cache entry in a background task, unless a load for it is already running"""
+        if self.flights.in_flight((portfolio_id, key)):
+            return
+        task = self.flights.start((portfolio_id, key), load)
+        self._refreshes.add(task)
+        task.add_done_callback(lambda done: self._refreshed(portfolio_id, key, done))
+
+    def _refresh_fallback(self, portfolio_id: str, sections: Iterable[str]):
+        """Reload written keys in the background so their copies on disk reflect the write"""
+        for key in (PORTFOLIO_KEY, *sections):
+            task = asyncio.ensure_future(getattr(self, f"get_{key}")(portfolio_id))
+            self._refreshes.add(task)
+            task.add_done_callback(lambda done, key = key: self._refreshed(portfolio_id, key, done))
+
+    async def drain(self):
+        """Wait for background cache refreshes and fallback saves to finish"""
+        while self._refreshes:
+            await asyncio.gather(*list(self._refreshes), return_exceptions = True)
+        if self.fallback is not None:
+            await self.fallback.drain()
+
+    def _refreshed(self, portfolio_id: str, key: str, task: "asyncio.Task[Any]"):
+        self._refreshes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            # Keep serving the stale copy until the hard TTL; the next stale read retries
+            logger.warning(f"Background refresh of {portfolio_id}/{key} failed: {task.exception()}")
+
+    async def _after_write(self, portfolio_id: str, *sections: str, op: str = "update",
+                           document: Optional[BaseModel] = None, item_id: Optional[str] = None):
+        """Bump versions, drop cached data, re-publish snapshots, refresh fallback copies and notify listeners after a write to the given sections (or the portfolio document)"""
+        self.invalidate_cached(portfolio_id, sections)
+        if op == "delete":
+            await self._record_tombstones(portfolio_id, sections[0], [item_id], datetime.now(timezone.utc))
+        version = None
+        try:
+            version = (await self.ledger.bump(portfolio_id, sections or (PORTFOLIO_KEY,)))["version"]
+        except Exception as e:
+            logger.warning(f"Failed to bump version ledger for portfolio '{portfolio_id}': {e}")
+        if self.publisher is not None:
+            self.publisher.schedule(self, portfolio_id, sections)
+        if self.fallback is not None:
+            self._refresh_fallback(portfolio_id, sections)
+        if self.listeners:
+            payload = document.model_dump(mode = "json") if document is not None else None
+            for section in sections or (PORTFOLIO_KEY,):
+                self._notify(ChangeEvent(
+                    portfolioId = portfolio_id,
+                    section = section,
+                    op = op,
+                    id = item_id or (payload or {}).get("id"),
+                    document = payload,
+                    version = version,
+                ))
+
+    async def _record_tombstones(self, portfolio_id: str, section: str, item_ids: List[str], deleted_at: datetime):
+        """Remember deleted items for delta sync"""
+        try:
+            await self.storage.add_tombstones([
+                Tombstone(portfolioId = portfolio_id, section = section, id = item_id, updatedAt = deleted_at).model_dump()
+                for item_id in item_ids
+            ])
+        except Exception as e:
+            logger.warning(f"Failed to record tombstones for {section} {item_ids}: {e}")
+
+    def _notify(self, event: ChangeEvent):
+        for listener in self.listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                logger.exception(f"Change listener failed: {e}")
+
+    def invalidate_cached(self, portfolio_id: str, sections: Iterable[str] = ()):
+        """Drop cached data and in-flight loads for the given sections"""
+        self.flights.forget(*((portfolio_id, key) for key in (PORTFOLIO_KEY, *sections)))
+        if self.cache is not None:
+            self.cache.invalidate(portfolio_id, PORTFOLIO_KEY, *sections)
+
+    def on_remote_change(self, portfolio_id: str, sections: List[str]):
+        """Handle sections changed by another worker: drop them from the cache and tell listeners to refetch"""
+        self.invalidate_cached(portfolio_id, sections)
+        for section in sections:
+            self._notify(ChangeEvent(portfolioId = portfolio_id, section = section, op = "changed"))
+
+    @staticmethod
+    def _portfolio_weight(response: PortfolioResponse) -> int:
+        return 1 + sum(len(getattr(response, section)) for section in SECTIONS)
+
+    async def _load_section(self, section: str, portfolio_id: str) -> List[Any]:
+        model = SECTION_MODELS[section]
+        return [model.model_validate(doc) for doc in await self.storage.find_items(section, portfolio_id)]
+
+    async def get_page(self, section: str, portfolio_id: str = DEFAULT_PORTFOLIO_ID, limit: Optional[int] = None,
+                       cursor: Optional[str] = None, all_of: Optional[Dict[str, List[Any]]] = None,
+                       equals: Optional[Dict[str, Any]] = None) -> Tuple[List[Any], Optional[str]]:
+        """One page of a section in (order, id) order, and the cursor of the next page (None on the last page)"""
+        limit = limit or DEFAULT_PAGE_SIZE
+        after = decode_cursor(cursor) if cursor else None
+        # One extra item tells whether another page follows
+        load = lambda: self.storage.find_page(section, portfolio_id, limit + 1, after, all_of, equals)
+        docs = await (self.breaker.call(load) if self.breaker is not None else load())
+        model = SECTION_MODELS[section]
+        items = [model.model_validate(doc) for doc in docs[:limit]]
+        next_cursor = encode_cursor((items[-1].order, items[-1].id)) if len(docs) > limit else None
+        return items, next_cursor
+
+    async def get_items(self, section: str, item_ids: List[str], portfolio_id: str = DEFAULT_PORTFOLIO_ID) -> List[Any]:
+        """Items of a section by id in one query, in the requested order; unknown ids are skipped"""
+        item_ids = list(dict.fromkeys(item_ids))
+        if not item_ids:
+            return []
+        load = lambda: self.storage.find_items_in(section, portfolio_id, "id", item_ids)
+        docs = await (self.breaker.call(load) if self.breaker is not None else load())
+        by_id = {doc["id"]: doc for doc in docs}
+        model = SECTION_MODELS[section]
+        return [model.model_validate(by_id[item_id]) for item_id in item_ids if item_id in by_id]
+
+    async def get_item(self, section: str, item_id: str, portfolio_id: str = DEFAULT_PORTFOLIO_ID) -> Optional[Any]:
+        """One item of a section by id"""
+        items = await self.get_items(section, [item_id], portfolio_id)
+        return items[0] if items else None
 
     # Portfolio methods
-    async def get_portfolio(self, portfolio_id: str = "default") -> Optional[PortfolioResponse]:
+    async def get_portfolio(self, portfolio_id: str = DEFAULT_PORTFOLIO_ID) -> Optional[PortfolioResponse]:
         """Get complete portfolio data"""
-        portfolio_doc = await self.portfolios.find_one({"userId": portfolio_id}, {"_id": 0})
+        return await self._cached(portfolio_id, PORTFOLIO_KEY, lambda: self._load_portfolio(portfolio_id), self._portfolio_weight)
+
+    async def _load_portfolio(self, portfolio_id: str) -> Optional[PortfolioResponse]:
+        portfolio_doc = await self.storage.find_portfolio(portfolio_id)
         
         if not portfolio_doc:
             return None
             
-        # Get all related data (exclude _id field)
-        skills = await self.skills.find({"portfolioId": portfolio_id}, {"_id": 0}).sort("order", 1).to_list(None)
-        experiences = await self.experiences.find({"portfolioId": portfolio_id}, {"_id": 0}).sort("order", 1).to_list(None)
-        projects = await self.projects.find({"portfolioId": portfolio_id}, {"_id": 0}).sort("order", 1).to_list(None)
-        achievements = await self.achievements.find({"portfolioId": portfolio_id}, {"_id": 0}).sort("order", 1).to_list(None)
-        publications = await self.publications.find({"portfolioId": portfolio_id}, {"_id": 0}).sort("order", 1).to_list(None)
+        # Get all related data
+        skills = await self.storage.find_items("skills", portfolio_id)
+        experiences = await self.storage.find_items("experiences", portfolio_id)
+        projects = await self.storage.find_items("projects", portfolio_id)
+        achievements = await self.storage.find_items("achievements", portfolio_id)
+        publications = await self.storage.find_items("publications", portfolio_id)
         
         return PortfolioResponse(
             portfolio = Portfolio.model_validate(portfolio_doc),    
@@ -45,312 +315,394 @@ class PortfolioService:
         portfolio_dict = portfolio_data.model_dump(exclude = {"createdAt", "updatedAt"})
         portfolio_dict["updatedAt"] = now
         
-        await self.portfolios.replace_one(
-            {"userId": portfolio_data.userId},
-            {
-                "$set": {**portfolio_dict, "updatedAt": now},
-                "$setOnInsert": {"createdAt": now}
-            },
-            upsert = True
-        )
+        await self.storage.upsert_portfolio(portfolio_data.userId, {**portfolio_dict, "updatedAt": now}, {"createdAt": now})
+        await self._after_write(portfolio_data.userId)
         return Portfolio(**portfolio_dict, createdAt = portfolio_data.createdAt or now, updatedAt = now)
 
-    async def update_personal_info(self, updates: PersonalInfoUpdate, portfolio_id: str = "default") -> bool:
+    async def update_personal_info(self, updates: PersonalInfoUpdate, portfolio_id: str = DEFAULT_PORTFOLIO_ID) -> str:
         """Update personal information"""
         update_dict = updates.model_dump(exclude_unset = True)
         if not update_dict:
-            return False
+            return NOT_FOUND
         
         update_dict.pop("updatedAt", None)  # Prevent manual update of updatedAt
         
-        result = await self.portfolios.update_one(
-            {"userId": portfolio_id},
-            {
-                "$set": {
-                    **{f"personal.{k}": v for k, v in update_dict.items()}, 
-                    "updatedAt": datetime.now(timezone.utc)
-                }
-            }
+        doc, changed = await self.storage.update_portfolio(
+            portfolio_id, {f"personal.{k}": v for k, v in update_dict.items()}, millisecond_now(),
         )
-        return result.matched_count > 0
-
-    async def update_about_section(self, updates: AboutSectionUpdate, portfolio_id: str = "default") -> bool:
+        if doc is None:
+            return NOT_FOUND
+        if not changed:
+            return UNCHANGED
+        await self._after_write(portfolio_id, document = Portfolio.model_validate(doc))
+        return UPDATED
+
+    async def update_about_section(self, updates: AboutSectionUpdate, portfolio_id: str = DEFAULT_PORTFOLIO_ID) -> str:
         """Update about section"""
         update_dict = updates.model_dump(exclude_unset = True)
         if not update_dict:
-            return False
-            
-        update_dict.pop("updatedAt", None) # Prevent manual update of updatedAt
-            
-        result = await self.portfolios.update_one(
-            {"userId": portfolio_id},
-            {
-                "$set": {
-                    **{f"about.{k}": v for k, v in update_dict.items()},
-                    "updatedAt": datetime.now(timezone.utc)
-                }
-            }
+            return NOT_FOUND
+        
+        update_dict.pop("updatedAt", None)  # Prevent manual update of updatedAt
+        
+        doc, changed = await self.storage.update_portfolio(
+            portfolio_id, {f"about.{k}": v for k, v in update_dict.items()}, millisecond_now(),
         )
-        return result.matched_count > 0
+        if doc is None:
+            return NOT_FOUND
+        if not changed:
+            return UNCHANGED
+        await self._after_write(portfolio_id, document = Portfolio.model_validate(doc))
+        return UPDATED
 
     # Skills methods
-    async def get_skills(self, portfolio_id: str = "default") -> List[SkillCategory]:
+    async def get_skills(self, portfolio_id: str = DEFAULT_PORTFOLIO_ID) -> List[SkillCategory]:
         """Get all skill categories"""
-        docs = await self.skills.find({"portfolioId": portfolio_id}, {"_id": 0}).sort("order", 1).to_list(None)
+        return await self._cached(portfolio_id, "skills", lambda: self._load_section("skills", portfolio_id))
+
+    async def find_skills(self, portfolio_id: str = DEFAULT_PORTFOLIO_ID, items: Optional[List[str]] = None) -> List[SkillCategory]:
+        """Get skill categories containing all of the given items"""
+        if not items:
+            return await self.get_skills(portfolio_id)
+        docs = await self.storage.find_items("skills", portfolio_id, all_of = {"items": items})
         return [SkillCategory.model_validate(doc) for doc in docs]
 
-    async def create_skill(self, skill_data: SkillCategoryCreate, portfolio_id: str = "default") -> SkillCategory:
+    async def create_skill(self, skill_data: SkillCategoryCreate, portfolio_id: str = DEFAULT_PORTFOLIO_ID) -> SkillCategory:
         """Create new skill category"""
         now = datetime.now(timezone.utc)
         skill = SkillCategory(**skill_data.model_dump(), portfolioId = portfolio_id, createdAt = now, updatedAt = now)
-        await self.skills.insert_one(skill.model_dump())
+        await self.storage.insert_item("skills", skill.model_dump())
+        await self._after_write(portfolio_id, "skills", op = "create", document = skill)
         return skill
 
-    async def update_skill(self, skill_id: str, updates: SkillCategoryUpdate) -> bool:
+    async def update_skill(self, skill_id: str, updates: SkillCategoryUpdate, portfolio_id: str = DEFAULT_PORTFOLIO_ID) -> str:
         """Update skill category"""
         update_dict = updates.model_dump(exclude_unset = True)
         if not update_dict:
-            return False
+            return NOT_FOUND
             
-        update_dict["updatedAt"] = datetime.now(timezone.utc)
-        result = await self.skills.update_one({"id": skill_id}, {"$set": update_dict})
-        return result.matched_count > 0
-
-    async def delete_skill(self, skill_id: str) -> bool:
+        doc, changed = await self.storage.update_item("skills", portfolio_id, skill_id, update_dict, millisecond_now())
+        if doc is None:
+            return NOT_FOUND
+        if not changed:
+            return UNCHANGED
+        await self._after_write(portfolio_id, "skills", document = SkillCategory.model_validate(doc))
+        return UPDATED
+
+    async def delete_skill(self, skill_id: str, portfolio_id: str = DEFAULT_PORTFOLIO_ID) -> bool:
         """Delete skill category"""
-        result = await self.skills.delete_one({"id": skill_id})
-        return result.deleted_count > 0
+        deleted = await self.storage.delete_item("skills", portfolio_id, skill_id)
+        if deleted:
+            await self._after_write(portfolio_id, "skills", op = "delete", item_id = skill_id)
+        return deleted
 
     # Experience methods
-    async def get_experiences(self, portfolio_id: str = "default") -> List[Experience]:
+    async def get_experiences(self, portfolio_id: str = DEFAULT_PORTFOLIO_ID) -> List[Experience]:
         """Get all experiences"""
-        docs = await self.experiences.find({"portfolioId": portfolio_id}, {"_id": 0}).sort("order", 1).to_list(None)
-        return [Experience.model_validate(doc) for doc in docs]
+        return await self._cached(portfolio_id, "experiences", lambda: self._load_section("experiences", portfolio_id))
 
-    async def create_experience(self, exp_data: ExperienceCreate, portfolio_id: str = "default") -> Experience:
+    async def create_experience(self, exp_data: ExperienceCreate, portfolio_id: str = DEFAULT_PORTFOLIO_ID) -> Experience:
         """Create new experience"""
         now = datetime.now(timezone.utc)
         experience = Experience(**exp_data.model_dump(), portfolioId = portfolio_id, createdAt = now, updatedAt = now)
-        await self.experiences.insert_one(experience.model_dump())
+        await self.storage.insert_item("experiences", experience.model_dump())
+        await self._after_write(portfolio_id, "experiences", op = "create", document = experience)
         return experience
 
-    async def update_experience(self, exp_id: str, updates: ExperienceUpdate) -> bool:
+    async def update_experience(self, exp_id: str, updates: ExperienceUpdate, portfolio_id: str = DEFAULT_PORTFOLIO_ID) -> str:
         """Update experience"""
         update_dict = updates.model_dump(exclude_unset = True)
         if not update_dict:
-            return False
+            return NOT_FOUND
             
-        update_dict["updatedAt"] = datetime.now(timezone.utc)
-        result = await self.experiences.update_one({"id": exp_id}, {"$set": update_dict})
-        return result.matched_count > 0
-
-    async def delete_experience(self, exp_id: str) -> bool:
+        doc, changed = await self.storage.update_item("experiences", portfolio_id, exp_id, update_dict, millisecond_now())
+        if doc is None:
+            return NOT_FOUND
+        if not changed:
+            return UNCHANGED
+        await self._after_write(portfolio_id, "experiences", document = Experience.model_validate(doc))
+        return UPDATED
+
+    async def delete_experience(self, exp_id: str, portfolio_id: str = DEFAULT_PORTFOLIO_ID) -> bool:
         """Delete experience"""
-        result = await self.experiences.delete_one({"id": exp_id})
-        return result.deleted_count > 0
+        deleted = await self.storage.delete_item("experiences", portfolio_id, exp_id)
+        if deleted:
+            await self._after_write(portfolio_id, "experiences", op = "delete", item_id = exp_id)
+        return deleted
 
     # Projects methods
-    async def get_projects(self, portfolio_id: str = "default") -> List[Project]:
+    async def get_projects(self, portfolio_id: str = DEFAULT_PORTFOLIO_ID) -> List[Project]:
         """Get all projects"""
-        docs = await self.projects.find({"portfolioId": portfolio_id}, {"_id": 0}).sort("order", 1).to_list(None)
+        return await self._cached(portfolio_id, "projects", lambda: self._load_section("projects", portfolio_id))
+
+    async def find_projects(self, portfolio_id: str = DEFAULT_PORTFOLIO_ID, technologies: Optional[List[str]] = None,
+                            featured: Optional[bool] = None) -> List[Project]:
+        """Get projects using all of the given technologies and matching the featured flag"""
+        if not technologies and featured is None:
+            return await self.get_projects(portfolio_id)
+        docs = await self.storage.find_items(
+            "projects", portfolio_id,
+            all_of = {"technologies": technologies} if technologies else None,
+            equals = {"featured": featured} if featured is not None else None,
+        )
         return [Project.model_validate(doc) for doc in docs]
 
-    async def create_project(self, project_data: ProjectCreate, portfolio_id: str = "default") -> Project:
+    async def get_project_facets(self, portfolio_id: str = DEFAULT_PORTFOLIO_ID) -> ProjectFacets:
+        """Count projects per technology (a single aggregation on MongoDB)"""
+        total, featured, technologies = await self.storage.project_facets(portfolio_id)
+        return ProjectFacets(
+            total = total,
+            featured = featured,
+            technologies = [TechnologyFacet(technology = technology, count = count) for technology, count in technologies],
+        )
+
+    async def create_project(self, project_data: ProjectCreate, portfolio_id: str = DEFAULT_PORTFOLIO_ID) -> Project:
         """Create new project"""
         now = datetime.now(timezone.utc)
         project = Project(**project_data.model_dump(), portfolioId = portfolio_id, createdAt = now, updatedAt = now)
-        await self.projects.insert_one(project.model_dump())
+        await self.storage.insert_item("projects", project.model_dump())
+        await self._after_write(portfolio_id, "projects", op = "create", document = project)
         return project
 
-    async def update_project(self, project_id: str, updates: ProjectUpdate) -> bool:
+    async def update_project(self, project_id: str, updates: ProjectUpdate, portfolio_id: str = DEFAULT_PORTFOLIO_ID) -> str:
         """Update project"""
         update_dict = updates.model_dump(exclude_unset = True)
         if not update_dict:
-            return False
+            return NOT_FOUND
             
-        update_dict["updatedAt"] = datetime.now(timezone.utc)
-        result = await self.projects.update_one({"id": project_id}, {"$set": update_dict})
-        return result.matched_count > 0
-
-    async def delete_project(self, project_id: str) -> bool:
+        doc, changed = await self.storage.update_item("projects", portfolio_id, project_id, update_dict, millisecond_now())
+        if doc is None:
+            return NOT_FOUND
+        if not changed:
+            return UNCHANGED
+        await self._after_write(portfolio_id, "projects", document = Project.model_validate(doc))
+        return UPDATED
+
+    async def delete_project(self, project_id: str, portfolio_id: str = DEFAULT_PORTFOLIO_ID) -> bool:
         """Delete project"""
-        result = await self.projects.delete_one({"id": project_id})
-        return result.deleted_count > 0
+        deleted = await self.storage.delete_item("projects", portfolio_id, project_id)
+        if deleted:
+            await self._after_write(portfolio_id, "projects", op = "delete", item_id = project_id)
+        return deleted
 
     # Achievements methods  
-    async def get_achievements(self, portfolio_id: str = "default") -> List[Achievement]:
+    async def get_achievements(self, portfolio_id: str = DEFAULT_PORTFOLIO_ID) -> List[Achievement]:
         """Get all achievements"""
-        docs = await self.achievements.find({"portfolioId": portfolio_id}, {"_id": 0}).sort("order", 1).to_list(None)
-        return [Achievement.model_validate(doc) for doc in docs]
+        return await self._cached(portfolio_id, "achievements", lambda: self._load_section("achievements", portfolio_id))
 
-    async def create_achievement(self, achievement_data: AchievementCreate, portfolio_id: str = "default") -> Achievement:
+    async def create_achievement(self, achievement_data: AchievementCreate, portfolio_id: str = DEFAULT_PORTFOLIO_ID) -> Achievement:
         """Create new achievement"""
         now = datetime.now(timezone.utc)
         achievement = Achievement(**achievement_data.model_dump(), portfolioId = portfolio_id, createdAt = now, updatedAt = now)
-        await self.achievements.insert_one(achievement.model_dump())
+        await self.storage.insert_item("achievements", achievement.model_dump())
+        await self._after_write(portfolio_id, "achievements", op = "create", document = achievement)
         return achievement
 
-    async def update_achievement(self, achievement_id: str, updates: AchievementUpdate) -> bool:
+    async def update_achievement(self, achievement_id: str, updates: AchievementUpdate, portfolio_id: str = DEFAULT_PORTFOLIO_ID) -> str:
         """Update achievement"""
         update_dict = updates.model_dump(exclude_unset = True)
         if not update_dict:
-            return False
+            return NOT_FOUND
             
-        update_dict["updatedAt"] = datetime.now(timezone.utc)
-        result = await self.achievements.update_one({"id": achievement_id}, {"$set": update_dict})
-        return result.matched_count > 0
-
-    async def delete_achievement(self, achievement_id: str) -> bool:
+        doc, changed = await self.storage.update_item("achievements", portfolio_id, achievement_id, update_dict, millisecond_now())
+        if doc is None:
+            return NOT_FOUND
+        if not changed:
+            return UNCHANGED
+        await self._after_write(portfolio_id, "achievements", document = Achievement.model_validate(doc))
+        return UPDATED
+
+    async def delete_achievement(self, achievement_id: str, portfolio_id: str = DEFAULT_PORTFOLIO_ID) -> bool:
         """Delete achievement"""
-        result = await self.achievements.delete_one({"id": achievement_id})
-        return result.deleted_count > 0
+        deleted = await self.storage.delete_item("achievements", portfolio_id, achievement_id)
+        if deleted:
+            await self._after_write(portfolio_id, "achievements", op = "delete", item_id = achievement_id)
+        return deleted
 
     # Publications methods
-    async def get_publications(self, portfolio_id: str = "default") -> List[Publication]:
+    async def get_publications(self, portfolio_id: str = DEFAULT_PORTFOLIO_ID) -> List[Publication]:
         """Get all publications"""
-        docs = await self.publications.find({"portfolioId": portfolio_id}, {"_id": 0}).sort("order", 1).to_list(None)
-        return [Publication.model_validate(doc) for doc in docs]
+        return await self._cached(portfolio_id, "publications", lambda: self._load_section("publications", portfolio_id))
 
-    async def create_publication(self, pub_data: PublicationCreate, portfolio_id: str = "default") -> Publication:
+    async def create_publication(self, pub_data: PublicationCreate, portfolio_id: str = DEFAULT_PORTFOLIO_ID) -> Publication:
         """Create new publication"""
         now = datetime.now(timezone.utc)
         publication = Publication(**pub_data.model_dump(), portfolioId = portfolio_id, createdAt = now, updatedAt = now)
-        await self.publications.insert_one(publication.model_dump())
+        await self.storage.insert_item("publications", publication.model_dump())
+        await self._after_write(portfolio_id, "publications", op = "create", document = publication)
         return publication
 
-    async def update_publication(self, pub_id: str, updates: PublicationUpdate) -> bool:
+    async def update_publication(self, pub_id: str, updates: PublicationUpdate, portfolio_id: str = DEFAULT_PORTFOLIO_ID) -> str:
         """Update publication"""
         update_dict = updates.model_dump(exclude_unset = True)
         if not update_dict:
-            return False
+            return NOT_FOUND
             
-        update_dict["updatedAt"] = datetime.now(timezone.utc)
-        result = await self.publications.update_one({"id": pub_id}, {"$set": update_dict})
-        return result.matched_count > 0
-
-    async def delete_publication(self, pub_id: str) -> bool:
+        doc, changed = await self.storage.update_item("publications", portfolio_id, pub_id, update_dict, millisecond_now())
+        if doc is None:
+            return NOT_FOUND
+        if not changed:
+            return UNCHANGED
+        await self._after_write(portfolio_id, "publications", document = Publication.model_validate(doc))
+        return UPDATED
+
+    async def delete_publication(self, pub_id: str, portfolio_id: str = DEFAULT_PORTFOLIO_ID) -> bool:
         """Delete publication"""
-        result = await self.publications.delete_one({"id": pub_id})
-        return result.deleted_count > 0
+        deleted = await self.storage.delete_item("publications", portfolio_id, pub_id)
+        if deleted:
+            await self._after_write(portfolio_id, "publications", op = "delete", item_id = pub_id)
+        return deleted
+
+    # Delta sync methods
+    async def get_changes(self, since: datetime, portfolio_id: str = DEFAULT_PORTFOLIO_ID) -> PortfolioChanges:
+        """Get documents updated, and items deleted, after `since` (UTC when it has no offset)"""
+        since = as_utc(since)
+        until = datetime.now(timezone.utc) - CHANGES_SAFETY_MARGIN
+        portfolio_doc, tombstones, sections = await self.storage.changes(portfolio_id, since)
+        return PortfolioChanges(
+            since = since,
+            until = max(until, since),
+            portfolio = Portfolio.model_validate(portfolio_doc) if portfolio_doc else None,
+            deleted = [Tombstone.model_validate(doc) for doc in tombstones],
+            **{
+                section: [SECTION_MODELS[section].model_validate(doc) for doc in sections[section]]
+                for section in SECTIONS
+            },
+        )
 
     # Migration and export methods
-    async def migrate_mock_data(self, mock_data: Dict[str, Any]) -> bool:
-        """Migrate data from mock.js format to database"""
+    @staticmethod
+    def content_hash(document: BaseModel) -> str:
+        """Hash of an item's content, ignoring its identity and timestamps"""
+        content = document.model_dump(mode = "json", exclude = {"id", "createdAt", "updatedAt"})
+        return hashlib.sha256(json.dumps(content, sort_keys = True, separators = (",", ":")).encode()).hexdigest()
+
+    async def _sync_batch(self, section: str, documents: List[BaseModel], portfolio_id: str, now: datetime,
+                          diff: SectionDiff, seen_ids: set):
+        """Write only the seed items of a batch that differ from what is stored"""
+        model, key_fields = SECTION_MODELS[section], SEED_KEYS[section]
+        # Later entries with the same key win, as with the previous upsert-by-title migration
+        wanted = {tuple(getattr(document, field) for field in key_fields): document for document in documents}
+
+        existing: Dict[tuple, Dict[str, Any]] = {}
+        unmarked: List[str] = []
+        # One index range scan on the leading key field; composite keys are matched below
+        for doc in await self.storage.find_items_in(section, portfolio_id, key_fields[0], list({key[0] for key in wanted})):
+            key = tuple(doc.get(field) for field in key_fields)
+            if key not in wanted:
+                continue
+            if not doc.get(SEED_MARKER):
+                unmarked.append(doc["id"])
+            # Of duplicates, keep the one this run already wrote; the others are deleted as unseen
+            if key not in existing or doc["id"] in seen_ids:
+                existing[key] = doc
+
+        inserts, updates = [], []
+        for key, document in wanted.items():
+            current = existing.get(key)
+            if current is None:
+                inserts.append({**document.model_dump(), SEED_MARKER: True, "createdAt": now, "updatedAt": now})
+                seen_ids.add(document.id)
+                diff.created += 1
+                continue
+            seen_ids.add(current["id"])
+            if self.content_hash(model.model_validate(current)) == self.content_hash(document):
+                diff.unchanged += 1
+            else:
+                content = document.model_dump(exclude = {"id", "createdAt", "updatedAt"})
+                updates.append({**content, SEED_MARKER: True, "id": current["id"], "updatedAt": now})
+                diff.updated += 1
+        # Matching items from before seeded items were marked are claimed without counting as a change
+        updated_ids = {update["id"] for update in updates}
+        updates.extend({"id": item_id, SEED_MARKER: True} for item_id in unmarked if item_id not in updated_ids)
+        await self.storage.bulk_write(section, portfolio_id, inserts, updates)
+
+    async def _delete_unseen(self, section: str, portfolio_id: str, now: datetime, diff: SectionDiff, seen_ids: set):
+        """Delete the seeded items of a section that are no longer in the seed data; items created through the API stay"""
+        started = time.perf_counter()
+        seeded_ids = await self.storage.item_ids(section, portfolio_id, equals = {SEED_MARKER: True})
+        stale_ids = [item_id for item_id in seeded_ids if item_id not in seen_ids]
+        for start in range(0, len(stale_ids), SEED_BATCH_SIZE):
+            chunk = stale_ids[start:start + SEED_BATCH_SIZE]
+            await self.storage.delete_items(section, portfolio_id, chunk)
+            await self._record_tombstones(portfolio_id, section, chunk, now)
+        diff.deleted += len(stale_ids)
+        diff.ms += (time.perf_counter() - started) * 1000
+
+    async def _sync_portfolio_document(self, portfolio: Portfolio, now: datetime) -> SectionDiff:
+        started = time.perf_counter()
+        diff = SectionDiff()
+        current = await self.storage.find_portfolio(portfolio.userId)
+        if current is not None and self.content_hash(Portfolio.model_validate(current)) == self.content_hash(portfolio):
+            diff.unchanged = 1
+        else:
+            await self.storage.upsert_portfolio(
+                portfolio.userId,
+                {**portfolio.model_dump(exclude = {"id", "createdAt", "updatedAt"}), "updatedAt": now},
+                {"id": portfolio.id, "createdAt": now},
+            )
+            if current is None:
+                diff.created = 1
+            else:
+                diff.updated = 1
+        diff.ms = (time.perf_counter() - started) * 1000
+        return diff
+
+    async def migrate_seed(self, batches: Iterable[Tuple[str, List[Dict[str, Any]]]],
+                           portfolio_id: str = DEFAULT_PORTFOLIO_ID) -> Optional[MigrationSummary]:
+        """
+        Migrate seed items, given as (section, items) batches in mock.js item shape,
+        writing only what changed. Memory use is bounded by the batch size plus the
+        ids of the items seen; seeded items absent from the seed data are deleted at
+        the end, while items created through the API are left alone.
+        """
         try:
+            started = time.perf_counter()
             now = datetime.now(timezone.utc)
-
-            # Portfolio
+            diffs = {section: SectionDiff() for section in SECTIONS}
+            seen_ids = {section: set() for section in SECTIONS}
+            profile: Dict[str, Dict[str, Any]] = {}
+
+            for section, items in batches:
+                if section in ("personal", "about"):
+                    profile[section] = items[-1]
+                    continue
+                batch_started = time.perf_counter()
+                diff = diffs[section]
+                order = diff.created + diff.updated + diff.unchanged
+                documents = [SEED_BUILDERS[section](item, portfolio_id, order + i) for i, item in enumerate(items)]
+                await self._sync_batch(section, documents, portfolio_id, now, diff, seen_ids[section])
+                diff.ms += (time.perf_counter() - batch_started) * 1000
+
+            missing = [name for name in ("personal", "about") if name not in profile]
+            if missing:
+                raise ValueError(f"Seed data has no {' or '.join(missing)} section")
             portfolio = Portfolio(
-                personal = PersonalInfo(**mock_data["personal"]),
-                about = AboutSection(**mock_data["about"]),
+                userId = portfolio_id,
+                personal = PersonalInfo(**profile["personal"]),
+                about = AboutSection(**profile["about"]),
             )
-            await self.portfolios.update_one(
-                {"userId": "default"},
-                {
-                    "$set": {**portfolio.model_dump(exclude = {"createdAt", "updatedAt"}), "updatedAt": now},
-                    "$setOnInsert": {"createdAt": now},
-                },
-                upsert = True,
+            portfolio_diff, *_ = await asyncio.gather(
+                self._sync_portfolio_document(portfolio, now),
+                *(self._delete_unseen(section, portfolio_id, now, diffs[section], seen_ids[section]) for section in SECTIONS),
             )
+            summary = MigrationSummary(portfolioId = portfolio_id, sections = {PORTFOLIO_KEY: portfolio_diff, **diffs})
+            for diff in summary.sections.values():
+                diff.ms = round(diff.ms, 1)
+            changed = [name for name, diff in summary.sections.items() if diff.created or diff.updated or diff.deleted]
+            if changed:
+                await self._after_write(portfolio_id, *changed, op = "reset")
+            summary.ms = round((time.perf_counter() - started) * 1000, 1)
+            return summary
 
-            # Skills
-            for i, skill_cat in enumerate(mock_data["skills"]["categories"]):
-                skill = SkillCategory(
-                    title = skill_cat["title"],
-                    items = skill_cat["items"],
-                    order = i,
-                )
-                await self.skills.update_one(
-                    {"portfolioId": "default", "title": skill.title},
-                    {
-                        "$set": {**skill.model_dump(exclude = {"createdAt", "updatedAt"}), "updatedAt": now},
-                        "$setOnInsert": {"createdAt": now},
-                    },
-                    upsert = True,
-                )
-
-            # Experiences
-            for i, exp in enumerate(mock_data["experience"]):
-                experience = Experience(
-                    title = exp["title"],
-                    company = exp["company"],
-                    location = exp["location"],
-                    duration = exp["duration"],
-                    description = exp["description"],
-                    current = exp.get("current", False),
-                    order = i,
-                )
-                await self.experiences.update_one(
-                    {"portfolioId": "default", "title": experience.title, "company": experience.company},
-                    {
-                        "$set": {**experience.model_dump(exclude = {"createdAt", "updatedAt"}), "updatedAt": now},
-                        "$setOnInsert": {"createdAt": now},
-                    },
-                    upsert = True,
-                )
-
-            # Projects
-            for i, proj in enumerate(mock_data["projects"]):
-                project = Project(
-                    title = proj["title"],
-                    description = proj["description"],
-                    technologies = proj["technologies"],
-                    github = proj.get("github", "#"),
-                    demo = proj.get("demo", "#"),
-                    featured = proj.get("featured", False),
-                    placeholder = proj.get("placeholder", False),
-                    order = i,
-                )
-                await self.projects.update_one(
-                    {"portfolioId": "default", "title": project.title},
-                    {
-                        "$set": {**project.model_dump(exclude = {"createdAt", "updatedAt"}), "updatedAt": now},
-                        "$setOnInsert": {"createdAt": now},
-                    },
-                    upsert = True,
-                )
-
-            # Achievements
-            for i, ach in enumerate(mock_data["achievements"]):
-                achievement = Achievement(
-                    title = ach["title"],
-                    description = ach["description"],
-                    order = i,
-                )
-                await self.achievements.update_one(
-                    {"portfolioId": "default", "title": achievement.title},
-                    {
-                        "$set": {**achievement.model_dump(exclude = {"createdAt", "updatedAt"}), "updatedAt": now},
-                        "$setOnInsert": {"createdAt": now},
-                    },
-                    upsert = True,
-                )
-
-            # Publications
-            for i, pub in enumerate(mock_data["publications"]):
-                publication = Publication(
-                    title = pub["title"],
-                    authors = pub["authors"],
-                    publication = pub["publication"],
-                    year = pub["year"],
-                    doi = pub.get("doi"),
-                    order = i,
-                )
-                await self.publications.update_one(
-                    {"portfolioId": "default", "title": publication.title},
-                    {
-                        "$set": {**publication.model_dump(exclude = {"createdAt", "updatedAt"}), "updatedAt": now},
-                        "$setOnInsert": {"createdAt": now},
-                    },
-                    upsert = True,
-                )
-
-            return True
-        
         except Exception as e:
             logger.exception(f"Migration error: {e}")
-            return False    
+            return None
+
+    async def migrate_mock_data(self, mock_data: Dict[str, Any], portfolio_id: str = DEFAULT_PORTFOLIO_ID) -> Optional[MigrationSummary]:
+        """Migrate data from mock.js format to database, writing only what changed"""
+        return await self.migrate_seed(batched(iter_mock_items(mock_data)), portfolio_id)
         
-    async def export_data(self, portfolio_id: str = "default") -> Optional[PortfolioResponse]:
+    async def export_data(self, portfolio_id: str = DEFAULT_PORTFOLIO_ID) -> Optional[PortfolioResponse]:
         """Export all portfolio data"""
         return await self.get_portfolio(portfolio_id)
\ No newline at end of file
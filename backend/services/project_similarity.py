@@ -0,0 +1,91 @@
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from models.portfolio import ChangeEvent, Project, RelatedProject
+
+# Rows scored per matrix product when ranking many projects at once
+BATCH_SIZE = 1024
+
+class _TechnologyMatrix:
+    """Binary project x technology matrix of one portfolio"""
+    def __init__(self, projects: List[Project]):
+        # Imported on first use: numpy is a large share of the server's import time
+        import numpy as np
+        self.projects = projects
+        self.rows = {project.id: row for row, project in enumerate(projects)}
+        vocabulary: Dict[str, int] = {}
+        coordinates = [
+            (row, vocabulary.setdefault(technology.strip().casefold(), len(vocabulary)))
+            for row, project in enumerate(projects)
+            for technology in set(project.technologies) if technology.strip()
+        ]
+        # float32 so the products below run through BLAS
+        self.matrix = np.zeros((len(projects), len(vocabulary)), dtype = np.float32)
+        if coordinates:
+            rows, columns = zip(*coordinates)
+            self.matrix[list(rows), list(columns)] = 1.0
+        self.sizes = self.matrix.sum(axis = 1)
+
+    def top_k(self, rows: Sequence[int], k: int) -> List[List[Tuple[int, float]]]:
+        """Jaccard top-k neighbours for each of the given rows"""
+        import numpy as np
+        results = []
+        for start in range(0, len(rows), BATCH_SIZE):
+            batch = np.asarray(rows[start:start + BATCH_SIZE])
+            intersection = self.matrix[batch] @ self.matrix.T
+            union = self.sizes[batch][:, None] + self.sizes[None, :] - intersection
+            scores = np.divide(intersection, union, out = np.zeros_like(intersection), where = union > 0)
+            scores[np.arange(len(batch)), batch] = -1.0                      # never recommend a project to itself
+            count = min(k, len(self.projects) - 1)
+            if count <= 0:
+                results.extend([] for _ in batch)
+                continue
+            candidates = np.argpartition(-scores, count - 1, axis = 1)[:, :count]
+            for row_scores, row_candidates in zip(scores, candidates):
+                ordered = row_candidates[np.argsort(-row_scores[row_candidates], kind = "stable")]
+                results.append([(int(column), float(row_scores[column])) for column in ordered if row_scores[column] > 0])
+        return results
+
+class ProjectSimilarity:
+    """
+    Related-project recommendations by technology overlap.
+
+    The matrix of a portfolio is built on first use and dropped on any project
+    write, so repeated lookups only cost one matrix-vector product. Matrices
+    are dense, so fewer portfolios are kept than in the text indexes.
+    """
+    def __init__(self, max_tenants: int = 100):
+        self.max_tenants = max_tenants
+        self._matrices: "OrderedDict[str, _TechnologyMatrix]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+
+    async def related(self, service, portfolio_id: str, project_id: str, k: int = 5) -> Optional[List[RelatedProject]]:
+        """Most similar projects, or None if the project does not exist"""
+        matrix = await self._matrix(service, portfolio_id)
+        row = matrix.rows.get(project_id)
+        if row is None:
+            return None
+        return [
+            RelatedProject(project = matrix.projects[column], score = round(score, 4))
+            for column, score in matrix.top_k([row], k)[0]
+        ]
+
+    def on_change(self, event: ChangeEvent):
+        """PortfolioService listener dropping the matrix of a portfolio whose projects changed"""
+        if event.section == "projects":
+            self._matrices.pop(event.portfolioId, None)
+            self._generations[event.portfolioId] = self._generations.get(event.portfolioId, 0) + 1
+
+    async def _matrix(self, service, portfolio_id: str) -> _TechnologyMatrix:
+        matrix = self._matrices.get(portfolio_id)
+        if matrix is None:
+            generation = self._generations.get(portfolio_id, 0)
+            matrix = _TechnologyMatrix(await service.get_projects(portfolio_id))
+            # Only keep it if no project write happened while loading
+            if self._generations.get(portfolio_id, 0) == generation:
+                self._matrices[portfolio_id] = matrix
+                while len(self._matrices) > self.max_tenants:
+                    self._matrices.popitem(last = False)
+        else:
+            self._matrices.move_to_end(portfolio_id)
+        return matrix
@@ -0,0 +1,90 @@
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Tuple
+
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - JSONResponse's encoder is used instead
+    orjson = None
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - msgpack is optional
+    msgpack = None
+try:
+    import cbor2
+except ImportError:  # pragma: no cover - CBOR is optional
+    cbor2 = None
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+CBOR = "application/cbor"
+
+def _encode_json(content: Any) -> bytes:
+    return orjson.dumps(content, option = orjson.OPT_NON_STR_KEYS)
+
+# Encoders for the media types the installed packages support; JSON is always available
+ENCODERS: Dict[str, Callable[[Any], bytes]] = {}
+if msgpack is not None:
+    ENCODERS[MSGPACK] = lambda content: msgpack.packb(content, use_bin_type = True)
+    ENCODERS["application/x-msgpack"] = ENCODERS[MSGPACK]
+if cbor2 is not None:
+    ENCODERS[CBOR] = cbor2.dumps
+
+# Media type chosen for the current request, set by the negotiation middleware
+_negotiated: ContextVar[str] = ContextVar("negotiated_media_type", default = JSON)
+
+def _parse_accept(accept: str) -> List[Tuple[str, float]]:
+    ranges = []
+    for part in accept.split(","):
+        media_type, *params = [piece.strip() for piece in part.split(";")]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if media_type:
+            ranges.append((media_type.lower(), quality))
+    return ranges
+
+def negotiate(accept: str) -> str:
+    """Best supported media type for an Accept header; JSON unless a binary encoding is preferred"""
+    best, best_quality = JSON, 0.0
+    for media_type, quality in _parse_accept(accept):
+        # Ties keep the first listed type; wildcards always get JSON
+        if quality > best_quality and (media_type in ENCODERS or media_type == JSON):
+            best, best_quality = media_type, quality
+    return best
+
+class NegotiatedResponse(JSONResponse):
+    """JSON (orjson when installed) by default; MessagePack or CBOR when the request's Accept header asks for it"""
+    def render(self, content: Any) -> bytes:
+        media_type = _negotiated.get()
+        if media_type in ENCODERS:
+            self.media_type = media_type
+            return ENCODERS[media_type](content)
+        if orjson is None:
+            return super().render(content)
+        return _encode_json(content)
+
+class ContentNegotiationMiddleware:
+    """ASGI middleware that picks each request's response encoding from its Accept header"""
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = next((value.decode("latin-1") for name, value in scope["headers"] if name == b"accept"), "")
+        _negotiated.set(negotiate(accept) if accept else JSON)
+
+        async def send_with_vary(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), (b"vary", b"Accept")]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_vary)
@@ -0,0 +1,110 @@
+from collections import defaultdict
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import heapq
+import math
+import re
+
+from models.portfolio import SearchHit
+from services.tenant_index import LazyTenantIndex, TenantData
+
+# Searchable fields per section and their weight in the ranking
+SEARCH_FIELDS: Dict[str, Dict[str, float]] = {
+    "projects": {"title": 3.0, "technologies": 2.0, "description": 1.0},
+    "experiences": {"title": 3.0, "company": 2.0, "description": 1.0},
+    "publications": {"title": 3.0, "authors": 2.0, "publication": 1.0},
+}
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens; keeps '+' and '#' so C++ and C# stay searchable"""
+    return _TOKEN_RE.findall(text.lower())
+
+class _TenantIndex(TenantData):
+    """Inverted index over one portfolio's searchable documents"""
+    def __init__(self):
+        super().__init__()
+        self.postings: Dict[str, Dict[Tuple[str, str], float]] = defaultdict(dict)
+        self.documents: Dict[Tuple[str, str], Any] = {}
+        self.terms: Dict[Tuple[str, str], Dict[str, float]] = {}
+        self.lengths: Dict[Tuple[str, str], float] = {}
+        self.total_length = 0.0
+
+    def add(self, section: str, document: Any):
+        key = (section, document.id)
+        self.remove(key)
+        weights: Dict[str, float] = defaultdict(float)
+        for field, weight in SEARCH_FIELDS[section].items():
+            value = getattr(document, field, None) or ""
+            text = " ".join(value) if isinstance(value, list) else str(value)
+            for term in tokenize(text):
+                weights[term] += weight
+        for term, weight in weights.items():
+            self.postings[term][key] = weight
+        self.documents[key] = document
+        self.terms[key] = weights
+        self.lengths[key] = sum(weights.values())
+        self.total_length += self.lengths[key]
+
+    def remove(self, key: Tuple[str, str]):
+        weights = self.terms.pop(key, None)
+        if weights is None:
+            return
+        for term in weights:
+            posting = self.postings[term]
+            posting.pop(key, None)
+            if not posting:
+                del self.postings[term]
+        del self.documents[key]
+        self.total_length -= self.lengths.pop(key)
+
+    def drop_section(self, section: str):
+        for key in [key for key in self.documents if key[0] == section]:
+            self.remove(key)
+        self.loaded.discard(section)
+
+    def search(self, query: str, limit: int, sections: Optional[Iterable[str]] = None) -> List[SearchHit]:
+        terms = set(tokenize(query))
+        if not terms or not self.documents:
+            return []
+        allowed = set(sections) if sections else None
+        count = len(self.documents)
+        lengths = self.lengths
+        # BM25 length normalisation, K1 * (1 - B + B * length / average_length), split into a + c * length
+        a = K1 * (1 - B)
+        c = K1 * B * count / (self.total_length or 1.0)
+        scores: Dict[Tuple[str, str], float] = defaultdict(float)
+        for term in terms:
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            boost = math.log(1 + (count - len(posting) + 0.5) / (len(posting) + 0.5)) * (K1 + 1)
+            for key, tf in posting.items():
+                if allowed is None or key[0] in allowed:
+                    scores[key] += boost * tf / (tf + a + c * lengths[key])
+        ranked = heapq.nlargest(limit, scores.items(), key = itemgetter(1))
+        return [
+            SearchHit(section = key[0], id = key[1], score = round(score, 4), document = self.documents[key].model_dump(mode = "json"))
+            for key, score in ranked
+        ]
+
+class SearchIndex(LazyTenantIndex[_TenantIndex]):
+    """
+    In-process full-text index over projects, experiences and publications.
+
+    Portfolios are indexed on their first search and then kept current from
+    change events, so searches never touch MongoDB.
+    """
+    sections = SEARCH_FIELDS
+    tenant_class = _TenantIndex
+
+    async def search(self, service, portfolio_id: str, query: str, limit: int = 10,
+                     sections: Optional[Iterable[str]] = None) -> List[SearchHit]:
+        """Rank matching documents of a portfolio"""
+        index = await self._tenant(service, portfolio_id)
+        return index.search(query, limit, sections)
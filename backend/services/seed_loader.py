@@ -0,0 +1,95 @@
+from itertools import groupby
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
+import json
+
+import json5
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Seed sections in stream order; personal and about make up the portfolio document
+SEED_SECTIONS = ("personal", "about", "skills", "experiences", "projects", "achievements", "publications")
+
+# Default number of items handed to the migration at a time
+SEED_BATCH_SIZE = 1000
+
+JS_EXPORT_PREFIX = "export const mockData = "
+
+SeedItem = Tuple[str, Dict[str, Any]]
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse strict JSON, with orjson when it is installed"""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def seed_format(path: Path) -> str:
+    """'js', 'json' or 'ndjson', from the file extension"""
+    suffix = path.suffix.lower()
+    if suffix in (".ndjson", ".jsonl"):
+        return "ndjson"
+    if suffix == ".json":
+        return "json"
+    return "js"
+
+def load_seed_file(path: Path) -> Dict[str, Any]:
+    """
+    Parse a whole mock.js or JSON seed file into the mock.js data shape.
+    The file is read into memory in one go; only NDJSON seeds are streamed.
+    """
+    content = path.read_bytes()
+    if seed_format(path) == "json":
+        return loads(content)
+    text = content.decode("utf-8")
+    # Drop the export statement and anything before it (e.g. a header comment)
+    text = text.split(JS_EXPORT_PREFIX, 1)[-1].strip().rstrip(";")
+    try:
+        # Generated files are usually strict JSON, which parses far faster than JSON5
+        return loads(text)
+    except ValueError:
+        return json5.loads(text)
+
+def iter_mock_items(mock_data: Dict[str, Any]) -> Iterator[SeedItem]:
+    """Items of mock.js-shaped data as (section, item) pairs"""
+    yield "personal", mock_data["personal"]
+    yield "about", mock_data["about"]
+    for category in mock_data["skills"]["categories"]:
+        yield "skills", category
+    for section, key in (("experiences", "experience"), ("projects", "projects"),
+                         ("achievements", "achievements"), ("publications", "publications")):
+        for item in mock_data[key]:
+            yield section, item
+
+def iter_ndjson_items(path: Path) -> Iterator[SeedItem]:
+    """Stream items from an NDJSON file, one `{"section": ..., ...fields}` object per line"""
+    with open(path, "rb") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                item = loads(line)
+                section = item.pop("section")
+            except (ValueError, KeyError, AttributeError, TypeError) as e:
+                raise ValueError(f"{path}:{line_number}: invalid seed line ({e!r})") from e
+            if section not in SEED_SECTIONS:
+                raise ValueError(f"{path}:{line_number}: unknown section '{section}'")
+            yield section, item
+
+def iter_seed_items(path: Path) -> Iterator[SeedItem]:
+    """(section, item) pairs from a seed file of any supported format (streamed for NDJSON only)"""
+    if seed_format(path) == "ndjson":
+        return iter_ndjson_items(path)
+    return iter_mock_items(load_seed_file(path))
+
+def batched(items: Iterable[SeedItem], batch_size: int = SEED_BATCH_SIZE) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    """Group consecutive items of the same section into batches of at most batch_size"""
+    for section, group in groupby(items, key = lambda item: item[0]):
+        batch: List[Dict[str, Any]] = []
+        for _, item in group:
+            batch.append(item)
+            if len(batch) >= batch_size:
+                yield section, batch
+                batch = []
+        if batch:
+            yield section, batch
@@ -0,0 +1,64 @@
+from typing import Any, Awaitable, Callable, Dict, Hashable
+import asyncio
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical reads.
+
+    The first caller for a key starts the load as a task; callers arriving
+    while it runs await the same task instead of starting their own, so a burst
+    of requests for one portfolio section costs a single database fetch. The
+    task is shielded: a caller that is cancelled (e.g. a client disconnect)
+    does not cancel the load for the others.
+    """
+    def __init__(self):
+        self._calls: Dict[Hashable, "asyncio.Task[Any]"] = {}
+        self.calls = 0
+        self.loads = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the result of the in-flight load for key, starting one if there is none"""
+        return await asyncio.shield(self.start(key, loader))
+
+    def start(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> "asyncio.Task[Any]":
+        """Return the in-flight load task for key, starting one if there is none"""
+        self.calls += 1
+        task = self._calls.get(key)
+        if task is None:
+            self.loads += 1
+            task = self._calls[key] = asyncio.ensure_future(loader())
+            task.add_done_callback(lambda done: self._finished(key, done))
+        else:
+            self.coalesced += 1
+        return task
+
+    def in_flight(self, key: Hashable) -> bool:
+        """True while a load for key is running"""
+        return key in self._calls
+
+    def owns(self, key: Hashable) -> bool:
+        """True when called from the load that is still current for key (it has not been forgotten)"""
+        task = self._calls.get(key)
+        return task is not None and task is asyncio.current_task()
+
+    def forget(self, *keys: Hashable):
+        """Detach in-flight loads so later callers start fresh ones (e.g. after a write)"""
+        for key in keys:
+            self._calls.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        """Coalescing counters"""
+        return {
+            "in_flight": len(self._calls),
+            "calls": self.calls,
+            "loads": self.loads,
+            "coalesced": self.coalesced,
+        }
+
+    def _finished(self, key: Hashable, task: "asyncio.Task[Any]"):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Retrieve the exception so it is not reported as unhandled when every caller went away
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,162 @@
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Set
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+
+from pydantic_core import to_json
+
+try:
+    import brotli    # optional: also write .br variants when available
+except ImportError:
+    brotli = None
+try:
+    import fcntl     # POSIX: serialises manifest updates across worker processes
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Snapshot file name per section, matching the API endpoint names
+SECTION_FILES = {
+    "skills": "skills",
+    "experiences": "experience",
+    "projects": "projects",
+    "achievements": "achievements",
+    "publications": "publications",
+}
+PORTFOLIO_FILE = "portfolio"
+MANIFEST_FILE = "manifest.json"
+LOCK_FILE = ".manifest.lock"
+
+# Serialises manifest updates between threads of this process (and, without fcntl, is the only lock)
+_manifest_lock = threading.Lock()
+
+class SnapshotPublisher:
+    """
+    Renders portfolio payloads to static, content-hashed JSON files.
+
+    Layout per portfolio:
+        <output_dir>/<portfolio_id>/<name>.<hash>.json      (+ .json.gz, .json.br)
+        <output_dir>/<portfolio_id>/manifest.json           name -> current file
+
+    Hashed files never change and can be served with long-lived cache headers;
+    only manifest.json needs a short TTL. Writes are coalesced per portfolio so
+    a burst of admin edits results in a single render. Several workers may
+    publish into the same directory: each manifest update holds a lock file.
+    """
+    def __init__(self, output_dir: Path, debounce: float = 0.2):
+        self.output_dir = Path(output_dir)
+        self.debounce = debounce
+        self._pending: Dict[str, Set[str]] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def schedule(self, service, portfolio_id: str, sections: Iterable[str] = ()):
+        """Queue a re-render of the portfolio file and the given section files"""
+        self._pending.setdefault(portfolio_id, set()).update(s for s in sections if s in SECTION_FILES)
+        if portfolio_id not in self._tasks:
+            self._tasks[portfolio_id] = asyncio.create_task(self._run(service, portfolio_id))
+
+    async def drain(self):
+        """Wait for all scheduled renders to finish"""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks.values()), return_exceptions = True)
+
+    async def publish_all(self, service, portfolio_id: str) -> Optional[Dict[str, Any]]:
+        """Render every file for a portfolio"""
+        return await self.publish(service, portfolio_id, SECTION_FILES.keys())
+
+    async def publish(self, service, portfolio_id: str, sections: Iterable[str]) -> Optional[Dict[str, Any]]:
+        """Render the portfolio file and the given section files; returns the manifest"""
+        portfolio = await service.get_portfolio(portfolio_id)
+        if portfolio is None:
+            return None
+        payloads = {PORTFOLIO_FILE: portfolio}
+        for section in sections:
+            # Section payloads are the same lists the section endpoints return
+            payloads[SECTION_FILES[section]] = getattr(portfolio, section)
+        return await asyncio.to_thread(self._write, portfolio_id, payloads)
+
+    async def _run(self, service, portfolio_id: str):
+        try:
+            while self._pending.get(portfolio_id) is not None:
+                await asyncio.sleep(self.debounce)
+                sections = self._pending.pop(portfolio_id)
+                try:
+                    await self.publish(service, portfolio_id, sections)
+                except Exception as e:
+                    logger.exception(f"Failed to publish snapshot for portfolio '{portfolio_id}': {e}")
+        finally:
+            self._tasks.pop(portfolio_id, None)
+
+    @staticmethod
+    @contextmanager
+    def _locked(directory: Path) -> Iterator[None]:
+        """Hold the portfolio's manifest lock (across processes where fcntl is available)"""
+        with _manifest_lock:
+            if fcntl is None:
+                yield
+                return
+            with open(directory / LOCK_FILE, "a+b") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _write(self, portfolio_id: str, payloads: Dict[str, Any]) -> Dict[str, Any]:
+        directory = self.output_dir / portfolio_id
+        directory.mkdir(parents = True, exist_ok = True)
+        # Read-modify-write of the manifest (and removal of old generations) must not interleave with another worker's
+        with self._locked(directory):
+            return self._write_locked(directory, portfolio_id, payloads)
+
+    def _write_locked(self, directory: Path, portfolio_id: str, payloads: Dict[str, Any]) -> Dict[str, Any]:
+        manifest_path = directory / MANIFEST_FILE
+        manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+
+        changed = False
+        for name, payload in payloads.items():
+            body = to_json(payload)
+            digest = hashlib.sha256(body).hexdigest()[:16]
+            if manifest.get(name, {}).get("hash") == digest:
+                continue
+            filename = f"{name}.{digest}.json"
+            self._atomic_write(directory / filename, body)
+            self._atomic_write(directory / f"{filename}.gz", gzip.compress(body, compresslevel = 9, mtime = 0))
+            if brotli is not None:
+                self._atomic_write(directory / f"{filename}.br", brotli.compress(body))
+            entry = manifest.get(name, {})
+            if entry.get("previous") not in (None, filename):
+                self._remove_generation(directory, entry["previous"])
+            manifest[name] = {
+                "file": filename,
+                "hash": digest,
+                "bytes": len(body),
+                "previous": entry.get("file"),
+            }
+            changed = True
+
+        if changed:
+            self._atomic_write(manifest_path, json.dumps(manifest, indent = 2, sort_keys = True).encode())
+            logger.info(f"Published snapshot for portfolio '{portfolio_id}': {sorted(payloads)}")
+        return manifest
+
+    @staticmethod
+    def _atomic_write(path: Path, data: bytes):
+        # Unique per writer: several workers may share the directory
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _remove_generation(directory: Path, filename: str):
+        # The generation before the current one is kept so clients holding an
+        # older manifest still resolve; anything older is removed
+        for suffix in ("", ".gz", ".br"):
+            (directory / f"{filename}{suffix}").unlink(missing_ok = True)
@@ -0,0 +1,398 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+import asyncio
+import json
+import sqlite3
+import time
+
+from pydantic_core import to_json
+
+from services.storage import SECTION_COLLECTIONS, Facets, StorageBackend
+from services.version_ledger import VersionLedger
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS portfolios (
+    portfolio_id TEXT PRIMARY KEY,
+    updated_at REAL NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS items (
+    section TEXT NOT NULL,
+    portfolio_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    sort_order INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    body TEXT NOT NULL,
+    PRIMARY KEY (section, portfolio_id, id)
+);
+CREATE INDEX IF NOT EXISTS items_by_position ON items (section, portfolio_id, sort_order, id);
+CREATE INDEX IF NOT EXISTS items_by_update ON items (portfolio_id, updated_at);
+CREATE TABLE IF NOT EXISTS tombstones (
+    portfolio_id TEXT NOT NULL,
+    section TEXT NOT NULL,
+    id TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tombstones_by_update ON tombstones (portfolio_id, updated_at);
+CREATE TABLE IF NOT EXISTS versions (
+    portfolio_id TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    sections TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS versions_by_update ON versions (updated_at);
+"""
+
+def _epoch(value: Any) -> float:
+    """Seconds since the epoch of a stored timestamp (naive datetimes are UTC, as with MongoDB)"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo = timezone.utc)
+        return value.timestamp()
+    return time.time()
+
+def _from_epoch(seconds: float) -> datetime:
+    return datetime.fromtimestamp(seconds, timezone.utc)
+
+def _encode(document: Dict[str, Any]) -> str:
+    return to_json(document).decode()
+
+def _plain(value: Any) -> Any:
+    """A value as it reads back from storage (datetimes become ISO strings), for comparisons"""
+    return json.loads(to_json(value))
+
+def _set_path(document: Dict[str, Any], path: str, value: Any):
+    *parents, leaf = path.split(".")
+    for parent in parents:
+        document = document.setdefault(parent, {})
+    document[leaf] = value
+
+def _get_path(document: Dict[str, Any], path: str) -> Any:
+    for part in path.split("."):
+        if not isinstance(document, dict) or part not in document:
+            return None
+        document = document[part]
+    return document
+
+def _matches(item: Dict[str, Any], all_of: Optional[Dict[str, List[Any]]], equals: Optional[Dict[str, Any]]) -> bool:
+    """Whether an item passes find_items filters ($all on list fields, equality otherwise)"""
+    return (
+        all(set(values) <= set(item.get(field) or ()) for field, values in (all_of or {}).items())
+        and all(item.get(field) == value for field, value in (equals or {}).items())
+    )
+
+T = TypeVar("T")
+
+class _Database:
+    """
+    One SQLite connection shared by the storage and its ledger.
+
+    Statements run one at a time on a dedicated thread, so a write waiting
+    for another worker's lock on the file never blocks the event loop.
+    """
+    def __init__(self, path: Path):
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents = True, exist_ok = True)
+        # Autocommit; multi-statement writes open their own transaction
+        self.connection = sqlite3.connect(str(path), isolation_level = None, check_same_thread = False)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        # Give up on a locked file within about the breaker's latency budget
+        self.connection.execute("PRAGMA busy_timeout = 2000")
+        self.executor = ThreadPoolExecutor(max_workers = 1, thread_name_prefix = "sqlite")
+
+    async def _run(self, work: Callable[[sqlite3.Connection], T]) -> T:
+        return await asyncio.get_running_loop().run_in_executor(self.executor, work, self.connection)
+
+    async def transaction(self, work: Callable[[sqlite3.Connection], T]) -> T:
+        """Run work(connection) in one write transaction and return its result"""
+        def run(connection: sqlite3.Connection) -> T:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                result = work(connection)
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+            return result
+        return await self._run(run)
+
+    async def query(self, sql: str, parameters: Sequence[Any] = ()) -> List[tuple]:
+        return await self._run(lambda connection: connection.execute(sql, parameters).fetchall())
+
+    def close(self):
+        self.executor.shutdown(wait = True)
+        self.connection.close()
+
+class SqliteVersionLedger(VersionLedger):
+    """The version ledger in the embedded database; workers sharing the file poll it"""
+    supports_watch = False
+
+    def __init__(self, database: _Database):
+        self.database = database
+        self.collection = None
+        self._seen: Dict[str, Dict[str, int]] = {}
+
+    async def ensure_indexes(self):
+        pass
+
+    async def bump(self, portfolio_id: str, sections) -> Dict[str, Any]:
+        sections = list(sections)
+
+        def write(connection: sqlite3.Connection) -> Tuple[int, Dict[str, int], float]:
+            row = connection.execute("SELECT version, sections FROM versions WHERE portfolio_id = ?", (portfolio_id,)).fetchone()
+            version, counters = (row[0], json.loads(row[1])) if row else (0, {})
+            for section in sections:
+                counters[section] = counters.get(section, 0) + 1
+            updated_at = time.time()
+            connection.execute(
+                "INSERT OR REPLACE INTO versions (portfolio_id, version, sections, updated_at) VALUES (?, ?, ?, ?)",
+                (portfolio_id, version + 1, json.dumps(counters), updated_at),
+            )
+            return version + 1, counters, updated_at
+
+        version, counters, updated_at = await self.database.transaction(write)
+        doc = {"portfolioId": portfolio_id, "version": version, "sections": counters, "updatedAt": _from_epoch(updated_at)}
+        self._record_bump(portfolio_id, sections, doc)
+        return doc
+
+    async def changed_since(self, since: Optional[datetime]) -> List[Dict[str, Any]]:
+        rows = await self.database.query(
+            "SELECT portfolio_id, version, sections, updated_at FROM versions WHERE updated_at >= ? ORDER BY updated_at",
+            (_epoch(since) if since is not None else 0,),
+        )
+        return [
+            {"portfolioId": portfolio_id, "version": version, "sections": json.loads(sections), "updatedAt": _from_epoch(updated_at)}
+            for portfolio_id, version, sections, updated_at in rows
+        ]
+
+    async def latest_update(self) -> Optional[datetime]:
+        rows = await self.database.query("SELECT MAX(updated_at) FROM versions")
+        return _from_epoch(rows[0][0]) if rows and rows[0][0] is not None else None
+
+class SqliteStorage(StorageBackend):
+    """
+    Embedded storage in a local SQLite file, for single-host deployments.
+
+    Each document is stored as JSON next to the columns used for lookups
+    (portfolio, id, order, updatedAt). Queries run in-process: on the small
+    per-portfolio data sets this is a few microseconds
+    instead of a network round trip, plus a hop to the database thread.
+    Several workers may share one file; the version ledger keeps their
+    caches coherent by polling.
+    """
+    name = "sqlite"
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.database = _Database(path)
+        self.database.connection.executescript(SCHEMA)
+        self.ledger = SqliteVersionLedger(self.database)
+        self.tombstone_retention_seconds: Optional[int] = None
+
+    async def command(self, name: str) -> Dict[str, Any]:
+        if name != "ping":
+            raise ValueError(f"Unsupported command '{name}'")
+        await self.database.query("SELECT 1")
+        return {"ok": 1}
+
+    async def ensure_indexes(self, seed_keys: Dict[str, Sequence[str]], tombstone_retention_seconds: int):
+        # The schema creates its indexes; tombstones are expired when new ones are added
+        self.tombstone_retention_seconds = tombstone_retention_seconds
+
+    def _items(self, rows: List[tuple]) -> List[Dict[str, Any]]:
+        return [json.loads(row[0]) for row in rows]
+
+    async def find_portfolio(self, portfolio_id: str) -> Optional[Dict[str, Any]]:
+        rows = await self.database.query("SELECT body FROM portfolios WHERE portfolio_id = ?", (portfolio_id,))
+        return json.loads(rows[0][0]) if rows else None
+
+    async def upsert_portfolio(self, portfolio_id: str, fields: Dict[str, Any], on_insert: Dict[str, Any]):
+        def write(connection: sqlite3.Connection):
+            row = connection.execute("SELECT body FROM portfolios WHERE portfolio_id = ?", (portfolio_id,)).fetchone()
+            document = json.loads(row[0]) if row else {"userId": portfolio_id, **_plain(on_insert)}
+            document.update(_plain(fields))
+            connection.execute(
+                "INSERT OR REPLACE INTO portfolios (portfolio_id, updated_at, body) VALUES (?, ?, ?)",
+                (portfolio_id, _epoch(document.get("updatedAt")), _encode(document)),
+            )
+        await self.database.transaction(write)
+
+    def _apply_update(self, document: Dict[str, Any], fields: Dict[str, Any], now: datetime) -> bool:
+        plain = _plain(fields)
+        changed = any(_get_path(document, path) != value for path, value in plain.items())
+        for path, value in plain.items():
+            _set_path(document, path, value)
+        if changed:
+            document["updatedAt"] = _plain(now)
+        return changed
+
+    async def update_portfolio(self, portfolio_id: str, fields: Dict[str, Any], now: datetime) -> Tuple[Optional[Dict[str, Any]], bool]:
+        def write(connection: sqlite3.Connection) -> Tuple[Optional[Dict[str, Any]], bool]:
+            row = connection.execute("SELECT body FROM portfolios WHERE portfolio_id = ?", (portfolio_id,)).fetchone()
+            if row is None:
+                return None, False
+            document = json.loads(row[0])
+            changed = self._apply_update(document, fields, now)
+            if changed:
+                connection.execute(
+                    "UPDATE portfolios SET updated_at = ?, body = ? WHERE portfolio_id = ?",
+                    (now.timestamp(), _encode(document), portfolio_id),
+                )
+            return document, changed
+        return await self.database.transaction(write)
+
+    async def find_items(self, section: str, portfolio_id: str, all_of: Optional[Dict[str, List[Any]]] = None,
+                         equals: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        items = self._items(await self.database.query(
+            "SELECT body FROM items WHERE section = ? AND portfolio_id = ? ORDER BY sort_order, rowid",
+            (section, portfolio_id),
+        ))
+        return [item for item in items if _matches(item, all_of, equals)]
+
+    async def find_page(self, section: str, portfolio_id: str, limit: int, after: Optional[Tuple[int, str]] = None,
+                        all_of: Optional[Dict[str, List[Any]]] = None, equals: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        page: List[Dict[str, Any]] = []
+        # Filters are applied here, so filtered pages may need several index range scans
+        batch = limit if not (all_of or equals) else max(limit, 100)
+        while len(page) < limit:
+            if after is None:
+                rows = await self.database.query(
+                    "SELECT body, sort_order, id FROM items WHERE section = ? AND portfolio_id = ? ORDER BY sort_order, id LIMIT ?",
+                    (section, portfolio_id, batch),
+                )
+            else:
+                rows = await self.database.query(
+                    "SELECT body, sort_order, id FROM items WHERE section = ? AND portfolio_id = ? "
+                    "AND (sort_order > ? OR (sort_order = ? AND id > ?)) ORDER BY sort_order, id LIMIT ?",
+                    (section, portfolio_id, after[0], after[0], after[1], batch),
+                )
+            page.extend(item for item in self._items(rows) if _matches(item, all_of, equals))
+            if len(rows) < batch:
+                break
+            after = (rows[-1][1], rows[-1][2])
+        return page[:limit]
+
+    async def find_items_in(self, section: str, portfolio_id: str, field: str, values: List[Any]) -> List[Dict[str, Any]]:
+        placeholders = ", ".join("?" * len(values))
+        if field == "id":
+            return self._items(await self.database.query(
+                f"SELECT body FROM items WHERE section = ? AND portfolio_id = ? AND id IN ({placeholders})",
+                (section, portfolio_id, *values),
+            ))
+        # Filter inside SQLite so only matching bodies are decoded
+        return self._items(await self.database.query(
+            f"SELECT body FROM items WHERE section = ? AND portfolio_id = ? AND json_extract(body, ?) IN ({placeholders})",
+            (section, portfolio_id, f"$.{field}", *values),
+        ))
+
+    async def item_ids(self, section: str, portfolio_id: str, equals: Optional[Dict[str, Any]] = None) -> List[str]:
+        sql, parameters = "SELECT id FROM items WHERE section = ? AND portfolio_id = ?", [section, portfolio_id]
+        for field, value in (equals or {}).items():
+            sql += " AND json_extract(body, ?) = ?"
+            parameters += [f"$.{field}", value]
+        return [row[0] for row in await self.database.query(sql, parameters)]
+
+    async def insert_item(self, section: str, document: Dict[str, Any]):
+        await self.database.transaction(lambda connection: self._insert(connection, section, document))
+
+    def _insert(self, connection: sqlite3.Connection, section: str, document: Dict[str, Any]):
+        connection.execute(
+            "INSERT INTO items (section, portfolio_id, id, sort_order, updated_at, body) VALUES (?, ?, ?, ?, ?, ?)",
+            (section, document["portfolioId"], document["id"], document.get("order", 0),
+             _epoch(document.get("updatedAt")), _encode(document)),
+        )
+
+    async def update_item(self, section: str, portfolio_id: str, item_id: str, fields: Dict[str, Any],
+                          now: datetime) -> Tuple[Optional[Dict[str, Any]], bool]:
+        def write(connection: sqlite3.Connection) -> Tuple[Optional[Dict[str, Any]], bool]:
+            row = connection.execute(
+                "SELECT body FROM items WHERE section = ? AND portfolio_id = ? AND id = ?", (section, portfolio_id, item_id),
+            ).fetchone()
+            if row is None:
+                return None, False
+            document = json.loads(row[0])
+            changed = self._apply_update(document, fields, now)
+            if changed:
+                self._replace(connection, section, document)
+            return document, changed
+        return await self.database.transaction(write)
+
+    def _replace(self, connection: sqlite3.Connection, section: str, document: Dict[str, Any]):
+        connection.execute(
+            "UPDATE items SET sort_order = ?, updated_at = ?, body = ? WHERE section = ? AND portfolio_id = ? AND id = ?",
+            (document.get("order", 0), _epoch(document.get("updatedAt")), _encode(document),
+             section, document["portfolioId"], document["id"]),
+        )
+
+    async def delete_item(self, section: str, portfolio_id: str, item_id: str) -> bool:
+        return await self.delete_items(section, portfolio_id, [item_id]) > 0
+
+    async def delete_items(self, section: str, portfolio_id: str, item_ids: List[str]) -> int:
+        return await self.database.transaction(lambda connection: connection.executemany(
+            "DELETE FROM items WHERE section = ? AND portfolio_id = ? AND id = ?",
+            [(section, portfolio_id, item_id) for item_id in item_ids],
+        ).rowcount)
+
+    async def bulk_write(self, section: str, portfolio_id: str, inserts: List[Dict[str, Any]], updates: List[Dict[str, Any]]):
+        if not inserts and not updates:
+            return
+        existing = await self.find_items_in(section, portfolio_id, "id", [document["id"] for document in updates]) if updates else []
+        changes = {document["id"]: document for document in updates}
+
+        def write(connection: sqlite3.Connection):
+            for document in inserts:
+                self._insert(connection, section, document)
+            for current in existing:
+                current.update(_plain(changes[current["id"]]))
+                self._replace(connection, section, current)
+        await self.database.transaction(write)
+
+    async def project_facets(self, portfolio_id: str) -> Facets:
+        projects = await self.find_items("projects", portfolio_id)
+        counts: Dict[str, int] = {}
+        for project in projects:
+            for technology in project.get("technologies") or ():
+                counts[technology] = counts.get(technology, 0) + 1
+        return (
+            len(projects),
+            sum(1 for project in projects if project.get("featured") is True),
+            sorted(counts.items(), key = lambda item: (-item[1], item[0])),
+        )
+
+    async def add_tombstones(self, tombstones: List[Dict[str, Any]]):
+        def write(connection: sqlite3.Connection):
+            if self.tombstone_retention_seconds:
+                connection.execute("DELETE FROM tombstones WHERE updated_at < ?", (time.time() - self.tombstone_retention_seconds,))
+            connection.executemany(
+                "INSERT INTO tombstones (portfolio_id, section, id, updated_at) VALUES (?, ?, ?, ?)",
+                [(t["portfolioId"], t["section"], t["id"], _epoch(t["updatedAt"])) for t in tombstones],
+            )
+        await self.database.transaction(write)
+
+    async def changes(self, portfolio_id: str, since: datetime) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]], Dict[str, List[Dict[str, Any]]]]:
+        after = _epoch(since)
+        portfolio_rows = await self.database.query(
+            "SELECT body FROM portfolios WHERE portfolio_id = ? AND updated_at > ?", (portfolio_id, after),
+        )
+        tombstones = [
+            {"portfolioId": portfolio_id, "section": section, "id": item_id, "updatedAt": _from_epoch(updated_at)}
+            for section, item_id, updated_at in await self.database.query(
+                "SELECT section, id, updated_at FROM tombstones WHERE portfolio_id = ? AND updated_at > ? ORDER BY updated_at",
+                (portfolio_id, after),
+            )
+        ]
+        sections: Dict[str, List[Dict[str, Any]]] = {section: [] for section in SECTION_COLLECTIONS}
+        for section, body in await self.database.query(
+            "SELECT section, body FROM items WHERE portfolio_id = ? AND updated_at > ? ORDER BY updated_at",
+            (portfolio_id, after),
+        ):
+            sections[section].append(json.loads(body))
+        return (json.loads(portfolio_rows[0][0]) if portfolio_rows else None), tombstones, sections
+
+    def close(self):
+        self.database.close()
@@ -0,0 +1,284 @@
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import asyncio
+
+from pymongo import ASCENDING, IndexModel, InsertOne, ReturnDocument, UpdateOne
+
+from services.version_ledger import VersionLedger
+
+# Section collections, in the order PortfolioService uses them
+SECTION_COLLECTIONS = ("skills", "experiences", "projects", "achievements", "publications")
+
+# Facet counts: (total, featured, [(technology, count)] most used first)
+Facets = Tuple[int, int, List[Tuple[str, int]]]
+
+def millisecond_now() -> datetime:
+    """Current UTC time truncated to the millisecond precision of stored timestamps"""
+    now = datetime.now(timezone.utc)
+    return now.replace(microsecond = now.microsecond // 1000 * 1000)
+
+def as_utc(value: datetime) -> datetime:
+    """Timezone-aware copy of a timestamp; naive ones (as MongoDB returns them) are UTC"""
+    return value.replace(tzinfo = timezone.utc) if value.tzinfo is None else value
+
+class StorageBackend:
+    """
+    Operations PortfolioService needs from its data store.
+
+    Documents are plain dicts in the shape of the portfolio models. The
+    portfolio document is addressed by its portfolio id; section items by
+    (section, portfolio id, item id) and listed in `order`.
+    """
+    name = "abstract"
+    ledger: VersionLedger
+
+    async def command(self, name: str) -> Dict[str, Any]:
+        """Run a database command; backends need to support 'ping' (used by the health probes)"""
+        raise NotImplementedError
+
+    async def ensure_indexes(self, seed_keys: Dict[str, Sequence[str]], tombstone_retention_seconds: int):
+        """Create whatever the backend needs for the queries below"""
+        raise NotImplementedError
+
+    # Portfolio document
+    async def find_portfolio(self, portfolio_id: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    async def upsert_portfolio(self, portfolio_id: str, fields: Dict[str, Any], on_insert: Dict[str, Any]):
+        """Set fields on the portfolio document, creating it (with on_insert as well) if missing"""
+        raise NotImplementedError
+
+    async def update_portfolio(self, portfolio_id: str, fields: Dict[str, Any], now: datetime) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """Set dotted-path fields; updatedAt moves to now only if a value differs. Returns (document, changed)"""
+        raise NotImplementedError
+
+    # Section items
+    async def find_items(self, section: str, portfolio_id: str, all_of: Optional[Dict[str, List[Any]]] = None,
+                         equals: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Items sorted by order, optionally with list fields containing all given values and fields equal to values"""
+        raise NotImplementedError
+
+    async def find_page(self, section: str, portfolio_id: str, limit: int, after: Optional[Tuple[int, str]] = None,
+                        all_of: Optional[Dict[str, List[Any]]] = None, equals: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Up to limit items sorted by (order, id) that come after the given (order, id), filtered as in find_items"""
+        raise NotImplementedError
+
+    async def find_items_in(self, section: str, portfolio_id: str, field: str, values: List[Any]) -> List[Dict[str, Any]]:
+        """Items whose field is one of values, in no particular order"""
+        raise NotImplementedError
+
+    async def item_ids(self, section: str, portfolio_id: str, equals: Optional[Dict[str, Any]] = None) -> List[str]:
+        """Ids of a section's items, optionally only of those with fields equal to values"""
+        raise NotImplementedError
+
+    async def insert_item(self, section: str, document: Dict[str, Any]):
+        raise NotImplementedError
+
+    async def update_item(self, section: str, portfolio_id: str, item_id: str, fields: Dict[str, Any],
+                          now: datetime) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """Set fields on an item; updatedAt moves to now only if a value differs. Returns (document, changed)"""
+        raise NotImplementedError
+
+    async def delete_item(self, section: str, portfolio_id: str, item_id: str) -> bool:
+        raise NotImplementedError
+
+    async def delete_items(self, section: str, portfolio_id: str, item_ids: List[str]) -> int:
+        raise NotImplementedError
+
+    async def bulk_write(self, section: str, portfolio_id: str, inserts: List[Dict[str, Any]], updates: List[Dict[str, Any]]):
+        """Insert new items and set the given fields on existing items (by id), unordered"""
+        raise NotImplementedError
+
+    async def project_facets(self, portfolio_id: str) -> Facets:
+        raise NotImplementedError
+
+    # Delta sync
+    async def add_tombstones(self, tombstones: List[Dict[str, Any]]):
+        raise NotImplementedError
+
+    async def changes(self, portfolio_id: str, since: datetime) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]], Dict[str, List[Dict[str, Any]]]]:
+        """(portfolio document, tombstones, items per section) updated after since, oldest first"""
+        raise NotImplementedError
+
+    def close(self):
+        """Release the backend's resources"""
+
+class MongoStorage(StorageBackend):
+    """Portfolio data in MongoDB collections (one per section), through Motor"""
+    name = "mongo"
+
+    def __init__(self, db):
+        self.db = db
+        self.ledger = VersionLedger(db)
+        self.portfolios = db.portfolios
+        self.tombstones = db.tombstones
+        self.sections = {section: db[section] for section in SECTION_COLLECTIONS}
+
+    async def command(self, name: str) -> Dict[str, Any]:
+        return await self.db.command(name)
+
+    async def ensure_indexes(self, seed_keys: Dict[str, Sequence[str]], tombstone_retention_seconds: int):
+        """Create the tenant-aware indexes used by every query"""
+        section_indexes = [
+            # Listing a section: filter by tenant, sort by order (and id, for keyset pagination)
+            IndexModel([("portfolioId", ASCENDING), ("order", ASCENDING), ("id", ASCENDING)]),
+            # Updating/deleting an item: filter by tenant and id
+            IndexModel([("portfolioId", ASCENDING), ("id", ASCENDING)], unique = True),
+            # Delta sync: items of a tenant changed since a timestamp
+            IndexModel([("portfolioId", ASCENDING), ("updatedAt", ASCENDING)]),
+        ]
+        # Multikey indexes for filtering by list elements
+        list_indexes = {
+            "projects": [IndexModel([("portfolioId", ASCENDING), ("technologies", ASCENDING), ("order", ASCENDING)])],
+            "skills": [IndexModel([("portfolioId", ASCENDING), ("items", ASCENDING)])],
+        }
+        # createIndexes is a no-op for existing indexes; one command per collection, all in parallel
+        await asyncio.gather(
+            self.portfolios.create_indexes([IndexModel([("userId", ASCENDING)], unique = True)]),
+            *(collection.create_indexes(
+                section_indexes
+                # Seed migration: match items by their seed key
+                + [IndexModel([("portfolioId", ASCENDING), *((field, ASCENDING) for field in seed_keys[section])])]
+                + list_indexes.get(section, [])
+            ) for section, collection in self.sections.items()),
+            self.tombstones.create_indexes([
+                IndexModel([("portfolioId", ASCENDING), ("updatedAt", ASCENDING)]),
+                IndexModel([("updatedAt", ASCENDING)], expireAfterSeconds = tombstone_retention_seconds),
+            ]),
+            self.ledger.ensure_indexes(),
+        )
+
+    @staticmethod
+    async def _update_if_changed(collection, query: Dict[str, Any], fields: Dict[str, Any], now: datetime) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """
+        Set fields on the matching document in one round trip, bumping updatedAt
+        only if a value actually differs. Returns the updated document (None if
+        nothing matched) and whether it changed.
+        """
+        values = {path: {"$literal": value} for path, value in fields.items()}
+        changed = {"$or": [{"$ne": [f"${path}", value]} for path, value in values.items()]}
+        doc = await collection.find_one_and_update(
+            query,
+            # Compare against the stored values before setting them
+            [{"$set": {"updatedAt": {"$cond": [changed, now, "$updatedAt"]}}}, {"$set": values}],
+            projection = {"_id": 0},
+            return_document = ReturnDocument.AFTER,
+        )
+        if doc is None:
+            return None, False
+        stamp = doc.get("updatedAt")
+        if isinstance(stamp, datetime):
+            stamp = as_utc(stamp)
+        return doc, stamp == now
+
+    async def find_portfolio(self, portfolio_id: str) -> Optional[Dict[str, Any]]:
+        return await self.portfolios.find_one({"userId": portfolio_id}, {"_id": 0})
+
+    async def upsert_portfolio(self, portfolio_id: str, fields: Dict[str, Any], on_insert: Dict[str, Any]):
+        await self.portfolios.update_one(
+            {"userId": portfolio_id},
+            {"$set": fields, "$setOnInsert": on_insert},
+            upsert = True,
+        )
+
+    async def update_portfolio(self, portfolio_id: str, fields: Dict[str, Any], now: datetime) -> Tuple[Optional[Dict[str, Any]], bool]:
+        return await self._update_if_changed(self.portfolios, {"userId": portfolio_id}, fields, now)
+
+    @staticmethod
+    def _item_query(portfolio_id: str, all_of: Optional[Dict[str, List[Any]]], equals: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        query: Dict[str, Any] = {"portfolioId": portfolio_id, **(equals or {})}
+        for field, values in (all_of or {}).items():
+            query[field] = {"$all": values}
+        return query
+
+    async def find_items(self, section: str, portfolio_id: str, all_of: Optional[Dict[str, List[Any]]] = None,
+                         equals: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        query = self._item_query(portfolio_id, all_of, equals)
+        return await self.sections[section].find(query, {"_id": 0}).sort("order", 1).to_list(None)
+
+    async def find_page(self, section: str, portfolio_id: str, limit: int, after: Optional[Tuple[int, str]] = None,
+                        all_of: Optional[Dict[str, List[Any]]] = None, equals: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        query = self._item_query(portfolio_id, all_of, equals)
+        if after is not None:
+            order, item_id = after
+            # The $gte bound lets the (portfolioId, order, id) index start the scan at the cursor
+            query["order"] = {"$gte": order}
+            query["$or"] = [{"order": {"$gt": order}}, {"id": {"$gt": item_id}}]
+        cursor = self.sections[section].find(query, {"_id": 0}).sort([("order", 1), ("id", 1)]).limit(limit)
+        return await cursor.to_list(None)
+
+    async def find_items_in(self, section: str, portfolio_id: str, field: str, values: List[Any]) -> List[Dict[str, Any]]:
+        return await self.sections[section].find({"portfolioId": portfolio_id, field: {"$in": values}}, {"_id": 0}).to_list(None)
+
+    async def item_ids(self, section: str, portfolio_id: str, equals: Optional[Dict[str, Any]] = None) -> List[str]:
+        query = {"portfolioId": portfolio_id, **(equals or {})}
+        return [doc["id"] async for doc in self.sections[section].find(query, {"_id": 0, "id": 1})]
+
+    async def insert_item(self, section: str, document: Dict[str, Any]):
+        await self.sections[section].insert_one(document)
+
+    async def update_item(self, section: str, portfolio_id: str, item_id: str, fields: Dict[str, Any],
+                          now: datetime) -> Tuple[Optional[Dict[str, Any]], bool]:
+        return await self._update_if_changed(self.sections[section], {"id": item_id, "portfolioId": portfolio_id}, fields, now)
+
+    async def delete_item(self, section: str, portfolio_id: str, item_id: str) -> bool:
+        result = await self.sections[section].delete_one({"id": item_id, "portfolioId": portfolio_id})
+        return result.deleted_count > 0
+
+    async def delete_items(self, section: str, portfolio_id: str, item_ids: List[str]) -> int:
+        result = await self.sections[section].delete_many({"portfolioId": portfolio_id, "id": {"$in": item_ids}})
+        return result.deleted_count
+
+    async def bulk_write(self, section: str, portfolio_id: str, inserts: List[Dict[str, Any]], updates: List[Dict[str, Any]]):
+        operations = [InsertOne(document) for document in inserts] + [
+            UpdateOne({"portfolioId": portfolio_id, "id": document["id"]}, {"$set": document}) for document in updates
+        ]
+        if operations:
+            await self.sections[section].bulk_write(operations, ordered = False)
+
+    async def project_facets(self, portfolio_id: str) -> Facets:
+        """Count projects per technology in a single aggregation"""
+        pipeline = [
+            {"$match": {"portfolioId": portfolio_id}},
+            {"$facet": {
+                "total": [{"$count": "count"}],
+                "featured": [{"$match": {"featured": True}}, {"$count": "count"}],
+                "technologies": [
+                    {"$unwind": "$technologies"},
+                    {"$group": {"_id": "$technologies", "count": {"$sum": 1}}},
+                    {"$sort": {"count": -1, "_id": 1}},
+                ],
+            }},
+        ]
+        result = (await self.sections["projects"].aggregate(pipeline).to_list(1))[0]
+        return (
+            result["total"][0]["count"] if result["total"] else 0,
+            result["featured"][0]["count"] if result["featured"] else 0,
+            [(row["_id"], row["count"]) for row in result["technologies"]],
+        )
+
+    async def add_tombstones(self, tombstones: List[Dict[str, Any]]):
+        await self.tombstones.insert_many(tombstones)
+
+    async def changes(self, portfolio_id: str, since: datetime) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]], Dict[str, List[Dict[str, Any]]]]:
+        query = {"portfolioId": portfolio_id, "updatedAt": {"$gt": since}}
+        portfolio_doc, tombstones, *sections = await asyncio.gather(
+            self.portfolios.find_one({"userId": portfolio_id, "updatedAt": {"$gt": since}}, {"_id": 0}),
+            self.tombstones.find(query, {"_id": 0}).sort("updatedAt", 1).to_list(None),
+            *(collection.find(query, {"_id": 0}).sort("updatedAt", 1).to_list(None) for collection in self.sections.values()),
+        )
+        for tombstone in tombstones:
+            tombstone["updatedAt"] = as_utc(tombstone["updatedAt"])
+        return portfolio_doc, tombstones, dict(zip(self.sections, sections))
+
+def create_storage(backend: str, db = None, sqlite_path: Optional[Path] = None) -> StorageBackend:
+    """Storage backend by name: 'mongo' (needs db) or 'sqlite' (needs sqlite_path)"""
+    if backend == "mongo":
+        if db is None:
+            raise ValueError("The mongo storage backend needs a database")
+        return MongoStorage(db)
+    if backend == "sqlite":
+        from services.sqlite_storage import SqliteStorage
+        return SqliteStorage(sqlite_path)
+    raise ValueError(f"Unknown storage backend '{backend}' (expected 'mongo' or 'sqlite')")
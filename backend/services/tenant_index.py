@@ -0,0 +1,102 @@
+from collections import OrderedDict
+from typing import Any, Generic, Iterable, Mapping, Tuple, Type, TypeVar
+import asyncio
+
+from models.portfolio import ChangeEvent
+from services.portfolio_service import SECTION_MODELS
+from services.single_flight import SingleFlight
+
+class TenantData:
+    """One portfolio's share of a LazyTenantIndex"""
+    def __init__(self):
+        self.loaded: set = set()
+        # Bumped by every change event, so a load can tell whether what it read is still current
+        self.generation = 0
+
+    def add(self, section: str, document: Any):
+        raise NotImplementedError
+
+    def remove(self, key: Tuple[str, str]):
+        raise NotImplementedError
+
+    def drop_section(self, section: str):
+        raise NotImplementedError
+
+T = TypeVar("T", bound = TenantData)
+
+class LazyTenantIndex(Generic[T]):
+    """
+    Base for in-process indexes kept per portfolio.
+
+    A portfolio's sections are read through PortfolioService on first use and
+    then kept current from its change events. Concurrent first uses share one
+    load, and a load that overlaps a write to the portfolio reads again. Only
+    the most recently used `max_tenants` portfolios are kept.
+    """
+    # Indexed sections (subclasses set these)
+    sections: Mapping[str, Any] = {}
+    tenant_class: Type[TenantData] = TenantData
+
+    def __init__(self, max_tenants: int = 1000):
+        self.max_tenants = max_tenants
+        self._tenants: "OrderedDict[str, T]" = OrderedDict()
+        self._loads = SingleFlight()
+
+    def on_change(self, event: ChangeEvent):
+        """PortfolioService listener keeping loaded portfolios current"""
+        tenant = self._tenants.get(event.portfolioId)
+        if tenant is None or event.section not in self.sections:
+            return
+        tenant.generation += 1
+        if event.section not in tenant.loaded:
+            return
+        if event.op == "delete":
+            tenant.remove((event.section, event.id))
+        elif event.op in ("create", "update") and event.document is not None:
+            tenant.add(event.section, SECTION_MODELS[event.section].model_validate(event.document))
+        else:
+            # Reset, or changed on another worker: reload on next use
+            tenant.drop_section(event.section)
+
+    def index_documents(self, portfolio_id: str, section: str, documents: Iterable[Any]):
+        """Bulk-load a section of a portfolio"""
+        tenant = self._tenants.get(portfolio_id)
+        if tenant is None:
+            tenant = self._add_tenant(portfolio_id)
+        self._fill(tenant, section, documents)
+
+    async def _tenant(self, service, portfolio_id: str) -> T:
+        tenant = self._tenants.get(portfolio_id)
+        if tenant is None or len(tenant.loaded) < len(self.sections):
+            tenant = await self._loads.do(portfolio_id, lambda: self._load(service, portfolio_id))
+        # Another portfolio's load may have evicted this one; it still answers this call
+        if self._tenants.get(portfolio_id) is tenant:
+            self._tenants.move_to_end(portfolio_id)
+        return tenant
+
+    async def _load(self, service, portfolio_id: str) -> T:
+        tenant = self._tenants.get(portfolio_id)
+        if tenant is None:
+            tenant = self._add_tenant(portfolio_id)
+        missing = [section for section in self.sections if section not in tenant.loaded]
+        while missing:
+            generation = tenant.generation
+            loaded = await asyncio.gather(*(getattr(service, f"get_{section}")(portfolio_id) for section in missing))
+            # A write while reading may be missing from what was read; read again
+            if tenant.generation == generation:
+                for section, documents in zip(missing, loaded):
+                    self._fill(tenant, section, documents)
+                missing = []
+        return tenant
+
+    def _add_tenant(self, portfolio_id: str) -> T:
+        tenant = self._tenants[portfolio_id] = self.tenant_class()
+        while len(self._tenants) > self.max_tenants:
+            self._tenants.popitem(last = False)
+        return tenant
+
+    @staticmethod
+    def _fill(tenant: T, section: str, documents: Iterable[Any]):
+        for document in documents:
+            tenant.add(section, document)
+        tenant.loaded.add(section)
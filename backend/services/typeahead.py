@@ -0,0 +1,103 @@
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import heapq
+
+from models.portfolio import Suggestion
+from services.tenant_index import LazyTenantIndex, TenantData
+
+# List field suggested from each section
+TERM_FIELDS = {"skills": "items", "projects": "technologies"}
+# Cached suggestion lists per portfolio
+MEMO_SIZE = 512
+
+class _Term:
+    """A suggestable value and how many items of each section use it"""
+    __slots__ = ("value", "counts")
+
+    def __init__(self, value: str):
+        self.value = value
+        self.counts: Dict[str, int] = {}
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+class _TenantTerms(TenantData):
+    """Sorted, reference-counted terms of one portfolio"""
+    def __init__(self):
+        super().__init__()
+        self.keys: List[str] = []                                   # sorted casefolded terms
+        self.terms: Dict[str, _Term] = {}
+        self.contributions: Dict[Tuple[str, str], List[str]] = {}
+        # Recent results; short prefixes match many terms and repeat on every keystroke
+        self.memo: Dict[Tuple[str, int, Optional[frozenset]], List[Suggestion]] = {}
+
+    def add(self, section: str, document: Any):
+        key = (section, document.id)
+        self.remove(key)
+        values = list(dict.fromkeys(value.strip() for value in getattr(document, TERM_FIELDS[section]) if value.strip()))
+        for value in values:
+            folded = value.casefold()
+            term = self.terms.get(folded)
+            if term is None:
+                term = self.terms[folded] = _Term(value)
+                insort(self.keys, folded)
+            term.counts[section] = term.counts.get(section, 0) + 1
+        self.contributions[key] = values
+
+    def remove(self, key: Tuple[str, str]):
+        section = key[0]
+        self.memo.clear()
+        for value in self.contributions.pop(key, ()):
+            folded = value.casefold()
+            term = self.terms[folded]
+            term.counts[section] -= 1
+            if not term.counts[section]:
+                del term.counts[section]
+            if not term.counts:
+                del self.terms[folded]
+                del self.keys[bisect_left(self.keys, folded)]
+
+    def drop_section(self, section: str):
+        for key in [key for key in self.contributions if key[0] == section]:
+            self.remove(key)
+        self.loaded.discard(section)
+
+    def suggest(self, prefix: str, limit: int, sources: Optional[Iterable[str]] = None) -> List[Suggestion]:
+        prefix = prefix.strip().casefold()
+        allowed = frozenset(sources) if sources else None
+        memo_key = (prefix, limit, allowed)
+        if memo_key in self.memo:
+            return self.memo[memo_key]
+        matches = []
+        for folded in self.keys[bisect_left(self.keys, prefix):]:
+            if not folded.startswith(prefix):
+                break
+            term = self.terms[folded]
+            count = term.total if allowed is None else sum(n for section, n in term.counts.items() if section in allowed)
+            if count:
+                matches.append((count, term))
+        # Most used first, then alphabetical
+        ranked = heapq.nsmallest(limit, matches, key = lambda match: (-match[0], match[1].value.casefold()))
+        suggestions = [Suggestion(value = term.value, count = count, sources = sorted(term.counts)) for count, term in ranked]
+        if len(self.memo) >= MEMO_SIZE:
+            self.memo.clear()
+        self.memo[memo_key] = suggestions
+        return suggestions
+
+class TypeaheadIndex(LazyTenantIndex[_TenantTerms]):
+    """
+    Prefix suggestions over skill items and project technologies.
+
+    Each portfolio's terms are kept in a sorted list searched with bisect, so a
+    lookup costs O(log n + matches) and never reaches MongoDB once the
+    portfolio is loaded. Terms are reference-counted per item.
+    """
+    sections = TERM_FIELDS
+    tenant_class = _TenantTerms
+
+    async def suggest(self, service, portfolio_id: str, prefix: str, limit: int = 10,
+                      sources: Optional[Iterable[str]] = None) -> List[Suggestion]:
+        """Terms starting with prefix (case-insensitive)"""
+        terms = await self._tenant(service, portfolio_id)
+        return terms.suggest(prefix, limit, sources)
@@ -0,0 +1,166 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from datetime import datetime
+from pymongo import ASCENDING, DESCENDING, IndexModel, ReturnDocument
+from pymongo.errors import OperationFailure
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+class VersionLedger:
+    """
+    Per-portfolio, per-section version counters.
+
+    Every mutating PortfolioService call bumps the counters of the sections it
+    touched with a single atomic $inc. Workers compare the ledger against the
+    versions they have already seen to find out which sections another worker
+    changed, without re-reading the sections themselves.
+    """
+    # Whether watch() is available; MongoDB still refuses change streams on standalone servers
+    supports_watch = True
+
+    def __init__(self, db):
+        self.collection = db.portfolio_versions
+        self._seen: Dict[str, Dict[str, int]] = {}
+
+    async def ensure_indexes(self):
+        await self.collection.create_indexes([
+            IndexModel([("portfolioId", ASCENDING)], unique = True),
+            IndexModel([("updatedAt", ASCENDING)]),
+        ])
+
+    async def bump(self, portfolio_id: str, sections: Iterable[str]) -> Dict[str, Any]:
+        """Atomically increment the version of the given sections"""
+        sections = list(sections)
+        doc = await self.collection.find_one_and_update(
+            {"portfolioId": portfolio_id},
+            {
+                "$inc": {**{f"sections.{section}": 1 for section in sections}, "version": 1},
+                "$currentDate": {"updatedAt": True},
+            },
+            projection = {"_id": 0},
+            upsert = True,
+            return_document = ReturnDocument.AFTER,
+        )
+        self._record_bump(portfolio_id, sections, doc)
+        return doc
+
+    def _record_bump(self, portfolio_id: str, sections: List[str], doc: Dict[str, Any]):
+        # Record our own bump as seen, unless another worker bumped the same
+        # section in between (then the watcher still has to invalidate it)
+        seen = self._seen.setdefault(portfolio_id, {})
+        for section in sections:
+            version = doc["sections"][section]
+            if seen.get(section) == version - 1:
+                seen[section] = version
+
+    def observe(self, doc: Dict[str, Any]) -> List[str]:
+        """Record a ledger document and return the sections that changed since last seen"""
+        seen = self._seen.setdefault(doc["portfolioId"], {})
+        changed = []
+        for section, version in doc.get("sections", {}).items():
+            if seen.get(section) != version:
+                seen[section] = version
+                changed.append(section)
+        return changed
+
+    async def changed_since(self, since: Optional[datetime]) -> List[Dict[str, Any]]:
+        """Ledger documents updated at or after `since` (served by the updatedAt index)"""
+        query = {"updatedAt": {"$gte": since}} if since is not None else {}
+        return await self.collection.find(query, {"_id": 0}).sort("updatedAt", ASCENDING).to_list(None)
+
+    async def latest_update(self) -> Optional[datetime]:
+        doc = await self.collection.find_one({}, {"_id": 0, "updatedAt": 1}, sort = [("updatedAt", DESCENDING)])
+        return doc["updatedAt"] if doc else None
+
+    def watch(self, pipeline: List[Dict[str, Any]]):
+        """Change stream over the ledger (replica sets only)"""
+        return self.collection.watch(pipeline, full_document = "updateLookup")
+
+class CoherenceWatcher:
+    """
+    Keeps a worker's in-memory data coherent with writes made by other workers.
+
+    Follows the ledger through a MongoDB change stream when the deployment
+    supports one (replica sets), and otherwise polls for ledger documents
+    updated since the last check. Either way only the sections whose version
+    moved are handed to `on_change`.
+    """
+    def __init__(self, ledger: VersionLedger, on_change: Callable[[str, List[str]], None], interval: float = 1.0):
+        self.ledger = ledger
+        self.on_change = on_change
+        self.interval = interval
+        self.mode: Optional[str] = None
+        self._since: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _apply(self, doc: Dict[str, Any]) -> bool:
+        changed = self.ledger.observe(doc)
+        if changed:
+            self.on_change(doc["portfolioId"], changed)
+        return bool(changed)
+
+    async def check(self) -> int:
+        """Poll the ledger once; returns the number of portfolios with changes"""
+        changed = 0
+        for doc in await self.ledger.changed_since(self._since):
+            if self._apply(doc):
+                changed += 1
+            # Documents arrive in updatedAt order; $gte re-reads the boundary
+            # document next time, which observe() then ignores
+            self._since = doc["updatedAt"]
+        return changed
+
+    async def _run(self):
+        try:
+            self._since = await self.ledger.latest_update()
+        except Exception as e:
+            logger.info(f"Could not read version ledger: {e}")
+        if not self.ledger.supports_watch:
+            logger.info(f"Version ledger has no change streams, polling it every {self.interval}s")
+            await self._poll_forever()
+            return
+        while True:
+            try:
+                await self._watch_changes()
+            except OperationFailure as e:
+                # Standalone servers do not support change streams
+                logger.info(f"Change streams unavailable ({getattr(e, 'code', e)}), polling version ledger every {self.interval}s")
+                await self._poll_forever()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Version ledger watch failed: {e}")
+                await asyncio.sleep(self.interval)
+
+    async def _watch_changes(self):
+        pipeline = [{"$match": {"operationType": {"$in": ["insert", "update", "replace"]}}}]
+        async with self.ledger.watch(pipeline) as stream:
+            self.mode = "change-stream"
+            async for change in stream:
+                if change.get("fullDocument"):
+                    self._apply(change["fullDocument"])
+
+    async def _poll_forever(self):
+        self.mode = "polling"
+        while True:
+            try:
+                await self.check()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Version ledger poll failed: {e}")
+            await asyncio.sleep(self.interval)
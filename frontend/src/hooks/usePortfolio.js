@@ -1,4 +1,4 @@
-import { useState, useEffect, useCallback } from 'react';
+import { useState, useEffect, useCallback, useRef } from 'react';
 import { PortfolioAPI, APIError } from '../services/api';
 import { ERROR_MESSAGES, CACHE_CONFIG } from '../utils/constants';
 
@@ -126,6 +126,51 @@ export const usePortfolio = () => {
     fetchPortfolio();
   }, [fetchPortfolio]);
 
+  /**
+   * Apply a change event to local state instead of refetching everything
+   */
+  const applyChange = useCallback((event) => {
+    const { op, section, id, document } = event;
+
+    // Events without a document only say "this changed"; refetch
+    if (!document && op !== 'delete') {
+      fetchPortfolio(true).catch(() => {});
+      return;
+    }
+
+    setPortfolioData(prev => {
+      if (!prev) return prev;
+      if (section === 'portfolio') {
+        return { ...prev, portfolio: document };
+      }
+
+      const items = prev[section] || [];
+      let next;
+      if (op === 'delete') {
+        next = items.filter(item => item.id !== id);
+      } else if (items.some(item => item.id === id)) {
+        next = items.map(item => (item.id === id ? document : item));
+      } else {
+        next = [...items, document];
+      }
+      next.sort((a, b) => a.order - b.order);
+      return { ...prev, [section]: next };
+    });
+    setLastFetched(Date.now());
+  }, [fetchPortfolio]);
+
+  // Live updates pushed by the backend. applyChange is recreated whenever the
+  // data changes, so the stream calls the latest one through a ref and is
+  // opened once per mount instead of after every fetch or event.
+  const applyChangeRef = useRef(applyChange);
+  useEffect(() => {
+    applyChangeRef.current = applyChange;
+  }, [applyChange]);
+
+  useEffect(() => {
+    return PortfolioAPI.subscribeToChanges((event) => applyChangeRef.current(event));
+  }, []);
+
   return {
     // Data
     portfolioData,
@@ -221,9 +221,22 @@ class PortfolioAPI {
   /**
    * Get all projects
    */
-  static async fetchProjects() {
+  static async fetchProjects({ technologies = [], featured } = {}) {
+    const params = new URLSearchParams();
+    technologies.forEach(technology => params.append('technology', technology));
+    if (featured !== undefined) params.set('featured', featured);
+    const query = params.toString();
     return this.withRetry(() =>
-      this.fetchWithTimeout(`${this.baseURL}/projects`)
+      this.fetchWithTimeout(`${this.baseURL}/projects${query ? `?${query}` : ''}`)
+    );
+  }
+
+  /**
+   * Get project counts per technology (for filter chips)
+   */
+  static async fetchProjectFacets() {
+    return this.withRetry(() =>
+      this.fetchWithTimeout(`${this.baseURL}/projects/facets`)
     );
   }
 
@@ -383,6 +396,28 @@ class PortfolioAPI {
     );
   }
 
+  // ========================
+  // Change Stream
+  // ========================
+
+  /**
+   * Subscribe to section-level change events (Server-Sent Events)
+   * Returns a function that closes the subscription
+   */
+  static subscribeToChanges(onEvent) {
+    if (typeof EventSource === 'undefined') {
+      return () => {};
+    }
+
+    const source = new EventSource(`${this.baseURL}/portfolio/stream`);
+    ['create', 'update', 'delete', 'reset', 'changed'].forEach(op => {
+      source.addEventListener(op, (message) => onEvent(JSON.parse(message.data)));
+    });
+    source.addEventListener('resync', () => onEvent({ op: 'resync' }));
+
+    return () => source.close();
+  }
+
   // ========================
   // Utility Methods
   // ========================
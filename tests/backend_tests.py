@@ -7,6 +7,7 @@ import requests
 import json
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from dotenv import load_dotenv
 from pathlib import Path
@@ -60,6 +61,128 @@ class PortfolioAPITester:
             self.log_result("API Health Check", False, f"API connection failed: {str(e)}")
             return False
     
+    def test_health_probes(self):
+        """Test GET /api/health/live and /api/health/ready"""
+        try:
+            live = requests.get(f"{self.base_url}/api/health/live", timeout = 10)
+            ready = requests.get(f"{self.base_url}/api/health/ready", timeout = 10)
+            if live.status_code != 200:
+                self.log_result("Health Probes", False, f"Liveness returned status {live.status_code}")
+                return False
+            if ready.status_code != 200:
+                self.log_result("Health Probes", False, f"Readiness returned status {ready.status_code}: {ready.text}")
+                return False
+            checks = ready.json().get('checks', {})
+            latencies = {name: check.get('latency_ms') for name, check in checks.items()}
+            self.log_result("Health Probes", True, f"Ready, probe latencies (ms): {latencies}")
+            return True
+        except Exception as e:
+            self.log_result("Health Probes", False, f"Request failed: {str(e)}")
+            return False
+    
+    def test_metrics(self):
+        """Test GET /api/metrics after a burst of concurrent portfolio reads"""
+        try:
+            with ThreadPoolExecutor(max_workers = 20) as pool:
+                statuses = list(pool.map(
+                    lambda _: requests.get(f"{self.base_url}/api/portfolio", timeout = 10).status_code, range(50)
+                ))
+            if any(status != 200 for status in statuses):
+                self.log_result("Metrics", False, f"Concurrent reads returned statuses {sorted(set(statuses))}")
+                return False
+            response = requests.get(f"{self.base_url}/api/metrics", timeout = 10)
+            if response.status_code != 200:
+                self.log_result("Metrics", False, f"Status code: {response.status_code}")
+                return False
+            flights = response.json().get('singleFlight', {})
+            if flights.get('calls') != flights.get('loads', 0) + flights.get('coalesced', 0):
+                self.log_result("Metrics", False, f"Inconsistent counters: {flights}")
+                return False
+            self.log_result("Metrics", True, f"Single-flight counters: {flights}")
+            return True
+        except Exception as e:
+            self.log_result("Metrics", False, f"Request failed: {str(e)}")
+            return False
+    
+    def test_pagination(self):
+        """Test that walking /api/projects page by page returns every project exactly once"""
+        try:
+            expected = requests.get(f"{self.base_url}/api/projects", timeout = 10).json()
+            seen, cursor, pages = [], None, 0
+            while True:
+                params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+                response = requests.get(f"{self.base_url}/api/projects", params = params, timeout = 10)
+                if response.status_code != 200:
+                    self.log_result("Pagination", False, f"Status code: {response.status_code}")
+                    return False
+                seen.extend(project['id'] for project in response.json())
+                pages += 1
+                cursor = response.headers.get('X-Next-Cursor')
+                if not cursor or pages > len(expected) + 1:
+                    break
+            if sorted(seen) != sorted(project['id'] for project in expected) or len(seen) != len(set(seen)):
+                self.log_result("Pagination", False, f"Pages returned {len(seen)} projects, expected {len(expected)}")
+                return False
+            invalid = requests.get(f"{self.base_url}/api/projects", params = {"cursor": "not-a-cursor"}, timeout = 10)
+            if invalid.status_code != 400:
+                self.log_result("Pagination", False, f"Invalid cursor returned {invalid.status_code}")
+                return False
+            self.log_result("Pagination", True, f"{len(seen)} projects in {pages} pages")
+            return True
+        except Exception as e:
+            self.log_result("Pagination", False, f"Request failed: {str(e)}")
+            return False
+    
+    def test_get_projects_by_id(self):
+        """Test GET /api/projects?ids=... and GET /api/projects/{id}"""
+        try:
+            projects = requests.get(f"{self.base_url}/api/projects", timeout = 10).json()
+            if not projects:
+                self.log_result("Projects By Id", False, "No projects to fetch")
+                return False
+            wanted = [project['id'] for project in reversed(projects)]
+            response = requests.get(f"{self.base_url}/api/projects", params = {"ids": ",".join(wanted + ["missing"])}, timeout = 10)
+            if response.status_code != 200 or [project['id'] for project in response.json()] != wanted:
+                self.log_result("Projects By Id", False, f"Multi-get did not return the requested order (status {response.status_code})")
+                return False
+            single = requests.get(f"{self.base_url}/api/projects/{wanted[0]}", timeout = 10)
+            missing = requests.get(f"{self.base_url}/api/projects/missing", timeout = 10)
+            if single.status_code != 200 or single.json().get('id') != wanted[0] or missing.status_code != 404:
+                self.log_result("Projects By Id", False, f"Single get returned {single.status_code}, missing id {missing.status_code}")
+                return False
+            self.log_result("Projects By Id", True, f"Fetched {len(wanted)} projects by id")
+            return True
+        except Exception as e:
+            self.log_result("Projects By Id", False, f"Request failed: {str(e)}")
+            return False
+    
+    def test_content_negotiation(self):
+        """Test that Accept: application/msgpack returns MessagePack (or JSON when the server lacks msgpack)"""
+        try:
+            response = requests.get(f"{self.base_url}/api/projects", headers = {"Accept": "application/msgpack"}, timeout = 10)
+            content_type = response.headers.get('content-type', '')
+            if response.status_code != 200 or 'Accept' not in response.headers.get('vary', ''):
+                self.log_result("Content Negotiation", False, f"Status code: {response.status_code}, Vary: {response.headers.get('vary')}")
+                return False
+            if content_type.startswith('application/msgpack'):
+                try:
+                    import msgpack
+                except ImportError:
+                    self.log_result("Content Negotiation", True, f"MessagePack response ({len(response.content)} bytes), not decoded")
+                    return True
+                projects = requests.get(f"{self.base_url}/api/projects", timeout = 10).json()
+                if msgpack.unpackb(response.content) != projects:
+                    self.log_result("Content Negotiation", False, "MessagePack and JSON responses differ")
+                    return False
+            elif not content_type.startswith('application/json'):
+                self.log_result("Content Negotiation", False, f"Unexpected content type: {content_type}")
+                return False
+            self.log_result("Content Negotiation", True, f"Served as {content_type} ({len(response.content)} bytes)")
+            return True
+        except Exception as e:
+            self.log_result("Content Negotiation", False, f"Request failed: {str(e)}")
+            return False
+    
     def test_get_portfolio(self):
         """Test GET /api/portfolio - Most important endpoint"""
         try:
@@ -247,6 +370,109 @@ class PortfolioAPITester:
             self.log_result("Export Data", False, f"Request failed: {str(e)}")
             return False
     
+    def test_get_changes(self):
+        """Test GET /api/portfolio/changes"""
+        try:
+            response = requests.get(f"{self.base_url}/api/portfolio/changes", params = {"since": "2000-01-01T00:00:00Z"}, timeout = 10)
+            if response.status_code != 200:
+                self.log_result("Delta Sync", False, f"Status code: {response.status_code}")
+                return False
+            data = response.json()
+            missing_keys = [key for key in ['until', 'skills', 'projects', 'deleted'] if key not in data]
+            if missing_keys:
+                self.log_result("Delta Sync", False, f"Missing keys in changes: {missing_keys}")
+                return False
+            self.log_result("Delta Sync", True, 
+                f"Changes since epoch: {len(data['projects'])} projects, {len(data['deleted'])} deletions, next since {data['until']}")
+            return True
+        except Exception as e:
+            self.log_result("Delta Sync", False, f"Request failed: {str(e)}")
+            return False
+    
+    def test_project_filters(self):
+        """Test GET /api/projects?technology= and GET /api/projects/facets"""
+        try:
+            response = requests.get(f"{self.base_url}/api/projects/facets", timeout = 10)
+            if response.status_code != 200:
+                self.log_result("Project Filters", False, f"Facets status code: {response.status_code}")
+                return False
+            facets = response.json()
+            if not facets['technologies']:
+                self.log_result("Project Filters", True, "No technologies to filter by")
+                return True
+            top = facets['technologies'][0]
+            filtered = requests.get(f"{self.base_url}/api/projects", params = {"technology": top['technology']}, timeout = 10).json()
+            if len(filtered) != top['count'] or any(top['technology'] not in p['technologies'] for p in filtered):
+                self.log_result("Project Filters", False, f"Filter by {top['technology']} returned {len(filtered)} projects, facet count {top['count']}")
+                return False
+            self.log_result("Project Filters", True, f"{facets['total']} projects, {top['count']} using {top['technology']}")
+            return True
+        except Exception as e:
+            self.log_result("Project Filters", False, f"Request failed: {str(e)}")
+            return False
+    
+    def test_related_projects(self):
+        """Test GET /api/projects/{id}/related"""
+        try:
+            projects = requests.get(f"{self.base_url}/api/projects", timeout = 10).json()
+            if not projects:
+                self.log_result("Related Projects", True, "No projects to compare")
+                return True
+            project_id = projects[0]['id']
+            response = requests.get(f"{self.base_url}/api/projects/{project_id}/related", params = {"k": 3}, timeout = 10)
+            if response.status_code != 200:
+                self.log_result("Related Projects", False, f"Status code: {response.status_code}")
+                return False
+            related = response.json()
+            if any(item['project']['id'] == project_id for item in related):
+                self.log_result("Related Projects", False, "Project was recommended for itself")
+                return False
+            self.log_result("Related Projects", True, f"{[(item['project']['title'], item['score']) for item in related]}")
+            return True
+        except Exception as e:
+            self.log_result("Related Projects", False, f"Request failed: {str(e)}")
+            return False
+    
+    def test_search(self):
+        """Test GET /api/search"""
+        try:
+            response = requests.get(f"{self.base_url}/api/search", params = {"q": "machine learning", "limit": 5}, timeout = 10)
+            if response.status_code != 200:
+                self.log_result("Search", False, f"Status code: {response.status_code}")
+                return False
+            hits = response.json().get('hits', [])
+            scores = [hit['score'] for hit in hits]
+            if scores != sorted(scores, reverse = True):
+                self.log_result("Search", False, "Hits are not ordered by score")
+                return False
+            bad_request = requests.get(f"{self.base_url}/api/search", params = {"q": "python", "section": "unknown"}, timeout = 10)
+            if bad_request.status_code != 400:
+                self.log_result("Search", False, f"Unknown section returned {bad_request.status_code}, expected 400")
+                return False
+            self.log_result("Search", True, f"{len(hits)} ranked hits: {[hit['section'] for hit in hits]}")
+            return True
+        except Exception as e:
+            self.log_result("Search", False, f"Request failed: {str(e)}")
+            return False
+    
+    def test_autocomplete(self):
+        """Test GET /api/autocomplete"""
+        try:
+            response = requests.get(f"{self.base_url}/api/autocomplete", params = {"prefix": "py"}, timeout = 10)
+            if response.status_code != 200:
+                self.log_result("Autocomplete", False, f"Status code: {response.status_code}")
+                return False
+            suggestions = response.json()
+            wrong = [s['value'] for s in suggestions if not s['value'].lower().startswith("py")]
+            if wrong:
+                self.log_result("Autocomplete", False, f"Suggestions without the prefix: {wrong}")
+                return False
+            self.log_result("Autocomplete", True, f"Suggestions for 'py': {[s['value'] for s in suggestions]}")
+            return True
+        except Exception as e:
+            self.log_result("Autocomplete", False, f"Request failed: {str(e)}")
+            return False
+    
     def test_update_personal_info(self):
         """Test PUT /api/portfolio/personal"""
         try:
@@ -362,11 +588,21 @@ class PortfolioAPITester:
                 timeout = 10
             )
             
-            if response.status_code == 200:
-                self.log_result("Update Project", True, f"Project {project_id} updated successfully")
+            if response.status_code != 200:
+                self.log_result("Update Project", False, f"Status code: {response.status_code}")
+                return False
+
+            # Sending the same values again must not count as a write
+            repeat = requests.put(
+                f"{self.base_url}/api/projects/{project_id}",
+                json = update_data,
+                timeout = 10
+            )
+            if repeat.status_code == 200 and repeat.json().get("status") == "unchanged":
+                self.log_result("Update Project", True, f"Project {project_id} updated successfully; repeat reported unchanged")
                 return True
             else:
-                self.log_result("Update Project", False, f"Status code: {response.status_code}")
+                self.log_result("Update Project", False, f"Repeated update: {repeat.status_code} {repeat.text}")
                 return False
         except Exception as e:
             self.log_result("Update Project", False, f"Request failed: {str(e)}")
@@ -474,6 +710,7 @@ class PortfolioAPITester:
         if not self.test_api_health():
             print("❌ API health check failed. Stopping tests.")
             return False
+        self.test_health_probes()
         
         # Core GET endpoint tests
         self.test_get_portfolio()
@@ -483,6 +720,15 @@ class PortfolioAPITester:
         self.test_get_achievements()
         self.test_get_publications()
         self.test_get_export()
+        self.test_get_changes()
+        self.test_project_filters()
+        self.test_pagination()
+        self.test_get_projects_by_id()
+        self.test_related_projects()
+        self.test_search()
+        self.test_autocomplete()
+        self.test_metrics()
+        self.test_content_negotiation()
         
         # Data migration verification
         self.test_data_migration_verification()
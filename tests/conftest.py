@@ -0,0 +1,73 @@
+"""
+Shared fixtures for the in-process tests (python -m pytest tests)
+
+The backend tests in backend_tests.py and friends run against a live server;
+the test_*.py modules here call the services directly. Storage-level tests run
+on the embedded SQLite backend, and on MongoDB as well when TEST_MONGO_URI is
+set (or, failing that, when mongomock-motor is installed).
+"""
+import os
+import sys
+import uuid
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from services.seed_loader import load_seed_file
+
+try:
+    import mongomock_motor
+except ImportError:
+    mongomock_motor = None
+
+TEST_MONGO_URI = os.environ.get("TEST_MONGO_URI")
+
+MOCK_DATA_PATH = BACKEND_DIR / "data" / "mock.example.js"
+
+STORAGE_BACKENDS = ["sqlite"] + (["mongo"] if TEST_MONGO_URI or mongomock_motor is not None else [])
+
+@pytest.fixture
+def mock_data():
+    """The example seed data, in mock.js shape"""
+    return load_seed_file(MOCK_DATA_PATH)
+
+@pytest.fixture(params = STORAGE_BACKENDS)
+def open_storage(request, tmp_path):
+    """
+    Factory for the StorageBackend under test. Call it inside the test's event
+    loop; calls with the same name share one database (as two workers would).
+    """
+    from services.sqlite_storage import SqliteStorage
+    from services.storage import MongoStorage
+
+    opened = []
+    database_names = {}
+    clients = {}
+
+    def factory(name: str = "portfolio"):
+        if request.param == "sqlite":
+            storage = SqliteStorage(tmp_path / f"{name}.db")
+        else:
+            database_name = database_names.setdefault(name, f"test_{uuid.uuid4().hex[:12]}")
+            if TEST_MONGO_URI:
+                from motor.motor_asyncio import AsyncIOMotorClient
+                client = AsyncIOMotorClient(TEST_MONGO_URI)
+            else:
+                # One in-memory client per test, so same-named databases share data
+                client = clients.setdefault("mock", mongomock_motor.AsyncMongoMockClient())
+            storage = MongoStorage(client[database_name])
+        opened.append(storage)
+        return storage
+
+    factory.backend = request.param
+    yield factory
+    for storage in opened:
+        storage.close()
+    if TEST_MONGO_URI and database_names:
+        from pymongo import MongoClient
+        with MongoClient(TEST_MONGO_URI) as client:
+            for database_name in database_names.values():
+                client.drop_database(database_name)
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Concurrent Load Testing for the Portfolio Backend
+Replays the PortfolioAPITester scenarios with configurable concurrency and request mix
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from dotenv import load_dotenv
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+ROOT_DIR = Path(__file__).parent
+BACKEND_DIR = ROOT_DIR.parent / 'backend'
+load_dotenv(ROOT_DIR / '.env')
+
+# Get backend URL from environment
+BACKEND_URL = os.environ.get('BACKEND_URL', 'http://localhost:8000')
+
+# Scenario weights per request mix (scenario name -> relative weight)
+REQUEST_MIXES = {
+    'read-only': {
+        'health': 1, 'portfolio': 10, 'skills': 2, 'experience': 2,
+        'projects': 2, 'achievements': 1, 'publications': 1, 'export': 1,
+    },
+    'read-heavy': {
+        'health': 1, 'portfolio': 10, 'skills': 2, 'experience': 2,
+        'projects': 2, 'achievements': 1, 'publications': 1, 'export': 1,
+        'update_about': 1, 'project_lifecycle': 1,
+    },
+    'admin-write': {
+        'portfolio': 4, 'projects': 2, 'skills': 1,
+        'update_personal': 2, 'update_about': 2, 'project_lifecycle': 3,
+    },
+}
+
+class LoadStats:
+    """Collects per-request latencies, statuses and errors"""
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = Counter()
+        self.errors = Counter()
+        self.started = None
+        self.finished = None
+
+    def record(self, name: str, latency: float, status: Optional[int] = None, error: Optional[str] = None):
+        self.latencies[name].append(latency)
+        if status is not None:
+            self.statuses[status] += 1
+        if error is not None:
+            self.errors[f"{name}: {error}"] += 1
+
+    @staticmethod
+    def percentile(values: List[float], pct: float) -> float:
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+    def summary(self) -> Dict:
+        elapsed = (self.finished or time.perf_counter()) - (self.started or time.perf_counter())
+        total = sum(len(values) for values in self.latencies.values())
+        failed = sum(self.errors.values())
+        endpoints = {}
+        for name, values in sorted(self.latencies.items()):
+            endpoints[name] = {
+                'count': len(values),
+                'p50_ms': round(self.percentile(values, 50) * 1000, 2),
+                'p90_ms': round(self.percentile(values, 90) * 1000, 2),
+                'p99_ms': round(self.percentile(values, 99) * 1000, 2),
+                'max_ms': round(max(values) * 1000, 2),
+            }
+        return {
+            'duration_s': round(elapsed, 2),
+            'requests': total,
+            'errors': failed,
+            'error_rate': round(failed / total, 4) if total else 0.0,
+            'throughput_rps': round(total / elapsed, 2) if elapsed > 0 else 0.0,
+            'statuses': dict(self.statuses),
+            'endpoints': endpoints,
+            'error_samples': dict(self.errors.most_common(10)),
+        }
+
+class PortfolioLoadTester:
+    def __init__(self, base_url: str = BACKEND_URL, mix: str = 'read-heavy', timeout: float = 10):
+        self.base_url = base_url
+        self.mix = REQUEST_MIXES[mix]
+        self.timeout = timeout
+        self.scenarios: Dict[str, Callable[[httpx.AsyncClient, LoadStats], Awaitable[None]]] = {
+            'health': self.scenario_health,
+            'portfolio': self.scenario_get('portfolio', '/api/portfolio'),
+            'skills': self.scenario_get('skills', '/api/skills'),
+            'experience': self.scenario_get('experience', '/api/experience'),
+            'projects': self.scenario_get('projects', '/api/projects'),
+            'achievements': self.scenario_get('achievements', '/api/achievements'),
+            'publications': self.scenario_get('publications', '/api/publications'),
+            'export': self.scenario_get('export', '/api/export'),
+            'update_personal': self.scenario_update_personal,
+            'update_about': self.scenario_update_about,
+            'project_lifecycle': self.scenario_project_lifecycle,
+        }
+
+    async def timed(self, client: httpx.AsyncClient, stats: LoadStats, name: str, method: str, path: str, **kwargs) -> Optional[httpx.Response]:
+        """Issue one request and record its latency and outcome"""
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, f"{self.base_url}{path}", **kwargs)
+        except Exception as e:
+            stats.record(name, time.perf_counter() - start, error = type(e).__name__)
+            return None
+        error = None if response.status_code < 400 else f"HTTP {response.status_code}"
+        stats.record(name, time.perf_counter() - start, response.status_code, error)
+        return response
+
+    async def scenario_health(self, client: httpx.AsyncClient, stats: LoadStats):
+        """Mirror of PortfolioAPITester.test_api_health"""
+        await self.timed(client, stats, 'GET /api', 'GET', '/api/')
+
+    def scenario_get(self, name: str, path: str):
+        """Mirror of the PortfolioAPITester.test_get_* read checks"""
+        async def run(client: httpx.AsyncClient, stats: LoadStats):
+            await self.timed(client, stats, f"GET {path}", 'GET', path)
+        run.__name__ = f"scenario_{name}"
+        return run
+
+    async def scenario_update_personal(self, client: httpx.AsyncClient, stats: LoadStats):
+        """Mirror of PortfolioAPITester.test_update_personal_info"""
+        update_data = {"tagline": "AI/ML Specialist • Data Scientist • Machine Learning Engineer (Updated)"}
+        await self.timed(client, stats, 'PUT /api/portfolio/personal', 'PUT', '/api/portfolio/personal', json = update_data)
+
+    async def scenario_update_about(self, client: httpx.AsyncClient, stats: LoadStats):
+        """Mirror of PortfolioAPITester.test_update_about_section"""
+        update_data = {
+            "description": "AI/ML specialist with a strong foundation in data science and machine learning engineering. Updated description for testing purposes."
+        }
+        await self.timed(client, stats, 'PUT /api/portfolio/about', 'PUT', '/api/portfolio/about', json = update_data)
+
+    async def scenario_project_lifecycle(self, client: httpx.AsyncClient, stats: LoadStats):
+        """Mirror of the create/update/delete project tests"""
+        project_data = {
+            "title": "Load Test Project",
+            "description": "Temporary project created by the load tester.",
+            "technologies": ["Python", "FastAPI", "MongoDB", "Testing"],
+            "github": "https://github.com/test/test-project",
+            "demo": "https://test-demo.com",
+            "featured": False,
+            "placeholder": True,
+            "order": 999
+        }
+        response = await self.timed(client, stats, 'POST /api/projects', 'POST', '/api/projects', json = project_data)
+        if response is None or response.status_code != 200:
+            return
+        project_id = response.json().get('id')
+        update_data = {"title": "Updated Load Test Project", "description": "Updated by the load tester."}
+        await self.timed(client, stats, 'PUT /api/projects/{id}', 'PUT', f"/api/projects/{project_id}", json = update_data)
+        await self.timed(client, stats, 'DELETE /api/projects/{id}', 'DELETE', f"/api/projects/{project_id}")
+
+    async def worker(self, client: httpx.AsyncClient, stats: LoadStats, deadline: float, delay: float):
+        """Run randomly chosen scenarios until the deadline"""
+        await asyncio.sleep(delay)
+        names = list(self.mix.keys())
+        weights = list(self.mix.values())
+        while time.perf_counter() < deadline:
+            name = random.choices(names, weights = weights)[0]
+            await self.scenarios[name](client, stats)
+
+    async def run(self, concurrency: int, duration: float, ramp_up: float = 0) -> LoadStats:
+        """Run the load test with `concurrency` virtual users for `duration` seconds"""
+        stats = LoadStats()
+        limits = httpx.Limits(max_connections = concurrency, max_keepalive_connections = concurrency)
+        async with httpx.AsyncClient(timeout = self.timeout, limits = limits) as client:
+            stats.started = time.perf_counter()
+            deadline = stats.started + ramp_up + duration
+            # Start virtual users linearly over the ramp-up period
+            workers = [
+                self.worker(client, stats, deadline, ramp_up * i / concurrency)
+                for i in range(concurrency)
+            ]
+            await asyncio.gather(*workers)
+            stats.finished = time.perf_counter()
+        return stats
+
+def start_local_server(port: int) -> subprocess.Popen:
+    """Start the backend with uvicorn and wait until it answers"""
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'server:app', '--host', '127.0.0.1', '--port', str(port), '--log-level', 'warning'],
+        cwd = BACKEND_DIR,
+    )
+    url = f"http://127.0.0.1:{port}/api/"
+    for _ in range(100):
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            if httpx.get(url, timeout = 1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("Server did not become ready in time")
+
+def print_report(concurrency: int, summary: Dict):
+    """Print a latency/throughput/error report"""
+    print("\n" + "=" * 60)
+    print(f"📊 LOAD REPORT - concurrency {concurrency}")
+    print("=" * 60)
+    print(f"Duration: {summary['duration_s']}s  Requests: {summary['requests']}  "
+          f"Throughput: {summary['throughput_rps']} req/s  Error rate: {summary['error_rate']:.2%}")
+    print(f"{'endpoint':<32}{'count':>8}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}")
+    for name, row in summary['endpoints'].items():
+        print(f"{name:<32}{row['count']:>8}{row['p50_ms']:>10}{row['p90_ms']:>10}{row['p99_ms']:>10}{row['max_ms']:>10}")
+    if summary['error_samples']:
+        print("\n🔍 ERRORS:")
+        for error, count in summary['error_samples'].items():
+            print(f"   • {error} x{count}")
+
+def main():
+    """Main load test execution"""
+    parser = argparse.ArgumentParser(description = "Concurrent load tests for the Portfolio API")
+    parser.add_argument('--url', default = BACKEND_URL, help = "Base URL of the backend")
+    parser.add_argument('--concurrency', default = '16', help = "Virtual users, or a comma-separated list to step through")
+    parser.add_argument('--duration', type = float, default = 30, help = "Seconds of steady load per step")
+    parser.add_argument('--ramp-up', type = float, default = 5, help = "Seconds over which virtual users are started")
+    parser.add_argument('--mix', choices = sorted(REQUEST_MIXES), default = 'read-heavy', help = "Request mix")
+    parser.add_argument('--timeout', type = float, default = 10, help = "Per-request timeout in seconds")
+    parser.add_argument('--start-server', action = 'store_true', help = "Start a local uvicorn server for the run")
+    parser.add_argument('--port', type = int, default = 8765, help = "Port for --start-server")
+    parser.add_argument('--output', help = "Write the JSON report to this file")
+    args = parser.parse_args()
+
+    base_url = args.url
+    server = None
+    if args.start_server:
+        server = start_local_server(args.port)
+        base_url = f"http://127.0.0.1:{args.port}"
+
+    print("🚀 Starting Portfolio Backend Load Tests")
+    print(f"Testing against: {base_url} (mix: {args.mix})")
+
+    results = []
+    try:
+        tester = PortfolioLoadTester(base_url, args.mix, args.timeout)
+        for concurrency in [int(level) for level in args.concurrency.split(',')]:
+            stats = asyncio.run(tester.run(concurrency, args.duration, args.ramp_up))
+            summary = stats.summary()
+            print_report(concurrency, summary)
+            results.append({'concurrency': concurrency, **summary})
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    # Saturation shows up as throughput flattening while p99 keeps growing
+    if len(results) > 1:
+        print("\n" + "=" * 60)
+        print("📈 SATURATION SUMMARY")
+        print("=" * 60)
+        for result in results:
+            worst_p99 = max((row['p99_ms'] for row in result['endpoints'].values()), default = 0)
+            print(f"concurrency {result['concurrency']:>5}: {result['throughput_rps']:>10} req/s, "
+                  f"worst p99 {worst_p99} ms, error rate {result['error_rate']:.2%}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'url': base_url, 'mix': args.mix, 'results': results}, f, indent = 2)
+        print(f"\n📝 Detailed results saved to: {args.output}")
+
+if __name__ == "__main__":
+    main()
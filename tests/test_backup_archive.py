@@ -0,0 +1,132 @@
+"""Snapshot archives: dump, verify and restore round trip, and corruption checks"""
+import asyncio
+import os
+import uuid
+from datetime import datetime
+
+import bson
+import pytest
+from bson.raw_bson import RawBSONDocument
+
+from services.backup_archive import CHUNK_HEADER, MAGIC, ArchiveError, restore_snapshot, verify_snapshot, write_snapshot
+
+TEST_MONGO_URI = os.environ.get("TEST_MONGO_URI")
+
+class MemoryCollection:
+    """
+    The slice of a raw-BSON Motor collection the archive uses, kept in memory.
+    mongomock cannot return raw BSON, so MongoDB itself is only used when
+    TEST_MONGO_URI is set.
+    """
+    def __init__(self):
+        self.documents = []
+
+    def with_options(self, codec_options):
+        return self
+
+    async def find(self):
+        for raw in self.documents:
+            yield RawBSONDocument(raw)
+
+    async def insert_many(self, documents, ordered = True):
+        self.documents.extend(document.raw if isinstance(document, RawBSONDocument) else bson.encode(document)
+                              for document in documents)
+
+    async def drop(self):
+        self.documents = []
+
+    async def estimated_document_count(self):
+        return len(self.documents)
+
+    def to_list(self):
+        return [bson.decode(raw) for raw in self.documents]
+
+async def read_all(collection):
+    if isinstance(collection, MemoryCollection):
+        return collection.to_list()
+    return await collection.find().sort("_id", 1).to_list(None)
+
+@pytest.fixture(params = ["memory"] + (["mongo"] if TEST_MONGO_URI else []))
+def database(request):
+    """Factory for named, initially empty collection maps, one database per call"""
+    if request.param == "memory":
+        yield lambda *names: {name: MemoryCollection() for name in names}
+        return
+
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from pymongo import MongoClient
+    database_names = []
+
+    def factory(*names):
+        database_names.append(f"test_{uuid.uuid4().hex[:12]}")
+        db = AsyncIOMotorClient(TEST_MONGO_URI)[database_names[-1]]
+        return {name: db[name] for name in names}
+
+    yield factory
+    with MongoClient(TEST_MONGO_URI) as client:
+        for name in database_names:
+            client.drop_database(name)
+
+def sample_documents(section, count):
+    stamp = datetime(2024, 5, 1, 12, 30)
+    return [{"_id": f"{section}-{i:03}", "id": f"{section}-{i}", "portfolioId": "default", "order": i,
+             "title": f"{section} {i}", "tags": ["a", "b"], "updatedAt": stamp} for i in range(count)]
+
+def test_snapshot_verify_and_restore_into_empty_database(tmp_path, database):
+    path = tmp_path / "backup.pfsnap"
+
+    async def scenario():
+        source = database("projects", "skills", "empty")
+        for name, count in (("projects", 40), ("skills", 3)):
+            await source[name].insert_many(sample_documents(name, count))
+
+        # Small chunks, so collections span several of them
+        written = await write_snapshot(path, source, chunk_bytes = 1024)
+        assert written["projects"]["documents"] == 40 and written["projects"]["chunks"] > 1
+        assert written["empty"] == {"documents": 0, "chunks": 0, "bytes": 0}
+        assert not path.with_name(path.name + ".partial").exists()
+        assert verify_snapshot(path) == {
+            name: {"documents": counts["documents"], "chunks": counts["chunks"]}
+            for name, counts in written.items() if counts["chunks"]
+        }
+
+        target = database("projects", "skills", "empty")
+        restored = await restore_snapshot(path, target, batch_size = 7)
+        assert restored == {"projects": {"documents": 40}, "skills": {"documents": 3}}
+        for name in ("projects", "skills"):
+            assert await read_all(target[name]) == await read_all(source[name])
+
+        # A second restore needs drop
+        with pytest.raises(ArchiveError, match = "not empty"):
+            await restore_snapshot(path, target)
+        assert (await restore_snapshot(path, target, drop = True))["projects"] == {"documents": 40}
+
+    asyncio.run(scenario())
+
+def test_corrupted_chunk_is_rejected_before_restoring(tmp_path, database):
+    path = tmp_path / "backup.pfsnap"
+
+    async def scenario():
+        source = database("projects")
+        await source["projects"].insert_many(sample_documents("projects", 10))
+        await write_snapshot(path, source)
+
+        data = bytearray(path.read_bytes())
+        # Flip a byte in the first chunk's compressed payload
+        data[len(MAGIC) + CHUNK_HEADER.size + len("projects") + 5] ^= 0xFF
+        corrupted = tmp_path / "corrupted.pfsnap"
+        corrupted.write_bytes(bytes(data))
+        with pytest.raises(ArchiveError, match = r"Checksum mismatch in chunk 0 \(projects\)"):
+            verify_snapshot(corrupted)
+
+        truncated = tmp_path / "truncated.pfsnap"
+        truncated.write_bytes(path.read_bytes()[:-10])
+        with pytest.raises(ArchiveError, match = "truncated"):
+            verify_snapshot(truncated)
+
+        target = database("projects")
+        with pytest.raises(ArchiveError):
+            await restore_snapshot(corrupted, target)
+        assert await read_all(target["projects"]) == []
+
+    asyncio.run(scenario())
@@ -0,0 +1,61 @@
+"""Cache coherence across workers through the version ledger (polling path)"""
+import asyncio
+
+from models.portfolio import ProjectUpdate
+from services.portfolio_cache import PortfolioCache
+from services.portfolio_service import PortfolioService
+from services.sqlite_storage import SqliteStorage
+from services.version_ledger import CoherenceWatcher
+
+def test_bump_by_one_worker_invalidates_another_workers_cache(open_storage, mock_data):
+    async def scenario():
+        # Two workers sharing one database, each with its own cache
+        reader = PortfolioService(open_storage("shared"), cache = PortfolioCache(max_weight = 1000, tenant_quota = 1000))
+        writer = PortfolioService(open_storage("shared"), cache = PortfolioCache(max_weight = 1000, tenant_quota = 1000))
+        await reader.ensure_indexes()
+        await writer.migrate_mock_data(mock_data)
+
+        watcher = CoherenceWatcher(reader.ledger, reader.on_remote_change)
+        await watcher.check()
+        project = (await reader.get_projects())[0]
+        skills = await reader.get_skills()
+
+        await writer.update_project(project.id, ProjectUpdate(title = "Changed elsewhere"))
+        # Still the cached copy until the ledger is polled
+        assert (await reader.get_projects())[0].title == project.title
+
+        assert await watcher.check() == 1
+        assert (await reader.get_projects())[0].title == "Changed elsewhere"
+        # Only the bumped section was dropped
+        assert reader.cache.get("default", "skills") == skills
+        # Nothing new on the next poll
+        assert await watcher.check() == 0
+
+    asyncio.run(scenario())
+
+def test_watcher_polls_ledgers_without_change_streams(tmp_path, mock_data):
+    async def scenario():
+        reader = PortfolioService(SqliteStorage(tmp_path / "shared.db"), cache = PortfolioCache(max_weight = 1000, tenant_quota = 1000))
+        writer = PortfolioService(SqliteStorage(tmp_path / "shared.db"))
+        await writer.migrate_mock_data(mock_data)
+
+        assert not reader.ledger.supports_watch
+        watcher = CoherenceWatcher(reader.ledger, reader.on_remote_change, interval = 0.01)
+        watcher.start()
+        try:
+            await asyncio.sleep(0.05)
+            assert watcher.mode == "polling"
+            project = (await reader.get_projects())[0]
+            assert reader.cache.get("default", "projects") is not None
+            await writer.update_project(project.id, ProjectUpdate(title = "Polled"))
+            for _ in range(100):
+                if reader.cache.get("default", "projects") is None:
+                    break
+                await asyncio.sleep(0.01)
+            assert (await reader.get_projects())[0].title == "Polled"
+        finally:
+            await watcher.stop()
+        reader.storage.close()
+        writer.storage.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,76 @@
+"""Change events fanned out by the broker and the /portfolio/stream SSE route"""
+import asyncio
+import json
+from types import SimpleNamespace
+
+from starlette.requests import Request
+
+from models.portfolio import ChangeEvent, ProjectUpdate
+from routes.portfolio_routes import stream_portfolio_changes
+from services.change_broker import ChangeBroker
+from services.portfolio_service import PortfolioService
+from services.sqlite_storage import SqliteStorage
+
+def parse_frame(frame: bytes) -> dict:
+    fields = dict(line.split(": ", 1) for line in frame.decode().strip().split("\n"))
+    return {**fields, "data": json.loads(fields["data"])}
+
+def test_broker_sends_one_frame_per_subscriber_of_the_portfolio():
+    async def scenario():
+        broker = ChangeBroker()
+        first, second, other = broker.subscribe("default"), broker.subscribe("default"), broker.subscribe("other")
+        broker.publish(ChangeEvent(portfolioId = "default", section = "skills", op = "changed", version = 7))
+
+        frame = first.queue.get_nowait()
+        assert second.queue.get_nowait() is frame
+        assert other.queue.empty()
+        assert parse_frame(frame)["id"] == "7"
+        assert parse_frame(frame)["event"] == "changed"
+
+        broker.unsubscribe(first)
+        assert broker.subscriber_count("default") == 1
+
+    asyncio.run(scenario())
+
+def test_lagging_subscriber_is_told_to_resync():
+    async def scenario():
+        broker = ChangeBroker(max_queue = 1)
+        stream = broker.stream("default")
+        assert await anext(stream) == b"retry: 3000\n\n"
+        for _ in range(3):
+            broker.publish(ChangeEvent(portfolioId = "default", section = "skills", op = "changed"))
+        # The queued frame is dropped along with the overflow; the client must refetch
+        assert (await anext(stream)).startswith(b"event: resync\n")
+        await stream.aclose()
+        assert broker.subscriber_count() == 0
+
+    asyncio.run(scenario())
+
+def test_write_reaches_stream_subscriber(tmp_path, mock_data):
+    async def scenario():
+        broker = ChangeBroker()
+        service = PortfolioService(SqliteStorage(tmp_path / "portfolio.db"), listeners = [broker.publish])
+        await service.migrate_mock_data(mock_data)
+        project = (await service.get_projects())[0]
+
+        request = Request({"type": "http", "app": SimpleNamespace(change_broker = broker), "path_params": {}})
+        response = await stream_portfolio_changes(request, "default")
+        assert response.media_type == "text/event-stream"
+        stream = response.body_iterator
+        assert await anext(stream) == b"retry: 3000\n\n"
+        assert broker.subscriber_count("default") == 1
+
+        await service.update_project(project.id, ProjectUpdate(title = "Streamed"))
+        frame = parse_frame(await asyncio.wait_for(anext(stream), timeout = 1))
+        assert frame["event"] == "update"
+        assert frame["data"]["section"] == "projects"
+        assert frame["data"]["id"] == project.id
+        assert frame["data"]["document"]["title"] == "Streamed"
+        assert int(frame["id"]) == frame["data"]["version"]
+
+        # Disconnecting the client removes its subscription
+        await stream.aclose()
+        assert broker.subscriber_count() == 0
+        service.storage.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,35 @@
+"""Delta sync through get_changes"""
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+from models.portfolio import ProjectUpdate
+from services.portfolio_service import PortfolioService
+
+def test_changes_since_naive_timestamp_is_read_as_utc(open_storage, mock_data):
+    async def scenario():
+        service = PortfolioService(open_storage())
+        await service.ensure_indexes()
+        await service.migrate_mock_data(mock_data)
+        first, second = (await service.get_projects())[:2]
+        await service.update_project(first.id, ProjectUpdate(title = "Changed"))
+        await service.delete_project(second.id)
+
+        # As FastAPI parses ?since=2000-01-01T00:00:00
+        changes = await service.get_changes(datetime(2000, 1, 1))
+        assert changes.since == datetime(2000, 1, 1, tzinfo = timezone.utc)
+        assert [tombstone.id for tombstone in changes.deleted] == [second.id]
+        assert "Changed" in [project.title for project in changes.projects]
+
+        # until and the tombstone timestamps are all UTC and serialised alike
+        body = json.loads(changes.model_dump_json())
+        for stamp in [body["since"], body["until"], *(tombstone["updatedAt"] for tombstone in body["deleted"])]:
+            assert stamp.endswith("Z")
+
+        # The same instant with or without an offset gives the same result
+        later = datetime.now(timezone.utc) + timedelta(hours = 1)
+        naive = await service.get_changes(later.replace(tzinfo = None))
+        assert naive == await service.get_changes(later)
+        assert naive.deleted == [] and naive.projects == []
+
+    asyncio.run(scenario())
@@ -0,0 +1,86 @@
+"""Serving reads while the database is down: circuit breaker and last-known-good copies"""
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+from pymongo.errors import ConnectionFailure
+
+from routes.portfolio_routes import database_unavailable_handler, router
+from services import circuit_breaker
+from services.circuit_breaker import CircuitBreaker, DatabaseUnavailable
+from services.fallback_store import FallbackStore, StalenessMiddleware
+from services.portfolio_service import CACHED_TYPES, PortfolioService
+from services.sqlite_storage import SqliteStorage
+
+class Clock:
+    """Stands in for the breaker module's time, so the reset timeout can pass on demand"""
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+def test_breaker_opens_serves_last_known_good_then_recovers(tmp_path, mock_data, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(circuit_breaker, "time", clock)
+
+    async def scenario():
+        storage = SqliteStorage(tmp_path / "portfolio.db")
+        breaker = CircuitBreaker(failure_threshold = 2, reset_timeout = 30, latency_budget = 5)
+        service = PortfolioService(storage, breaker = breaker, fallback = FallbackStore(tmp_path / "fallback", CACHED_TYPES))
+        await service.migrate_mock_data(mock_data)
+        app = FastAPI()
+        app.include_router(router, prefix = "/api")
+        app.add_exception_handler(DatabaseUnavailable, database_unavailable_handler)
+        app.add_middleware(StalenessMiddleware)
+        app.portfolio_service = service
+
+        # The database goes down whenever `down` is set
+        down = False
+        find_items = storage.find_items
+        async def failing_find_items(*args, **kwargs):
+            if down:
+                raise ConnectionFailure("connection refused")
+            return await find_items(*args, **kwargs)
+        storage.find_items = failing_find_items
+
+        async with httpx.AsyncClient(transport = httpx.ASGITransport(app = app), base_url = "http://test") as client:
+            healthy = await client.get("/api/projects")
+            assert healthy.status_code == 200 and "x-data-source" not in healthy.headers
+            await service.drain()
+
+            down = True
+            for _ in range(breaker.failure_threshold):
+                response = await client.get("/api/projects")
+                assert response.status_code == 200
+                assert response.json() == healthy.json()
+                assert response.headers["x-data-source"] == "last-known-good"
+                assert "x-data-saved-at" in response.headers and int(response.headers["age"]) >= 0
+            assert breaker.state == "open"
+
+            # Open: rejected without touching the database, still served from disk
+            response = await client.get("/api/projects")
+            assert response.headers["x-data-source"] == "last-known-good"
+            assert breaker.rejected == 1
+            # No copy on disk: 503 with a retry hint
+            (tmp_path / "fallback" / "default" / "skills.json").unlink()
+            response = await client.get("/api/skills")
+            assert response.status_code == 503 and "retry-after" in response.headers
+
+            # After the reset timeout a failed trial keeps the circuit open
+            clock.now += 31
+            assert breaker.state == "half-open"
+            assert (await client.get("/api/projects")).headers["x-data-source"] == "last-known-good"
+            assert breaker.state == "open"
+
+            # ... and a successful one closes it
+            down = False
+            clock.now += 31
+            assert breaker.state == "half-open"
+            recovered = await client.get("/api/projects")
+            assert recovered.status_code == 200 and "x-data-source" not in recovered.headers
+            assert breaker.state == "closed" and breaker.failures == 0
+        await service.drain()
+        storage.close()
+
+    asyncio.run(scenario())
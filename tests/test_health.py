@@ -0,0 +1,32 @@
+"""Readiness from the background database pings"""
+import asyncio
+
+from services.health import HealthMonitor
+
+class Database:
+    def __init__(self, ok):
+        self.ok = ok
+
+    async def command(self, name):
+        if not self.ok:
+            raise ConnectionError("connection refused")
+        return {"ok": 1}
+
+def test_optional_database_is_reported_but_does_not_gate_readiness():
+    async def scenario():
+        storage, status_db = Database(True), Database(False)
+        monitor = HealthMonitor({"database": storage, "status_db": status_db}, optional = ["status_db"])
+        await monitor.probe()
+        readiness = monitor.readiness()
+        assert readiness["status"] == "ready"
+        assert readiness["checks"]["status_db"]["ok"] is False and readiness["checks"]["status_db"]["required"] is False
+
+        storage.ok = False
+        await monitor.probe()
+        assert monitor.readiness()["status"] == "not ready"
+
+        required = HealthMonitor({"database": Database(True), "status_db": status_db})
+        await required.probe()
+        assert required.readiness()["status"] == "not ready"
+
+    asyncio.run(scenario())
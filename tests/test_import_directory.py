@@ -0,0 +1,43 @@
+"""Importing a directory of seed files through the parser process pool"""
+import asyncio
+import json
+import logging
+
+from migrate_data import import_directory
+from services.portfolio_service import PortfolioService
+from services.seed_loader import iter_mock_items
+from services.sqlite_storage import SqliteStorage
+
+def test_bad_files_are_reported_without_aborting_the_others(tmp_path, mock_data, caplog):
+    seeds = tmp_path / "seeds"
+    seeds.mkdir()
+    lines = [json.dumps({"section": section, **item}) for section, item in iter_mock_items(mock_data)]
+    (seeds / "alice.json").write_text(json.dumps(mock_data))
+    (seeds / "bob.ndjson").write_text("\n".join(lines))
+    (seeds / "carol.js").write_text("export const mockData = " + json.dumps(mock_data) + ";")
+    # Fails to parse in the worker process
+    (seeds / "broken.ndjson").write_text("\n".join([lines[0], "{not json", *lines[1:]]))
+    # Parses, but has no portfolio document
+    (seeds / "headless.ndjson").write_text("\n".join(lines[2:]))
+    # Not a valid portfolio id; skipped
+    (seeds / "not valid!.json").write_text(json.dumps(mock_data))
+    (seeds / "notes.txt").write_text("ignored")
+
+    async def scenario():
+        service = PortfolioService(SqliteStorage(tmp_path / "portfolio.db"))
+        results = await import_directory(service, seeds, workers = 2, concurrency = 2, batch_size = 2)
+        assert sorted(results) == ["alice", "bob", "carol"]
+        for portfolio_id in results:
+            portfolio = await service.get_portfolio(portfolio_id)
+            assert portfolio.portfolio.personal.name == mock_data["personal"]["name"]
+            assert len(portfolio.projects) == len(mock_data["projects"])
+        # Parse failures happen before anything is written
+        assert await service.get_projects("broken") == []
+        service.storage.close()
+
+    with caplog.at_level(logging.INFO, logger = "migrate_data"):
+        asyncio.run(scenario())
+    assert "broken.ndjson: could not parse" in caplog.text
+    assert "Imported 3/5 portfolios" in caplog.text
+    assert "headless: migration failed" in caplog.text
+    assert "Skipping files whose names are not valid portfolio ids: ['not valid!.json']" in caplog.text
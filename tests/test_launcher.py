@@ -0,0 +1,19 @@
+"""Launch configuration read from the environment"""
+import pytest
+from pydantic import ValidationError
+
+from launcher import LaunchConfig, load_config
+
+def test_single_worker_unless_web_concurrency_is_set():
+    assert load_config({}).workers == 1
+    assert load_config({"WEB_CONCURRENCY": "3"}).workers == 3
+    assert load_config({"WEB_CONCURRENCY": "auto"}).workers >= 1
+
+@pytest.mark.parametrize("workers", ["0", "-2"])
+def test_rejects_fewer_than_one_worker(workers):
+    with pytest.raises(ValidationError, match = "WEB_CONCURRENCY must be at least 1"):
+        load_config({"WEB_CONCURRENCY": workers})
+
+def test_mongo_pool_budget_is_split_across_workers():
+    assert LaunchConfig(workers = 4, mongo_pool_budget = 100).mongo_pool_size == 25
+    assert LaunchConfig(workers = 4).mongo_pool_size == 0
@@ -0,0 +1,82 @@
+"""Seed migration: diffing against stored items and deleting what left the seed"""
+import asyncio
+import copy
+import uuid
+from datetime import datetime, timezone
+
+from models.portfolio import ProjectCreate
+from services.portfolio_service import SEED_MARKER, PortfolioService
+
+def count_writes(storage):
+    """Count the item writes and deletes the storage receives"""
+    writes = []
+    bulk_write, delete_items = storage.bulk_write, storage.delete_items
+    async def counting_bulk_write(section, portfolio_id, inserts, updates):
+        writes.extend(["insert"] * len(inserts) + ["update"] * len(updates))
+        await bulk_write(section, portfolio_id, inserts, updates)
+    async def counting_delete_items(section, portfolio_id, item_ids):
+        writes.extend(["delete"] * len(item_ids))
+        return await delete_items(section, portfolio_id, item_ids)
+    storage.bulk_write, storage.delete_items = counting_bulk_write, counting_delete_items
+    return writes
+
+def test_unchanged_rerun_writes_nothing(open_storage, mock_data):
+    async def scenario():
+        service = PortfolioService(open_storage())
+        await service.ensure_indexes()
+        first = await service.migrate_mock_data(mock_data)
+        assert first.writes > 0
+
+        writes = count_writes(service.storage)
+        summary = await service.migrate_mock_data(mock_data)
+        assert summary.writes == 0
+        assert writes == []
+        assert sum(diff.unchanged for diff in summary.sections.values()) == first.writes
+
+    asyncio.run(scenario())
+
+def test_item_removed_from_seed_is_deleted_but_api_items_stay(open_storage, mock_data):
+    async def scenario():
+        service = PortfolioService(open_storage())
+        await service.ensure_indexes()
+        await service.migrate_mock_data(mock_data)
+        created = await service.create_project(ProjectCreate(title = "Added through the API", description = "Not seeded", technologies = ["Go"]))
+
+        seed = copy.deepcopy(mock_data)
+        removed = seed["projects"].pop()
+        summary = await service.migrate_mock_data(seed)
+        assert summary.sections["projects"].deleted == 1
+        assert summary.writes == 1
+
+        titles = [project.title for project in await service.get_projects()]
+        assert removed["title"] not in titles
+        assert created.title in titles
+        assert len(titles) == len(seed["projects"]) + 1
+        changes = await service.get_changes(datetime(2000, 1, 1, tzinfo = timezone.utc))
+        assert len(changes.deleted) == 1
+
+    asyncio.run(scenario())
+
+def test_items_stored_before_marking_are_claimed_without_a_write(open_storage, mock_data):
+    async def scenario():
+        service = PortfolioService(open_storage())
+        await service.ensure_indexes()
+        await service.migrate_mock_data(mock_data)
+        project = (await service.get_projects())[0]
+        # As an earlier migration left it: same content, no marker
+        legacy = {**(await service.storage.find_items_in("projects", "default", "id", [project.id]))[0], "id": str(uuid.uuid4())}
+        await service.storage.delete_item("projects", "default", project.id)
+        legacy.pop(SEED_MARKER)
+        await service.storage.insert_item("projects", legacy)
+
+        summary = await service.migrate_mock_data(mock_data)
+        assert summary.writes == 0
+        assert legacy["id"] in await service.storage.item_ids("projects", "default", equals = {SEED_MARKER: True})
+
+        # Claimed, so it goes once it leaves the seed
+        seed = copy.deepcopy(mock_data)
+        seed["projects"] = [item for item in seed["projects"] if item["title"] != project.title]
+        assert (await service.migrate_mock_data(seed)).sections["projects"].deleted == 1
+        assert legacy["id"] not in await service.storage.item_ids("projects", "default")
+
+    asyncio.run(scenario())
@@ -0,0 +1,34 @@
+"""Keyset cursors and how the API answers a bad one"""
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from routes.portfolio_routes import router
+from services.pagination import InvalidCursor, decode_cursor, encode_cursor
+from services.portfolio_service import PortfolioService
+from services.sqlite_storage import SqliteStorage
+
+def test_cursor_round_trip_and_rejection():
+    assert decode_cursor(encode_cursor((3, "p1"))) == (3, "p1")
+    for cursor in ["not-a-cursor", encode_cursor(("3", "p1")), "WzEsMiwzXQ"]:
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+
+def test_invalid_cursor_is_a_bad_request(mock_data, tmp_path):
+    async def scenario():
+        service = PortfolioService(SqliteStorage(tmp_path / "portfolio.db"))
+        await service.migrate_mock_data(mock_data)
+        app = FastAPI()
+        app.include_router(router, prefix = "/api")
+        app.portfolio_service = service
+        async with httpx.AsyncClient(transport = httpx.ASGITransport(app = app), base_url = "http://test") as client:
+            response = await client.get("/api/projects", params = {"cursor": "not-a-cursor"})
+            assert response.status_code == 400
+            assert response.json() == {"detail": str(InvalidCursor())}
+            first = await client.get("/api/projects", params = {"limit": 1})
+            assert first.status_code == 200 and len(first.json()) == 1
+        await service.drain()
+
+    asyncio.run(scenario())
@@ -0,0 +1,89 @@
+"""Stale-while-revalidate reads through the portfolio cache"""
+import asyncio
+from datetime import datetime, timezone
+
+from services import portfolio_cache
+from services.portfolio_cache import PortfolioCache
+from services.portfolio_service import PortfolioService
+from services.sqlite_storage import SqliteStorage
+
+class Clock:
+    """Stands in for the cache module's time, so entries can be aged on demand"""
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+def gated_loads(storage):
+    """Make project loads wait for the returned event; returns (gate, load count)"""
+    gate, loads = asyncio.Event(), []
+    find_items = storage.find_items
+    async def gated_find_items(section, portfolio_id, *args, **kwargs):
+        if section == "projects":
+            loads.append(section)
+            await gate.wait()
+        return await find_items(section, portfolio_id, *args, **kwargs)
+    storage.find_items = gated_find_items
+    return gate, loads
+
+async def rename_behind_the_cache(service, project, title):
+    """Change a project without going through the service, as a stale cache would miss it"""
+    await service.storage.update_item("projects", "default", project.id, {"title": title}, datetime.now(timezone.utc))
+
+def test_soft_expired_entry_is_served_and_refreshed_once_in_background(tmp_path, mock_data, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(portfolio_cache, "time", clock)
+
+    async def scenario():
+        cache = PortfolioCache(max_weight = 1000, tenant_quota = 1000, soft_ttl = 10, hard_ttl = 60)
+        service = PortfolioService(SqliteStorage(tmp_path / "portfolio.db"), cache = cache)
+        await service.migrate_mock_data(mock_data)
+        project = (await service.get_projects())[0]
+        gate, loads = gated_loads(service.storage)
+
+        await rename_behind_the_cache(service, project, "Refreshed")
+        clock.now += 15
+        # Served from the cache at once, although the reload is blocked
+        for _ in range(3):
+            assert (await service.get_projects())[0].title == project.title
+        assert cache.stats()["stale_hits"] == 3
+        await asyncio.sleep(0)
+        assert loads == ["projects"]
+
+        gate.set()
+        await service.drain()
+        assert loads == ["projects"]
+        value, stale = cache.lookup("default", "projects")
+        assert value[0].title == "Refreshed" and not stale
+        service.storage.close()
+
+    asyncio.run(scenario())
+
+def test_hard_expired_entry_blocks_on_a_reload(tmp_path, mock_data, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(portfolio_cache, "time", clock)
+
+    async def scenario():
+        cache = PortfolioCache(max_weight = 1000, tenant_quota = 1000, soft_ttl = 10, hard_ttl = 60)
+        service = PortfolioService(SqliteStorage(tmp_path / "portfolio.db"), cache = cache)
+        await service.migrate_mock_data(mock_data)
+        project = (await service.get_projects())[0]
+        gate, loads = gated_loads(service.storage)
+
+        await rename_behind_the_cache(service, project, "Reloaded")
+        clock.now += 61
+        reads = [asyncio.ensure_future(service.get_projects()) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        # Both readers wait on one reload instead of getting the expired copy
+        assert not any(read.done() for read in reads)
+        assert loads == ["projects"]
+        assert cache.stats()["expired"] == 1
+
+        gate.set()
+        for read in reads:
+            assert (await read)[0].title == "Reloaded"
+        assert cache.lookup("default", "projects")[0][0].title == "Reloaded"
+        service.storage.close()
+
+    asyncio.run(scenario())
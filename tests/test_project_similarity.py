@@ -0,0 +1,32 @@
+"""Related projects by technology overlap"""
+import asyncio
+import subprocess
+import sys
+from pathlib import Path
+
+from models.portfolio import Project
+from services.project_similarity import ProjectSimilarity
+
+class Projects:
+    def __init__(self, projects):
+        self.projects = projects
+
+    async def get_projects(self, portfolio_id):
+        return self.projects
+
+def test_related_projects_ranked_by_jaccard():
+    projects = [
+        Project(id = "a", portfolioId = "default", title = "A", description = "", technologies = ["Python", "SQL", "Go"]),
+        Project(id = "b", portfolioId = "default", title = "B", description = "", technologies = ["python", "SQL"]),
+        Project(id = "c", portfolioId = "default", title = "C", description = "", technologies = ["Go", "Rust", "C"]),
+        Project(id = "d", portfolioId = "default", title = "D", description = "", technologies = ["Haskell"]),
+    ]
+    similarity = ProjectSimilarity()
+    related = asyncio.run(similarity.related(Projects(projects), "default", "a"))
+    assert [(item.project.id, item.score) for item in related] == [("b", 0.6667), ("c", 0.2)]
+    assert asyncio.run(similarity.related(Projects(projects), "default", "missing")) is None
+
+def test_server_import_does_not_load_numpy():
+    # numpy is only needed once a related-projects lookup builds a matrix
+    code = "import sys, server; assert 'numpy' not in sys.modules, 'numpy imported at startup'"
+    subprocess.run([sys.executable, "-c", code], cwd = Path(__file__).parent.parent / "backend", check = True)
@@ -0,0 +1,90 @@
+"""Full-text search index kept current from change events"""
+import asyncio
+
+from models.portfolio import ChangeEvent, Project, ProjectUpdate
+from services.portfolio_service import PortfolioService
+from services.search_index import SearchIndex
+from services.sqlite_storage import SqliteStorage
+
+def test_write_during_lazy_load_is_not_lost(tmp_path, mock_data):
+    async def scenario():
+        index = SearchIndex()
+        service = PortfolioService(SqliteStorage(tmp_path / "portfolio.db"), listeners = [index.on_change])
+        await service.migrate_mock_data(mock_data)
+        project = (await service.get_projects())[0]
+
+        get_projects = service.get_projects
+        async def get_projects_racing_a_write(portfolio_id):
+            projects = await get_projects(portfolio_id)
+            if not writes:
+                # Lands after the read, before the section is marked loaded
+                writes.append(await service.update_project(project.id, ProjectUpdate(title = "Quasar telemetry")))
+            return projects
+        writes = []
+        service.get_projects = get_projects_racing_a_write
+
+        hits = await index.search(service, "default", "quasar")
+        assert writes
+        assert [(hit.section, hit.id) for hit in hits] == [("projects", project.id)]
+        assert hits[0].document["title"] == "Quasar telemetry"
+
+        # Loaded sections are then kept current from the events alone
+        await service.update_project(project.id, ProjectUpdate(title = "Pulsar telemetry"))
+        assert await index.search(service, "default", "quasar") == []
+        assert [hit.id for hit in await index.search(service, "default", "pulsar")] == [project.id]
+        service.storage.close()
+
+    asyncio.run(scenario())
+
+class GatedService:
+    """Serves one project per portfolio; reads wait until the portfolio's gate opens"""
+    def __init__(self):
+        self.gates = {}
+        self.reads = []
+
+    def gate(self, portfolio_id):
+        return self.gates.setdefault(portfolio_id, asyncio.Event())
+
+    async def get_projects(self, portfolio_id):
+        self.reads.append(portfolio_id)
+        await self.gate(portfolio_id).wait()
+        return [Project(id = f"{portfolio_id}-1", portfolioId = portfolio_id, title = f"Nebula {portfolio_id}",
+                        description = "", technologies = [])]
+
+    async def get_experiences(self, portfolio_id):
+        return []
+
+    async def get_publications(self, portfolio_id):
+        return []
+
+def test_concurrent_first_searches_share_one_load():
+    async def scenario():
+        index, service = SearchIndex(), GatedService()
+        first = asyncio.ensure_future(index.search(service, "a", "nebula"))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(index.search(service, "a", "nebula"))
+        await asyncio.sleep(0)
+        service.gate("a").set()
+        assert [len(hits) for hits in await asyncio.gather(first, second)] == [1, 1]
+        # Arriving after the load finished: served from the index
+        assert len(await index.search(service, "a", "nebula")) == 1
+        assert service.reads == ["a"]
+
+    asyncio.run(scenario())
+
+def test_tenant_evicted_during_its_own_search_still_answers_it():
+    async def scenario():
+        index, service = SearchIndex(max_tenants = 1), GatedService()
+        first = asyncio.ensure_future(index.search(service, "a", "nebula"))
+        second = asyncio.ensure_future(index.search(service, "b", "nebula"))
+        await asyncio.sleep(0)
+        service.gate("a").set()
+        service.gate("b").set()
+        assert [hits[0].id for hits in await asyncio.gather(first, second)] == ["a-1", "b-1"]
+        assert list(index._tenants) == ["b"]
+
+        # Events for evicted portfolios leave nothing behind
+        index.on_change(ChangeEvent(portfolioId = "a", section = "projects", op = "changed"))
+        assert list(index._tenants) == ["b"]
+
+    asyncio.run(scenario())
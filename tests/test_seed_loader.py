@@ -0,0 +1,50 @@
+"""Seed file parsing and batching"""
+import json
+
+import pytest
+
+from services.seed_loader import batched, iter_mock_items, iter_seed_items, load_seed_file, seed_format
+
+def ndjson_lines(mock_data):
+    return [json.dumps({"section": section, **item}) for section, item in iter_mock_items(mock_data)]
+
+def test_formats_parse_to_the_same_items(tmp_path, mock_data):
+    (tmp_path / "seed.json").write_text(json.dumps(mock_data))
+    # mock.js style: header comment, export statement, JSON5 (unquoted keys, trailing commas)
+    (tmp_path / "seed.js").write_text(
+        "// Portfolio data\nexport const mockData = " + json.dumps(mock_data, indent = 2)
+        .replace('"personal":', "personal:").replace("]\n}", "],\n}") + ";\n"
+    )
+    (tmp_path / "seed.ndjson").write_text("\n".join(ndjson_lines(mock_data)) + "\n\n")
+
+    assert [seed_format(tmp_path / name) for name in ("seed.js", "seed.json", "seed.ndjson", "seed.JSONL")] == ["js", "json", "ndjson", "ndjson"]
+    assert load_seed_file(tmp_path / "seed.json") == mock_data
+    assert load_seed_file(tmp_path / "seed.js") == mock_data
+    expected = list(iter_mock_items(mock_data))
+    for name in ("seed.js", "seed.json", "seed.ndjson"):
+        assert list(iter_seed_items(tmp_path / name)) == expected
+
+@pytest.mark.parametrize("line, message", [
+    ("{not json", "seed.ndjson:2: invalid seed line"),
+    ('{"title": "no section"}', "seed.ndjson:2: invalid seed line"),
+    ("[1, 2]", "seed.ndjson:2: invalid seed line"),
+    ('{"section": "hobbies", "title": "Chess"}', "seed.ndjson:2: unknown section 'hobbies'"),
+])
+def test_malformed_ndjson_line_names_file_and_line(tmp_path, mock_data, line, message):
+    lines = ndjson_lines(mock_data)
+    path = tmp_path / "seed.ndjson"
+    path.write_text("\n".join([lines[0], line, *lines[1:]]))
+    items = iter_seed_items(path)
+    # Lines before the bad one are streamed as usual
+    assert next(items)[0] == "personal"
+    with pytest.raises(ValueError, match = message):
+        list(items)
+
+def test_batches_split_at_size_and_section_boundaries():
+    items = [("skills", {"n": i}) for i in range(5)] + [("projects", {"n": i}) for i in range(2)]
+    batches = list(batched(items, batch_size = 2))
+    assert [(section, [item["n"] for item in batch]) for section, batch in batches] == [
+        ("skills", [0, 1]), ("skills", [2, 3]), ("skills", [4]), ("projects", [0, 1]),
+    ]
+    assert list(batched(items, batch_size = 5))[0][1] == [{"n": i} for i in range(5)]
+    assert list(batched([], batch_size = 2)) == []
@@ -0,0 +1,84 @@
+"""Static snapshot publishing: full publish, incremental republish, concurrent workers"""
+import asyncio
+import json
+import threading
+
+from models.portfolio import ProjectUpdate
+from services.portfolio_service import PortfolioService
+from services.snapshot_publisher import MANIFEST_FILE, SECTION_FILES, SnapshotPublisher
+from services.sqlite_storage import SqliteStorage
+
+def read_manifest(directory):
+    return json.loads((directory / MANIFEST_FILE).read_text())
+
+def test_publish_and_incremental_republish(tmp_path, mock_data):
+    output_dir = tmp_path / "snapshots"
+    directory = output_dir / "default"
+
+    async def scenario():
+        service = PortfolioService(SqliteStorage(tmp_path / "portfolio.db"))
+        await service.migrate_mock_data(mock_data)
+        publisher = SnapshotPublisher(output_dir)
+
+        manifest = await publisher.publish_all(service, "default")
+        assert set(manifest) == {"portfolio", *SECTION_FILES.values()}
+        for entry in manifest.values():
+            assert (directory / entry["file"]).exists()
+            assert (directory / f"{entry['file']}.gz").exists()
+        projects = json.loads((directory / manifest["projects"]["file"]).read_bytes())
+        assert [project["id"] for project in projects] == [project.id for project in await service.get_projects()]
+
+        # Nothing changed: same files, nothing new on disk
+        files_before = sorted(path.name for path in directory.iterdir())
+        assert await publisher.publish_all(service, "default") == manifest
+        assert sorted(path.name for path in directory.iterdir()) == files_before
+
+        # One project changes: only the projects and portfolio files get a new generation
+        project = (await service.get_projects())[0]
+        await service.update_project(project.id, ProjectUpdate(title = "Renamed"))
+        updated = await publisher.publish(service, "default", ["projects"])
+        assert updated["projects"]["file"] != manifest["projects"]["file"]
+        assert updated["projects"]["previous"] == manifest["projects"]["file"]
+        assert updated["portfolio"]["file"] != manifest["portfolio"]["file"]
+        assert updated["skills"] == manifest["skills"]
+        # The previous generation stays for clients holding the old manifest
+        assert (directory / manifest["projects"]["file"]).exists()
+
+        # Another change drops the generation before the previous one
+        await service.update_project(project.id, ProjectUpdate(title = "Renamed again"))
+        latest = await publisher.publish(service, "default", ["projects"])
+        assert latest["projects"]["previous"] == updated["projects"]["file"]
+        assert not (directory / manifest["projects"]["file"]).exists()
+        assert not list(directory.glob("*.tmp"))
+        assert read_manifest(directory) == latest
+        service.storage.close()
+
+    asyncio.run(scenario())
+
+def test_concurrent_publishers_keep_every_manifest_entry(tmp_path):
+    # Two workers sharing the directory, each writing its own file many times
+    publishers = [SnapshotPublisher(tmp_path), SnapshotPublisher(tmp_path)]
+    errors = []
+
+    def publish(publisher, name):
+        try:
+            for version in range(30):
+                publisher._write("default", {name: [{"name": name, "version": version}]})
+        except Exception as e:
+            errors.append(e)
+
+    threads = [
+        threading.Thread(target = publish, args = (publishers[0], "skills")),
+        threading.Thread(target = publish, args = (publishers[1], "projects")),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    manifest = read_manifest(tmp_path / "default")
+    assert set(manifest) == {"skills", "projects"}
+    for name, entry in manifest.items():
+        assert json.loads((tmp_path / "default" / entry["file"]).read_bytes()) == [{"name": name, "version": 29}]
+        assert (tmp_path / "default" / entry["previous"]).exists()
@@ -0,0 +1,165 @@
+"""The same StorageBackend operations on every backend (SQLite, and MongoDB when available)"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from services.portfolio_service import SEED_KEYS, PortfolioService
+from services.storage import as_utc, millisecond_now
+
+START = datetime(2024, 1, 1, tzinfo = timezone.utc)
+
+def project(item_id, order, technologies = (), featured = False, portfolio_id = "default", updated_at = START):
+    return {"id": item_id, "portfolioId": portfolio_id, "title": f"Project {item_id}", "description": "",
+            "technologies": list(technologies), "featured": featured, "order": order,
+            "createdAt": START, "updatedAt": updated_at}
+
+def stamp(value):
+    """A stored timestamp as the models read it: SQLite keeps ISO strings, MongoDB naive UTC datetimes"""
+    return datetime.fromisoformat(value.replace("Z", "+00:00")) if isinstance(value, str) else as_utc(value)
+
+def ids(documents):
+    return [document["id"] for document in documents]
+
+async def open_seeded(open_storage):
+    storage = open_storage()
+    await storage.ensure_indexes(SEED_KEYS, PortfolioService.tombstone_retention_seconds)
+    for document in [
+        project("p3", 2, ["Python", "SQL"]),
+        project("p1", 0, ["Python", "FastAPI"], featured = True),
+        project("p2", 1, ["Go"]),
+        # Same order as p2: pages break the tie by id
+        project("p0", 1, ["Python"], featured = True),
+        project("x1", 0, ["Python"], portfolio_id = "other"),
+    ]:
+        await storage.insert_item("projects", document)
+    return storage
+
+def test_item_crud(open_storage):
+    async def scenario():
+        storage = await open_seeded(open_storage)
+        assert ids(await storage.find_items("projects", "default")) in (["p1", "p2", "p0", "p3"], ["p1", "p0", "p2", "p3"])
+        assert sorted(await storage.item_ids("projects", "default")) == ["p0", "p1", "p2", "p3"]
+        assert sorted(await storage.item_ids("projects", "default", equals = {"featured": True})) == ["p0", "p1"]
+
+        now = millisecond_now()
+        doc, changed = await storage.update_item("projects", "default", "p1", {"title": "Renamed"}, now)
+        assert changed and doc["title"] == "Renamed" and stamp(doc["updatedAt"]) == now
+        later = now + timedelta(seconds = 1)
+        doc, changed = await storage.update_item("projects", "default", "p1", {"title": "Renamed"}, later)
+        assert not changed and stamp(doc["updatedAt"]) == now
+        assert await storage.update_item("projects", "default", "missing", {"title": "x"}, later) == (None, False)
+        # Tenants are isolated
+        assert await storage.update_item("projects", "other", "p1", {"title": "x"}, later) == (None, False)
+
+        assert await storage.delete_item("projects", "default", "p3")
+        assert not await storage.delete_item("projects", "default", "p3")
+        assert await storage.delete_items("projects", "default", ["p0", "p2", "x1", "missing"]) == 2
+        assert ids(await storage.find_items("projects", "default")) == ["p1"]
+        assert ids(await storage.find_items("projects", "other")) == ["x1"]
+
+    asyncio.run(scenario())
+
+def test_find_items_filters(open_storage):
+    async def scenario():
+        storage = await open_seeded(open_storage)
+        python = await storage.find_items("projects", "default", all_of = {"technologies": ["Python"]})
+        assert sorted(ids(python)) == ["p0", "p1", "p3"]
+        assert ids(await storage.find_items("projects", "default", all_of = {"technologies": ["Python", "SQL"]})) == ["p3"]
+        assert sorted(ids(await storage.find_items("projects", "default", equals = {"featured": True}))) == ["p0", "p1"]
+        assert ids(await storage.find_items("projects", "default", all_of = {"technologies": ["Python"]}, equals = {"featured": False})) == ["p3"]
+        assert await storage.find_items("projects", "default", all_of = {"technologies": ["Rust"]}) == []
+
+    asyncio.run(scenario())
+
+def test_find_page_cursors(open_storage):
+    async def scenario():
+        storage = await open_seeded(open_storage)
+        pages, after = [], None
+        while True:
+            page = await storage.find_page("projects", "default", 2, after)
+            if not page:
+                break
+            pages.append(ids(page))
+            after = (page[-1]["order"], page[-1]["id"])
+        assert pages == [["p1", "p0"], ["p2", "p3"]]
+
+        # Filtered pages resume after the cursor too
+        first = await storage.find_page("projects", "default", 1, all_of = {"technologies": ["Python"]})
+        assert ids(first) == ["p1"]
+        rest = await storage.find_page("projects", "default", 5, (first[0]["order"], first[0]["id"]), all_of = {"technologies": ["Python"]})
+        assert ids(rest) == ["p0", "p3"]
+        assert ids(await storage.find_page("projects", "default", 5, (1, "p0"), equals = {"featured": True})) == []
+
+    asyncio.run(scenario())
+
+def test_find_items_in(open_storage):
+    async def scenario():
+        storage = await open_seeded(open_storage)
+        assert sorted(ids(await storage.find_items_in("projects", "default", "id", ["p2", "p3", "x1", "missing"]))) == ["p2", "p3"]
+        assert sorted(ids(await storage.find_items_in("projects", "default", "title", ["Project p0", "Project x1"]))) == ["p0"]
+        assert await storage.find_items_in("projects", "default", "id", ["missing"]) == []
+
+    asyncio.run(scenario())
+
+def test_bulk_write_and_facets(open_storage):
+    async def scenario():
+        storage = await open_seeded(open_storage)
+        now = millisecond_now()
+        await storage.bulk_write("projects", "default",
+                                 [project("p4", 3, ["Python", "Go"], updated_at = now)],
+                                 [{"id": "p2", "featured": True, "updatedAt": now}])
+        await storage.bulk_write("projects", "default", [], [])
+        p2, p4 = sorted(await storage.find_items_in("projects", "default", "id", ["p2", "p4"]), key = lambda doc: doc["id"])
+        assert p2["featured"] is True and p2["title"] == "Project p2"
+        assert p4["technologies"] == ["Python", "Go"]
+
+        assert await storage.project_facets("default") == (5, 3, [("Python", 4), ("Go", 2), ("FastAPI", 1), ("SQL", 1)])
+        assert await storage.project_facets("empty") == (0, 0, [])
+
+    asyncio.run(scenario())
+
+def test_portfolio_document_and_changes(open_storage):
+    async def scenario():
+        storage = await open_seeded(open_storage)
+        assert await storage.find_portfolio("default") is None
+        await storage.upsert_portfolio("default", {"personal": {"name": "Jane"}, "updatedAt": START}, {"id": "doc", "createdAt": START})
+        await storage.upsert_portfolio("default", {"personal": {"name": "Jane"}, "updatedAt": START}, {"id": "ignored", "createdAt": START})
+        portfolio = await storage.find_portfolio("default")
+        assert portfolio["id"] == "doc" and portfolio["personal"] == {"name": "Jane"}
+
+        since = START + timedelta(seconds = 1)
+        now = millisecond_now()
+        doc, changed = await storage.update_portfolio("default", {"personal.name": "Joan"}, now)
+        assert changed and doc["personal"]["name"] == "Joan"
+        assert (await storage.update_portfolio("default", {"personal.name": "Joan"}, now + timedelta(seconds = 1)))[1] is False
+        await storage.update_item("projects", "default", "p2", {"title": "Changed"}, now)
+        await storage.add_tombstones([{"portfolioId": "default", "section": "projects", "id": "gone", "updatedAt": now}])
+
+        portfolio_doc, tombstones, sections = await storage.changes("default", since)
+        assert portfolio_doc["personal"]["name"] == "Joan"
+        assert [(tombstone["id"], stamp(tombstone["updatedAt"])) for tombstone in tombstones] == [("gone", now)]
+        assert ids(sections["projects"]) == ["p2"]
+        assert all(items == [] for section, items in sections.items() if section != "projects")
+        assert await storage.changes("default", now) == (None, [], {section: [] for section in sections})
+
+    asyncio.run(scenario())
+
+def test_sqlite_lock_wait_leaves_event_loop_free(tmp_path):
+    import sqlite3
+    from services.sqlite_storage import SqliteStorage
+
+    async def scenario():
+        storage = SqliteStorage(tmp_path / "locked.db")
+        # Another worker holds the write lock on the file
+        other = sqlite3.connect(str(tmp_path / "locked.db"), isolation_level = None)
+        other.execute("BEGIN IMMEDIATE")
+        write = asyncio.create_task(storage.insert_item("projects", project("p1", 0)))
+        # Blocking the loop here would run the write until busy_timeout gives up
+        await asyncio.sleep(0.2)
+        assert not write.done()
+        other.execute("COMMIT")
+        await write
+        assert ids(await storage.find_items("projects", "default")) == ["p1"]
+        other.close()
+        storage.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,36 @@
+"""Typeahead suggestions kept current from change events"""
+import asyncio
+
+from models.portfolio import SkillCategoryUpdate
+from services.portfolio_service import PortfolioService
+from services.sqlite_storage import SqliteStorage
+from services.typeahead import TypeaheadIndex
+
+def test_write_during_lazy_load_is_not_lost(tmp_path, mock_data):
+    async def scenario():
+        index = TypeaheadIndex()
+        service = PortfolioService(SqliteStorage(tmp_path / "portfolio.db"), listeners = [index.on_change])
+        await service.migrate_mock_data(mock_data)
+        skill = (await service.get_skills())[0]
+
+        get_skills = service.get_skills
+        async def get_skills_racing_a_write(portfolio_id):
+            skills = await get_skills(portfolio_id)
+            if not writes:
+                # Lands after the read, before the section is marked loaded
+                items = [*skill.items, "Zygote"]
+                writes.append(await service.update_skill(skill.id, SkillCategoryUpdate(items = items)))
+            return skills
+        writes = []
+        service.get_skills = get_skills_racing_a_write
+
+        suggestions = await index.suggest(service, "default", "zyg")
+        assert writes
+        assert [(suggestion.value, suggestion.sources) for suggestion in suggestions] == [("Zygote", ["skills"])]
+
+        # Loaded sections are then kept current from the events alone
+        await service.update_skill(skill.id, SkillCategoryUpdate(items = skill.items))
+        assert await index.suggest(service, "default", "zyg") == []
+        service.storage.close()
+
+    asyncio.run(scenario())